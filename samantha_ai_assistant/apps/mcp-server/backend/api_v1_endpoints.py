@@ -1,11 +1,29 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, \
-    BackgroundTasks, Response, Form
+    BackgroundTasks, Response, Form, Body
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Dict, Any
 from .auth import create_access_token, get_current_user
 from .voice_processor import voice_processor, VoiceCommand
+from .intent_classifier import MAX_BATCH_TEXTS
+from .speech_synthesis import speech_synthesizer
+from .audio_upload import read_audio_upload, iter_upload_chunks, AudioUploadTooLargeError, \
+    MAX_UPLOAD_BYTES
+from .response_audio_cache import response_audio_cache
+from .model_registry import model_registry
+from .inference_executor import inference_executor, InferenceQueueFullError, \
+    InferenceTimeoutError
+from .decoder_pool import DecoderError, DecoderPoolFullError, DecoderTimeoutError
+from .transcription_batcher import transcription_batcher
+from .transcription_cache import transcription_cache
+from .wake_word import wake_word_model
 from .system_automation import system_automation, AutomationResult
-from queue import Queue
+from .automation_batch import batch_executor, BatchStep, STOP_ON_FAILURE
+from .file_transfer import file_transfers
+from .directory_listing import stream_directory_ndjson, ListingOptions
+from .request_queue import queue as Queue
 import asyncio
+import json
+import os
 from samantha_ai_assistant.packages.monitoring.health import (
     get_system_health, check_endpoints
 )
@@ -22,6 +40,11 @@ from samantha_ai_assistant.packages.analytics.business_intelligence import (
     log_user, log_revenue, get_bi_metrics
 )
 from datetime import datetime
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -32,6 +55,37 @@ start_metrics_server(port=8001)
 # VOICE PROCESSING ENDPOINTS
 # ============================================================================
 
+def voice_error_response(e: Exception, action: str) -> HTTPException:
+    """
+    Map a voice pipeline failure to its HTTP error
+
+    Args:
+        e: Exception raised while reading, decoding or transcribing an upload
+        action: What failed, for the 500 detail (e.g. "Voice processing")
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, AudioUploadTooLargeError):
+        return HTTPException(status_code=413, detail=str(e))
+    if isinstance(e, (InferenceQueueFullError, DecoderPoolFullError)):
+        return HTTPException(status_code=503, detail=str(e))
+    if isinstance(e, (InferenceTimeoutError, DecoderTimeoutError)):
+        return HTTPException(status_code=504, detail=str(e))
+    if isinstance(e, DecoderError):
+        return HTTPException(status_code=422, detail=f"Could not decode audio: {str(e)}")
+    return HTTPException(status_code=500, detail=f"{action} failed: {str(e)}")
+
+async def process_uploaded_audio(audio_file: UploadFile, language: str) -> VoiceCommand:
+    """Stream an upload through the voice processor without buffering it whole"""
+    size = getattr(audio_file, 'size', None)
+    if size is not None and size > MAX_UPLOAD_BYTES:
+        raise AudioUploadTooLargeError(f"Audio upload exceeds {MAX_UPLOAD_BYTES} bytes")
+    upload = await read_audio_upload(iter_upload_chunks(audio_file))
+    try:
+        return await voice_processor.process_upload(upload, language)
+    finally:
+        upload.close()
+
 @router.post('/voice/process-audio')
 async def process_voice_audio(
     audio_file: UploadFile = File(...),
@@ -42,11 +96,8 @@ async def process_voice_audio(
     Process voice audio and return structured command
     """
     try:
-        # Read audio file
-        audio_data = await audio_file.read()
-
-        # Process audio through voice processor
-        command = await voice_processor.process_audio(audio_data, language)
+        # Read the upload in chunks and process it through the voice processor
+        command = await process_uploaded_audio(audio_file, language)
 
         # Add user ID if provided
         if user_id:
@@ -64,11 +115,46 @@ async def process_voice_audio(
                 "confidence": command.confidence,
                 "entities": command.entities,
                 "timestamp": command.timestamp.isoformat(),
-                "user_id": command.user_id
+                "user_id": command.user_id,
+                "decode_path": command.decode_path,
+                "trimmed_duration": command.trimmed_duration,
+                "rejected_duration": command.rejected_duration,
+                "quality_tier": command.quality_tier,
+                "asr_confidence": command.asr_confidence,
+                "no_speech_reason": command.no_speech_reason
             }
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Voice processing failed: {str(e)}")
+        raise voice_error_response(e, "Voice processing")
+
+@router.post('/voice/transcribe-stream')
+async def transcribe_audio_stream(
+    audio_file: UploadFile = File(...),
+    language: str = Form('en-US')
+):
+    """
+    Transcribe a (long) recording and stream NDJSON segment events as chunks finish
+    """
+    size = getattr(audio_file, 'size', None)
+    try:
+        if size is not None and size > MAX_UPLOAD_BYTES:
+            raise AudioUploadTooLargeError(f"Audio upload exceeds {MAX_UPLOAD_BYTES} bytes")
+        upload = await read_audio_upload(iter_upload_chunks(audio_file))
+    except AudioUploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    async def events():
+        try:
+            async for event in voice_processor.stream_transcription(upload, language):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            logger.error(f"Streaming transcription failed: {e}")
+            yield json.dumps({"type": "error", "error": str(e)}) + "\n"
+        finally:
+            upload.close()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 @router.post('/voice/generate-response')
 async def generate_voice_response(command_data: Dict[str, Any]):
@@ -102,6 +188,21 @@ async def generate_voice_response(command_data: Dict[str, Any]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Response generation failed: {str(e)}")
 
+@router.post('/voice/synthesize-stream')
+async def synthesize_speech_stream(
+    text: str = Body(..., embed=True),
+    voice: str = Body(None, embed=True)
+):
+    """
+    Stream synthesized speech as a WAV file while it is being generated
+    (pre-rendered replies come straight from the response audio cache)
+    """
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="Text must not be empty")
+    if not speech_synthesizer.is_available():
+        raise HTTPException(status_code=503, detail="No speech synthesis backend available")
+    return StreamingResponse(response_audio_cache.stream_wav(text, voice), media_type="audio/wav")
+
 @router.get('/voice/supported-languages')
 async def get_supported_languages():
     """Get list of supported languages for voice processing"""
@@ -110,6 +211,53 @@ async def get_supported_languages():
         "languages": voice_processor.get_supported_languages()
     }
 
+@router.get('/voice/language-routes')
+async def get_language_routes():
+    """Get the Whisper language and model used for each language code"""
+    return {
+        "success": True,
+        "routes": voice_processor.get_language_routes()
+    }
+
+@router.get('/voice/wake-word')
+async def get_wake_word():
+    """Get the wake word, its detection threshold and the enrolled template count"""
+    return {
+        "success": True,
+        "wake_word": wake_word_model.get_stats()
+    }
+
+@router.post('/voice/wake-word/templates')
+async def enroll_wake_word(audio_file: UploadFile = File(...)):
+    """
+    Enroll a WAV recording of the wake word for wake word streaming mode
+    """
+    try:
+        upload = await read_audio_upload(iter_upload_chunks(audio_file))
+    except AudioUploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    try:
+        if upload.decoded is None:
+            raise HTTPException(status_code=422, detail="Wake word recordings must be PCM or float WAV")
+        templates = await asyncio.to_thread(wake_word_model.enroll, upload.decoded.samples)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        upload.close()
+    return {
+        "success": True,
+        "templates": templates
+    }
+
+@router.delete('/voice/wake-word/templates')
+async def clear_wake_word_templates():
+    """Forget every enrolled wake word recording"""
+    await asyncio.to_thread(wake_word_model.clear)
+    return {
+        "success": True,
+        "templates": 0
+    }
+
 @router.get('/voice/command-patterns')
 async def get_command_patterns():
     """Get command patterns for intent recognition"""
@@ -118,6 +266,39 @@ async def get_command_patterns():
         "patterns": voice_processor.get_command_patterns()
     }
 
+@router.post('/voice/classify-batch')
+async def classify_batch(texts: List[str] = Body(..., embed=True)):
+    """Classify the intent of many texts in one vectorised pass"""
+    if len(texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_TEXTS} texts per batch")
+    # CPU-bound; keep the event loop free for large batches
+    results = await asyncio.to_thread(voice_processor.classify_batch, texts)
+    return {
+        "success": True,
+        "count": len(results),
+        "results": results
+    }
+
+@router.put('/voice/command-patterns')
+async def update_command_patterns(patterns: Dict[str, List[str]]):
+    """Replace the command patterns and recompile the intent matcher"""
+    voice_processor.update_command_patterns(patterns)
+    return {
+        "success": True,
+        "intents": len(voice_processor.get_command_patterns()),
+        "patterns": voice_processor.intent_matcher.pattern_count
+    }
+
+@router.get('/voice/inference-stats')
+async def voice_inference_stats():
+    """Get inference queue depth, worker utilisation, batching and cache stats"""
+    return {
+        "success": True,
+        "inference": inference_executor.get_stats(),
+        "batching": transcription_batcher.get_stats(),
+        "cache": transcription_cache.get_stats()
+    }
+
 @router.get('/voice/health')
 async def voice_health_check():
     """Check voice processor health"""
@@ -127,6 +308,28 @@ async def voice_health_check():
         "health": health
     }
 
+@router.get('/voice/ready')
+async def voice_readiness():
+    """Readiness probe: 503 until every routed model and its quality tier variants have been warmed up"""
+    status = model_registry.get_status(voice_processor.model_sizes())
+    status['inference'] = inference_executor.get_stats()
+    return JSONResponse(
+        status_code=200 if status['ready'] else 503,
+        content={"success": status['ready'], "status": status}
+    )
+
+@router.post('/voice/warmup')
+async def voice_warmup():
+    """Load every routed Whisper model and its tier variants in every inference worker ahead of the first request"""
+    try:
+        infos = await inference_executor.warm_up(voice_processor.model_sizes())
+        return {
+            "success": True,
+            "models": [info.to_dict() for info in infos]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model warm-up failed: {str(e)}")
+
 # ============================================================================
 # SYSTEM AUTOMATION ENDPOINTS
 # ============================================================================
@@ -153,17 +356,93 @@ async def execute_automation_command(
             "message": result.message,
             "data": result.data,
             "error": result.error,
-            "execution_time": result.execution_time
+            "execution_time": result.execution_time,
+            "exit_code": result.exit_code,
+            "command_duration": result.command_duration
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Automation failed: {str(e)}")
 
+@router.post('/automation/batch')
+async def execute_automation_batch(
+    steps: List[Dict[str, Any]] = Body(..., embed=True),
+    mode: str = Body(STOP_ON_FAILURE, embed=True)
+):
+    """
+    Execute several automation commands in one request
+
+    Each step is {"id", "command", "params", "depends_on"}; steps without
+    dependencies between them run concurrently. mode is "stop" (start no
+    further steps after a failure) or "continue" (skip only the failed
+    step's dependents).
+    """
+    try:
+        batch = await batch_executor.run(
+            [BatchStep.from_dict(step, index) for index, step in enumerate(steps)], mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return batch.to_dict()
+
+@router.get('/automation/file-jobs')
+async def list_file_jobs():
+    """List running and recently finished copies and moves"""
+    return {
+        "success": True,
+        "jobs": [job.to_dict() for job in file_transfers.list_jobs()]
+    }
+
+@router.get('/automation/file-jobs/{job_id}')
+async def get_file_job(job_id: str):
+    """Get the progress of a copy or move started with background=true"""
+    job = file_transfers.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"File job not found: {job_id}")
+    return {
+        "success": True,
+        "job": job.to_dict()
+    }
+
+@router.delete('/automation/file-jobs/{job_id}')
+async def cancel_file_job(job_id: str):
+    """Cancel a running copy; the partial destination is removed"""
+    if not file_transfers.cancel(job_id):
+        raise HTTPException(status_code=404, detail=f"No running file job: {job_id}")
+    return {
+        "success": True,
+        "job_id": job_id
+    }
+
+@router.get('/automation/files/stream')
+async def stream_directory_listing(
+    path: str = '.',
+    sort: str = 'none',
+    reverse: bool = False,
+    pattern: str = None,
+    kind: str = None
+):
+    """
+    Stream a directory listing as NDJSON: one {"type": "entry", "entry": {...}} line per entry, then a done event
+
+    The default directory order starts streaming at once; a sorted listing
+    streams after the names have been read and ordered.
+    """
+    try:
+        options = ListingOptions(sort=sort, reverse=reverse, pattern=pattern, kind=kind)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if not os.path.isdir(path):
+        raise HTTPException(status_code=404, detail=f"Directory not found: {path}")
+
+    return StreamingResponse(stream_directory_ndjson(path, options), media_type="application/x-ndjson")
+
 @router.get('/automation/supported-operations')
 async def get_supported_operations():
     """Get list of supported automation operations"""
     return {
         "success": True,
-        "operations": system_automation.get_supported_operations()
+        "operations": system_automation.get_supported_operations(),
+        "specs": system_automation.describe_operations()
     }
 
 @router.get('/automation/health')
@@ -172,7 +451,8 @@ async def automation_health_check():
     health = await system_automation.health_check()
     return {
         "success": True,
-        "health": health
+        "health": health,
+        "batches": batch_executor.get_stats()
     }
 
 # ============================================================================
@@ -191,9 +471,7 @@ async def process_and_execute_voice_command(
     """
     try:
         # Step 1: Process voice audio
-        audio_data = await audio_file.read()
-        logger.info(f"Audio data read from UploadFile. Size: {len(audio_data)} bytes")
-        command = await voice_processor.process_audio(audio_data, language)
+        command = await process_uploaded_audio(audio_file, language)
 
         if user_id:
             command.user_id = user_id
@@ -220,7 +498,13 @@ async def process_and_execute_voice_command(
                 "original_text": command.original_text,
                 "intent": command.intent,
                 "confidence": command.confidence,
-                "entities": command.entities
+                "entities": command.entities,
+                "decode_path": command.decode_path,
+                "trimmed_duration": command.trimmed_duration,
+                "rejected_duration": command.rejected_duration,
+                "quality_tier": command.quality_tier,
+                "asr_confidence": command.asr_confidence,
+                "no_speech_reason": command.no_speech_reason
             },
             "response": {
                 "text": response.text,
@@ -229,7 +513,7 @@ async def process_and_execute_voice_command(
             "automation": automation_result.to_dict() if automation_result else None
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Voice automation failed: {str(e)}")
+        raise voice_error_response(e, "Voice automation")
 
 def map_intent_to_automation(intent: str, entities: Dict[str, str]) -> Dict[str, Any]:
     """Map voice intent to automation command"""
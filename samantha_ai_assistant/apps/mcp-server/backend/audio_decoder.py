@@ -0,0 +1,114 @@
+"""
+In-memory Audio Decoding for Samantha AI MCP Server
+Parses RIFF/WAV PCM uploads without temp files or ffmpeg
+"""
+
+import logging
+import struct
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .audio_normalization import (
+    TARGET_SAMPLE_RATE, WAVE_FORMAT_EXTENSIBLE, WAVE_FORMAT_IEEE_FLOAT, is_supported_sample_rate, normalize_pcm
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DecodedAudio:
+    """Mono float32 audio ready for the model"""
+    samples: np.ndarray
+    sample_rate: int
+    source_sample_rate: int
+    source_channels: int
+    source_format: str
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate if self.sample_rate else 0.0
+
+
+def is_wav(data: bytes) -> bool:
+    """Check for a RIFF/WAVE header"""
+    return len(data) >= 12 and data[:4] == b'RIFF' and data[8:12] == b'WAVE'
+
+
+def _parse_wav(data: bytes):
+    """
+    Walk the RIFF chunks and return (format_tag, channels, sample_rate, bits, payload)
+
+    Returns None for anything that is not a well-formed WAV with fmt and data chunks.
+    """
+    if not is_wav(data):
+        return None
+
+    fmt = None
+    payload = None
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id, chunk_size = struct.unpack_from('<4sI', data, offset)
+        body_start = offset + 8
+        body_end = min(body_start + chunk_size, len(data))
+
+        if chunk_id == b'fmt ' and chunk_size >= 16:
+            if body_start + chunk_size > len(data):
+                return None     # header cut off inside the fmt chunk
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack_from('<HHIIHH', data, body_start)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # The real format tag is the first two bytes of the SubFormat GUID
+                format_tag = struct.unpack_from('<H', data, body_start + 24)[0]
+            fmt = (format_tag, channels, sample_rate, bits)
+        elif chunk_id == b'data':
+            # Streaming writers leave the size as 0 or 0xFFFFFFFF; take the rest of the buffer
+            if chunk_size in (0, 0xFFFFFFFF):
+                body_end = len(data)
+            payload = memoryview(data)[body_start:body_end]
+            if fmt is not None:
+                break
+
+        # Chunks are word aligned
+        offset = body_start + chunk_size + (chunk_size & 1)
+
+    if fmt is None or payload is None:
+        return None
+    return fmt + (payload,)
+
+
+def decode_wav_bytes(data: bytes, target_rate: int = TARGET_SAMPLE_RATE) -> Optional[DecodedAudio]:
+    """
+    Decode WAV bytes to 16 kHz mono float32 entirely in memory
+
+    Args:
+        data: Raw upload bytes
+        target_rate: Output sample rate
+
+    Returns:
+        DecodedAudio, or None when the container/encoding is not supported
+        and the caller should fall back to the ffmpeg path
+    """
+    parsed = _parse_wav(data)
+    if parsed is None:
+        return None
+
+    format_tag, channels, sample_rate, bits, payload = parsed
+    if channels < 1 or not is_supported_sample_rate(sample_rate):
+        logger.info(f"Unsupported WAV header (channels={channels}, rate={sample_rate}); using fallback decoder")
+        return None
+
+    samples = normalize_pcm(payload, format_tag, bits, channels, sample_rate, target_rate)
+    if samples is None:
+        logger.info(f"Unsupported WAV encoding (format={format_tag}, bits={bits}); using fallback decoder")
+        return None
+
+    return DecodedAudio(
+        samples=np.ascontiguousarray(samples, dtype=np.float32),
+        sample_rate=target_rate,
+        source_sample_rate=sample_rate,
+        source_channels=channels,
+        source_format=f"wav/{'float' if format_tag == WAVE_FORMAT_IEEE_FLOAT else 'pcm'}{bits}"
+    )
@@ -0,0 +1,354 @@
+"""
+Audio Normalization for Samantha AI MCP Server
+Vectorised sample conversion, downmixing, polyphase resampling and level normalisation
+"""
+
+import logging
+import os
+from fractions import Fraction
+from functools import lru_cache
+from math import ceil
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whisper expects 16 kHz mono float32
+TARGET_SAMPLE_RATE = 16000
+
+# Source rates accepted from headers and clients; the filter grows with the rate
+MIN_SOURCE_SAMPLE_RATE = 4000
+MAX_SOURCE_SAMPLE_RATE = 384000
+# Largest reduced up/down factor; unusual rates are approximated to within
+# a few ppm (every standard rate reduces exactly, e.g. 44100 -> 160/441)
+MAX_RESAMPLE_FACTOR = 1000
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Level normalisation applied before inference (overridable via environment):
+# 'peak', 'rms' or 'none'
+AUDIO_NORMALIZATION = os.getenv("SAMANTHA_AUDIO_NORMALIZATION", "peak").lower()
+PEAK_TARGET = float(os.getenv("SAMANTHA_AUDIO_PEAK_TARGET", "0.95"))
+RMS_TARGET_DBFS = float(os.getenv("SAMANTHA_AUDIO_RMS_TARGET_DBFS", "-20"))
+MAX_GAIN_DB = float(os.getenv("SAMANTHA_AUDIO_MAX_GAIN_DB", "20"))
+
+# Anti-aliasing filter: zero crossings of the sinc on each side of the centre
+# (per output sample at the lower of the two rates) and the Kaiser window beta;
+# these match scipy.signal.resample_poly's defaults
+FILTER_ZERO_CROSSINGS = 10
+KAISER_BETA = 5.0
+
+# Output rows per filter matmul; bounds the strided-window temporaries
+RESAMPLE_BLOCK_ROWS = 4096
+
+
+def _typed_samples(payload, format_tag: int, bits: int) -> Optional[Tuple[np.ndarray, float, float]]:
+    """
+    View interleaved samples in their stored dtype without copying
+
+    Returns:
+        (samples, offset, scale) with float value = (sample - offset) * scale,
+        or None for an unsupported encoding
+    """
+    width = bits // 8
+    if width == 0:
+        return None
+    # Drop a trailing partial sample left by truncated uploads
+    payload = memoryview(payload).cast('B')
+    payload = payload[:len(payload) - len(payload) % width]
+
+    if format_tag == WAVE_FORMAT_PCM:
+        if bits == 8:
+            return np.frombuffer(payload, dtype=np.uint8), 128.0, 1.0 / 128.0
+        if bits == 16:
+            return np.frombuffer(payload, dtype='<i2'), 0.0, 1.0 / 32768.0
+        if bits == 24:
+            # The one copy we cannot avoid: widen each 3-byte sample into the
+            # top of an int32 so the sign bit lands in place
+            raw = np.frombuffer(payload, dtype=np.uint8).reshape(-1, 3)
+            widened = np.zeros((len(raw), 4), dtype=np.uint8)
+            widened[:, 1:] = raw
+            return widened.view('<i4').reshape(-1), 0.0, 1.0 / 2147483648.0
+        if bits == 32:
+            return np.frombuffer(payload, dtype='<i4'), 0.0, 1.0 / 2147483648.0
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        if bits == 32:
+            return np.frombuffer(payload, dtype='<f4'), 0.0, 1.0
+        if bits == 64:
+            return np.frombuffer(payload, dtype='<f8'), 0.0, 1.0
+    return None
+
+
+def is_supported_encoding(format_tag: int, bits: int) -> bool:
+    """Whether pcm_to_float32 can convert this WAV encoding"""
+    return _typed_samples(b'', format_tag, bits) is not None
+
+
+def to_mono_float32(payload, format_tag: int, bits: int, channels: int = 1) -> Optional[np.ndarray]:
+    """
+    Convert interleaved PCM/float samples to mono float32 in [-1, 1]
+
+    Channels are summed straight from their strided views in the stored dtype
+    and scaled once, so conversion and downmix share one output buffer.
+    Mono little-endian float32 input is returned as a read-only view of the
+    payload without any copy.
+
+    Args:
+        payload: Raw sample bytes (bytes, bytearray or memoryview)
+        format_tag: WAVE_FORMAT_PCM or WAVE_FORMAT_IEEE_FLOAT
+        bits: Bits per sample
+        channels: Interleaved channel count
+
+    Returns:
+        float32 samples, or None for an unsupported encoding
+    """
+    typed = _typed_samples(payload, format_tag, bits)
+    if typed is None or channels < 1:
+        return None
+    samples, offset, scale = typed
+
+    if channels == 1:
+        if samples.dtype == np.float32 and samples.dtype.isnative:
+            return samples
+        mono = samples.astype(np.float32)
+    else:
+        frames = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+        mono = frames[:, 0].astype(np.float32)
+        for channel in range(1, channels):
+            np.add(mono, frames[:, channel], out=mono, casting='unsafe')
+        offset *= channels
+        scale /= channels
+
+    if offset:
+        mono -= np.float32(offset)
+    if scale != 1.0:
+        mono *= np.float32(scale)
+    return mono
+
+
+def is_supported_sample_rate(sample_rate: int) -> bool:
+    """True for source rates the resampler accepts"""
+    return MIN_SOURCE_SAMPLE_RATE <= sample_rate <= MAX_SOURCE_SAMPLE_RATE
+
+
+def pcm_to_float32(payload, format_tag: int, bits: int) -> Optional[np.ndarray]:
+    """Convert interleaved samples to float32 in [-1, 1], keeping the channels interleaved"""
+    return to_mono_float32(payload, format_tag, bits, channels=1)
+
+
+def downmix(samples: np.ndarray, channels: int) -> np.ndarray:
+    """Average interleaved float32 channels to mono"""
+    if channels <= 1:
+        return samples
+    frames = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    mono = frames[:, 0].astype(np.float32)
+    for channel in range(1, channels):
+        mono += frames[:, channel]
+    mono *= np.float32(1.0 / channels)
+    return mono
+
+
+@lru_cache(maxsize=32)
+def _polyphase_bank(up: int, down: int) -> Tuple[np.ndarray, int]:
+    """
+    Kaiser-windowed sinc low-pass split into its polyphase components
+
+    Returns:
+        (bank, half_len): bank[p] holds the taps h[p], h[p + up], ... of
+        phase p in reverse order, ready to dot with a window of input
+        samples; half_len is the filter's centre tap
+    """
+    max_rate = max(up, down)
+    half_len = FILTER_ZERO_CROSSINGS * max_rate
+    n = np.arange(-half_len, half_len + 1, dtype=np.float64)
+    cutoff = 1.0 / max_rate
+    taps = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), KAISER_BETA)
+    # Unity gain at DC after zero-stuffing by `up`
+    taps *= up / taps.sum()
+
+    per_phase = -(-len(taps) // up)
+    taps = np.concatenate([taps, np.zeros(per_phase * up - len(taps))])
+    bank = taps.reshape(per_phase, up).T[:, ::-1]
+    return np.ascontiguousarray(bank, dtype=np.float32), half_len
+
+
+class PolyphaseResampler:
+    """
+    Rational-ratio polyphase resampler that can be fed in chunks
+
+    Output n is the anti-aliased signal at input time n * source/target. Only
+    the taps that meet non-zero samples are computed: for each output phase
+    the matching filter row is applied to a strided, copy-free window view of
+    the input. Feeding a signal in chunks produces the same samples as
+    resampling it in one call, so the upload, streaming and batch paths agree.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE):
+        if not is_supported_sample_rate(source_rate):
+            raise ValueError(
+                f"Unsupported sample rate {source_rate} Hz "
+                f"(expected {MIN_SOURCE_SAMPLE_RATE}-{MAX_SOURCE_SAMPLE_RATE} Hz)"
+            )
+        ratio = Fraction(target_rate, source_rate).limit_denominator(MAX_RESAMPLE_FACTOR)
+        self.up = ratio.numerator
+        self.down = ratio.denominator
+        self.passthrough = self.up == self.down
+        self._consumed = 0
+        self._emitted = 0
+        if self.passthrough:
+            return
+        self._bank, self._half_len = _polyphase_bank(self.up, self.down)
+        self._taps = self._bank.shape[1]
+        # Zero history before the first sample; _start is its absolute input index
+        self._buffer = np.zeros(self._taps - 1, dtype=np.float32)
+        self._start = -(self._taps - 1)
+
+    def output_length(self, input_length: int) -> int:
+        """Samples produced for input_length input samples once flushed"""
+        return -(-input_length * self.up // self.down)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample the next chunk, holding back outputs that still need later input"""
+        samples = np.asarray(samples, dtype=np.float32)
+        self._consumed += len(samples)
+        if self.passthrough:
+            return samples
+        self._buffer = np.concatenate([self._buffer, samples])
+        # Output n reads input up to (n * down + half_len) // up
+        ready = -(-(self._consumed * self.up - self._half_len) // self.down)
+        return self._emit(ready)
+
+    def flush(self) -> np.ndarray:
+        """Emit the remaining outputs, treating the input as zero past its end"""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        total = self.output_length(self._consumed)
+        if total > self._emitted:
+            last_input = ((total - 1) * self.down + self._half_len) // self.up
+            padding = last_input + 1 - (self._start + len(self._buffer))
+            if padding > 0:
+                self._buffer = np.concatenate([self._buffer, np.zeros(padding, dtype=np.float32)])
+        return self._emit(total)
+
+    def _emit(self, end: int) -> np.ndarray:
+        count = end - self._emitted
+        if count <= 0:
+            return np.zeros(0, dtype=np.float32)
+        out = np.empty(count, dtype=np.float32)
+        windows = sliding_window_view(self._buffer, self._taps)
+
+        # Outputs n, n + up, n + 2*up, ... share a filter phase and their
+        # input windows advance by `down` samples
+        for residue in range(min(self.up, count)):
+            first = self._emitted + residue
+            rows = -(-(end - first) // self.up)
+            position = first * self.down + self._half_len
+            phase = self._bank[position % self.up]
+            window_start = position // self.up - (self._taps - 1) - self._start
+            for row in range(0, rows, RESAMPLE_BLOCK_ROWS):
+                block = min(RESAMPLE_BLOCK_ROWS, rows - row)
+                start = window_start + row * self.down
+                out[residue + row * self.up::self.up][:block] = \
+                    windows[start:start + block * self.down:self.down] @ phase
+
+        self._emitted = end
+        # Drop input no later output can reach
+        keep_from = (end * self.down + self._half_len) // self.up - (self._taps - 1)
+        if keep_from > self._start:
+            self._buffer = self._buffer[keep_from - self._start:]
+            self._start = keep_from
+        return out
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    Band-limited polyphase resampling of a whole clip
+
+    Args:
+        samples: Mono float32 samples
+        source_rate: Sample rate of samples
+        target_rate: Output sample rate
+
+    Returns:
+        float32 samples, ceil(len * target / source) long
+    """
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    resampler = PolyphaseResampler(source_rate, target_rate)
+    head = resampler.process(samples)
+    tail = resampler.flush()
+    return np.concatenate([head, tail]) if len(tail) else head
+
+
+def _gain_limit(samples: np.ndarray, gain: float, max_gain_db: float) -> float:
+    """Cap gain at max_gain_db and keep the peak below full scale"""
+    peak = max(float(samples.max()), -float(samples.min()))
+    gain = min(gain, 10.0 ** (max_gain_db / 20.0))
+    return min(gain, 1.0 / peak) if peak > 0 else gain
+
+
+def _apply_gain(samples: np.ndarray, gain: float) -> np.ndarray:
+    if abs(gain - 1.0) < 1e-3:
+        return samples
+    return samples * np.float32(gain)
+
+
+def peak_normalize(samples: np.ndarray, target_peak: float = PEAK_TARGET,
+                   max_gain_db: float = MAX_GAIN_DB) -> np.ndarray:
+    """Scale so the largest absolute sample is target_peak, boosting by at most max_gain_db"""
+    if len(samples) == 0:
+        return samples
+    peak = max(float(samples.max()), -float(samples.min()))
+    if peak == 0:
+        return samples
+    return _apply_gain(samples, _gain_limit(samples, target_peak / peak, max_gain_db))
+
+
+def rms_normalize(samples: np.ndarray, target_dbfs: float = RMS_TARGET_DBFS,
+                  max_gain_db: float = MAX_GAIN_DB) -> np.ndarray:
+    """Scale to an RMS level of target_dbfs without clipping, boosting by at most max_gain_db"""
+    if len(samples) == 0:
+        return samples
+    mean_square = float(np.dot(samples, samples)) / len(samples)
+    if mean_square == 0:
+        return samples
+    rms_dbfs = 10.0 * np.log10(mean_square)
+    return _apply_gain(samples, _gain_limit(samples, 10.0 ** ((target_dbfs - rms_dbfs) / 20.0), max_gain_db))
+
+
+def normalize_level(samples: np.ndarray, mode: str = AUDIO_NORMALIZATION) -> np.ndarray:
+    """
+    Apply the configured level normalisation
+
+    Args:
+        samples: Mono float32 samples
+        mode: 'peak', 'rms' or 'none'
+
+    Returns:
+        Scaled samples (the input itself when no gain is needed)
+    """
+    if mode == 'peak':
+        return peak_normalize(samples)
+    if mode == 'rms':
+        return rms_normalize(samples)
+    return samples
+
+
+def normalize_pcm(payload, format_tag: int, bits: int, channels: int, sample_rate: int,
+                  target_rate: int = TARGET_SAMPLE_RATE) -> Optional[np.ndarray]:
+    """
+    Convert, downmix and resample raw samples to target_rate mono float32
+
+    Returns:
+        float32 samples, or None for an unsupported encoding
+    """
+    samples = to_mono_float32(payload, format_tag, bits, channels)
+    if samples is None:
+        return None
+    return resample(samples, sample_rate, target_rate)
@@ -0,0 +1,288 @@
+"""
+Streaming Audio Uploads for Samantha AI MCP Server
+Reads uploads chunk by chunk with a size limit, decoding WAV on the fly and
+spooling other containers to disk only above a memory threshold
+"""
+
+import binascii
+import hashlib
+import io
+import logging
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, List, Optional, Union
+
+import numpy as np
+
+from .audio_decoder import DecodedAudio, is_wav
+from .audio_normalization import (
+    PolyphaseResampler, TARGET_SAMPLE_RATE, WAVE_FORMAT_EXTENSIBLE, WAVE_FORMAT_IEEE_FLOAT,
+    is_supported_encoding, is_supported_sample_rate, to_mono_float32
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upload configuration (overridable via environment)
+MAX_UPLOAD_BYTES = int(os.getenv("SAMANTHA_MAX_AUDIO_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+SPOOL_MEMORY_BYTES = int(os.getenv("SAMANTHA_AUDIO_SPOOL_MEMORY_BYTES", str(1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+# A WAV whose data chunk has not started within this many bytes is not one we decode
+MAX_WAV_HEADER_BYTES = 64 * 1024
+
+
+class AudioUploadTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES"""
+
+
+class IncrementalWavDecoder:
+    """Decodes PCM/float WAV to 16 kHz mono float32 as bytes arrive"""
+
+    def __init__(self, target_rate: int = TARGET_SAMPLE_RATE):
+        self.target_rate = target_rate
+        self.supported = True
+        self.header = bytearray()     # raw bytes received before the data payload
+        self._in_data = False
+        self._pending = b''
+        self._remaining: Optional[int] = None
+        self._parts: List[np.ndarray] = []
+        self._resampler: Optional[PolyphaseResampler] = None
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Consume the next chunk of the upload
+
+        Returns:
+            False once the stream turns out not to be a WAV this decoder
+            handles; the caller should then fall back to another decoder
+            using the bytes in self.header
+        """
+        if not self.supported:
+            return False
+        if not self._in_data:
+            self.header += chunk
+            payload = self._parse_header()
+            if payload is None:
+                if len(self.header) > MAX_WAV_HEADER_BYTES:
+                    self.supported = False
+                return self.supported
+            chunk = payload
+        self._consume(chunk)
+        return True
+
+    def _parse_header(self) -> Optional[bytes]:
+        """Return payload bytes once the data chunk starts; None while more header is needed"""
+        header = self.header
+        if len(header) < 12:
+            return None
+        if not is_wav(header):
+            self.supported = False
+            return None
+
+        fmt = None
+        offset = 12
+        while offset + 8 <= len(header):
+            chunk_id, chunk_size = struct.unpack_from('<4sI', header, offset)
+            body_start = offset + 8
+            if chunk_id == b'data':
+                if fmt is None:
+                    self.supported = False
+                    return None
+                self._start_data(fmt, chunk_size)
+                return bytes(header[body_start:]) if self.supported else None
+            if body_start + chunk_size > len(header):
+                return None
+            if chunk_id == b'fmt ' and chunk_size >= 16:
+                format_tag, channels, sample_rate, _, _, bits = struct.unpack_from('<HHIIHH', header, body_start)
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                    format_tag = struct.unpack_from('<H', header, body_start + 24)[0]
+                fmt = (format_tag, channels, sample_rate, bits)
+            offset = body_start + chunk_size + (chunk_size & 1)
+        return None
+
+    def _start_data(self, fmt, chunk_size: int):
+        self.format_tag, self.channels, self.sample_rate, self.bits = fmt
+        if self.channels < 1 or not is_supported_sample_rate(self.sample_rate) or \
+                not is_supported_encoding(self.format_tag, self.bits):
+            logger.info(f"Unsupported WAV encoding (format={self.format_tag}, bits={self.bits}, "
+                        f"rate={self.sample_rate}); using fallback decoder")
+            self.supported = False
+            return
+        # Streaming writers leave the size as 0 or 0xFFFFFFFF; read to the end
+        self._remaining = None if chunk_size in (0, 0xFFFFFFFF) else chunk_size
+        self._resampler = PolyphaseResampler(self.sample_rate, self.target_rate)
+        self._in_data = True
+
+    def _consume(self, chunk: bytes):
+        if not self._in_data:
+            return
+        if self._remaining is not None:
+            chunk = chunk[:self._remaining]
+            self._remaining -= len(chunk)
+        data = self._pending + chunk
+        frame = (self.bits // 8) * self.channels
+        usable = len(data) - len(data) % frame
+        self._pending = data[usable:]
+        if usable == 0:
+            return
+
+        samples = to_mono_float32(memoryview(data)[:usable], self.format_tag, self.bits, self.channels)
+        self._parts.append(self._resampler.process(samples))
+
+    def finish(self) -> Optional[DecodedAudio]:
+        """Decoded audio, or None if the upload never reached a supported data chunk"""
+        if not (self.supported and self._in_data):
+            return None
+        self._parts.append(self._resampler.flush())
+        samples = np.concatenate(self._parts) if self._parts else np.zeros(0, dtype=np.float32)
+        self._parts = []
+        return DecodedAudio(
+            samples=np.ascontiguousarray(samples, dtype=np.float32),
+            sample_rate=self.target_rate,
+            source_sample_rate=self.sample_rate,
+            source_channels=self.channels,
+            source_format=f"wav/{'float' if self.format_tag == WAVE_FORMAT_IEEE_FLOAT else 'pcm'}{self.bits}"
+        )
+
+
+class AudioSpool:
+    """Raw upload bytes kept in memory up to a threshold, then in a temp file"""
+
+    def __init__(self, max_memory_bytes: int = SPOOL_MEMORY_BYTES):
+        self.max_memory_bytes = max_memory_bytes
+        self.size = 0
+        self._buffer = io.BytesIO()
+        self._file = None
+
+    @property
+    def on_disk(self) -> bool:
+        return self._file is not None
+
+    def write(self, data: bytes):
+        if self._file is None and self.size + len(data) > self.max_memory_bytes:
+            self._roll_to_disk()
+        (self._file or self._buffer).write(data)
+        self.size += len(data)
+
+    def _roll_to_disk(self):
+        self._file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+        self._file.write(self._buffer.getbuffer())
+        self._buffer = io.BytesIO()
+
+    def path(self) -> str:
+        """Path of the spooled bytes for decoders that need a file (e.g. ffmpeg)"""
+        if self._file is None:
+            self._roll_to_disk()
+        self._file.flush()
+        return self._file.name
+
+    def source(self) -> Union[bytes, str]:
+        """The spooled bytes while they are still in memory, otherwise the temp file path"""
+        return bytes(self._buffer.getbuffer()) if self._file is None else self.path()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            try:
+                Path(self._file.name).unlink()
+            except OSError:
+                pass
+            self._file = None
+        self._buffer = io.BytesIO()
+
+
+@dataclass
+class AudioUpload:
+    """An upload read to completion: decoded in memory, or spooled for ffmpeg"""
+    size: int
+    sha256: str
+    decoded: Optional[DecodedAudio] = None
+    spool: Optional[AudioSpool] = None
+
+    def close(self):
+        if self.spool is not None:
+            self.spool.close()
+
+
+async def read_audio_upload(chunks: AsyncIterable[bytes], max_bytes: int = MAX_UPLOAD_BYTES,
+                            spool_memory_bytes: int = SPOOL_MEMORY_BYTES) -> AudioUpload:
+    """
+    Consume an upload incrementally
+
+    WAV payloads are converted and resampled chunk by chunk, so only the
+    16 kHz float32 result is held. Other formats are spooled (to disk once
+    they pass spool_memory_bytes) for the ffmpeg path.
+
+    Args:
+        chunks: Upload bytes in arrival order
+        max_bytes: Largest accepted upload
+        spool_memory_bytes: Raw bytes kept in memory before spooling to disk
+
+    Returns:
+        AudioUpload; the caller must close() it
+
+    Raises:
+        AudioUploadTooLargeError: As soon as the upload passes max_bytes
+    """
+    decoder = IncrementalWavDecoder()
+    spool: Optional[AudioSpool] = None
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise AudioUploadTooLargeError(f"Audio upload exceeds {max_bytes} bytes")
+            digest.update(chunk)
+            if spool is not None:
+                spool.write(chunk)
+            elif not decoder.feed(chunk):
+                # Not a WAV we decode; everything so far is still in the header buffer
+                spool = AudioSpool(spool_memory_bytes)
+                spool.write(bytes(decoder.header))
+                decoder.header = bytearray()
+
+        decoded = decoder.finish() if spool is None else None
+        if spool is None and decoded is None:
+            # Ended before any audio data (e.g. truncated header); let ffmpeg try
+            spool = AudioSpool(spool_memory_bytes)
+            spool.write(bytes(decoder.header))
+    except BaseException:
+        if spool is not None:
+            spool.close()
+        raise
+
+    return AudioUpload(size=size, sha256=digest.hexdigest(), decoded=decoded, spool=spool)
+
+
+async def iter_upload_chunks(upload, chunk_size: int = UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Read a file-like upload with an async read(n) (e.g. FastAPI UploadFile) in chunks"""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_base64_chunks(data: str, chunk_chars: int = UPLOAD_CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """
+    Decode a base64 string slice by slice instead of into one full copy
+
+    Whitespace (e.g. line-wrapped base64) is skipped; each decode works on a
+    multiple of four characters, carrying the remainder to the next slice.
+    """
+    carry = ''
+    for offset in range(0, len(data), chunk_chars):
+        piece = carry + ''.join(data[offset:offset + chunk_chars].split())
+        usable = len(piece) - len(piece) % 4
+        carry = piece[usable:]
+        if usable:
+            yield binascii.a2b_base64(piece[:usable])
+    if carry:
+        # Unpadded tail: pad so the final bytes still decode
+        yield binascii.a2b_base64(carry + '=' * (-len(carry) % 4))
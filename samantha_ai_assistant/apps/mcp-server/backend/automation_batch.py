@@ -0,0 +1,277 @@
+"""
+Automation Batch Executor for Samantha AI MCP Server
+Runs multi-step automation workflows as a dependency graph with bounded concurrency
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .system_automation import system_automation
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Batch configuration (overridable via environment)
+BATCH_MAX_CONCURRENT = int(os.getenv("SAMANTHA_BATCH_MAX_CONCURRENT", "4"))
+BATCH_MAX_STEPS = int(os.getenv("SAMANTHA_BATCH_MAX_STEPS", "50"))
+
+# Failure modes
+STOP_ON_FAILURE = 'stop'          # start no further steps after the first failure
+CONTINUE_ON_ERROR = 'continue'    # only the failed step's dependents are skipped
+BATCH_MODES = (STOP_ON_FAILURE, CONTINUE_ON_ERROR)
+
+
+@dataclass
+class BatchStep:
+    """One operation of a batch and the steps that must succeed before it"""
+    id: str
+    command: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], index: int) -> 'BatchStep':
+        """Build a step from a request item; steps without an id are named by position"""
+        if not isinstance(data, dict) or not data.get('command'):
+            raise ValueError(f"Step {index} needs a 'command'")
+        depends_on = data.get('depends_on') or []
+        if isinstance(depends_on, str):
+            depends_on = [depends_on]
+        return cls(
+            id=str(data.get('id') or f"step{index}"),
+            command=data['command'],
+            params=data.get('params') or {},
+            depends_on=[str(dependency) for dependency in depends_on]
+        )
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step; started is seconds from the start of the batch"""
+    id: str
+    command: str
+    status: str                                 # 'succeeded' | 'failed' | 'skipped'
+    result: Optional[Dict[str, Any]] = None     # AutomationResult.to_dict() when the step ran
+    started: Optional[float] = None
+    duration: float = 0.0
+    skipped_reason: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """Per-step outcomes in request order"""
+    success: bool
+    mode: str
+    steps: List[StepResult]
+    duration: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts = {'succeeded': 0, 'failed': 0, 'skipped': 0}
+        for step in self.steps:
+            counts[step.status] += 1
+        return {
+            'success': self.success,
+            'mode': self.mode,
+            'duration': self.duration,
+            **counts,
+            'steps': [step.__dict__ for step in self.steps]
+        }
+
+
+def validate_steps(steps: Sequence[BatchStep]):
+    """
+    Check that ids are unique, dependencies exist and the graph has no cycle
+
+    Raises:
+        ValueError: describing the first problem found
+    """
+    if not steps:
+        raise ValueError("A batch needs at least one step")
+    if len(steps) > BATCH_MAX_STEPS:
+        raise ValueError(f"At most {BATCH_MAX_STEPS} steps per batch")
+
+    ids = set()
+    for step in steps:
+        if step.id in ids:
+            raise ValueError(f"Duplicate step id: {step.id}")
+        ids.add(step.id)
+    for step in steps:
+        for dependency in step.depends_on:
+            if dependency not in ids:
+                raise ValueError(f"Step {step.id} depends on unknown step {dependency}")
+            if dependency == step.id:
+                raise ValueError(f"Step {step.id} depends on itself")
+
+    # Kahn's algorithm: anything never reaching in-degree zero sits on a cycle
+    indegree = {step.id: len(set(step.depends_on)) for step in steps}
+    dependents = _dependents(steps)
+    ready = [step_id for step_id, degree in indegree.items() if degree == 0]
+    visited = 0
+    while ready:
+        step_id = ready.pop()
+        visited += 1
+        for dependent in dependents[step_id]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+    if visited < len(steps):
+        cyclic = sorted(step_id for step_id, degree in indegree.items() if degree > 0)
+        raise ValueError(f"Dependency cycle between steps: {', '.join(cyclic)}")
+
+
+def _dependents(steps: Sequence[BatchStep]) -> Dict[str, List[str]]:
+    dependents: Dict[str, List[str]] = {step.id: [] for step in steps}
+    for step in steps:
+        for dependency in set(step.depends_on):
+            dependents[dependency].append(step.id)
+    return dependents
+
+
+class BatchExecutor:
+    """
+    Executes a batch of automation steps in dependency order
+
+    A step starts once all of its dependencies have succeeded, independent
+    steps run concurrently up to max_concurrent, and steps are started in
+    request order when more are ready than there are free slots. Steps
+    already running when a failure stops the batch are allowed to finish,
+    so no operation is left half done.
+    """
+
+    def __init__(self, automation, max_concurrent: int = BATCH_MAX_CONCURRENT):
+        self.automation = automation
+        self.max_concurrent = max_concurrent
+        self._stats = {
+            'batches': 0,
+            'steps_succeeded': 0,
+            'steps_failed': 0,
+            'steps_skipped': 0,
+            'total_duration': 0.0
+        }
+
+    async def run(self, steps: Sequence[BatchStep], mode: str = STOP_ON_FAILURE) -> BatchResult:
+        """
+        Run a batch to completion
+
+        Args:
+            steps: Steps in request order
+            mode: STOP_ON_FAILURE or CONTINUE_ON_ERROR
+
+        Returns:
+            BatchResult with one StepResult per step, in request order
+
+        Raises:
+            ValueError: for an unknown mode or an invalid dependency graph
+        """
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unknown batch mode: {mode} (expected one of {', '.join(BATCH_MODES)})")
+        validate_steps(steps)
+
+        start_time = time.perf_counter()
+        order = {step.id: index for index, step in enumerate(steps)}
+        by_id = {step.id: step for step in steps}
+        dependents = _dependents(steps)
+        waiting_on = {step.id: len(set(step.depends_on)) for step in steps}
+        ready = [step.id for step in steps if waiting_on[step.id] == 0]
+        results: Dict[str, StepResult] = {}
+        running: Dict[asyncio.Task, str] = {}
+        stopped_by: Optional[str] = None
+
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_concurrent and stopped_by is None:
+                    step = by_id[ready.pop(0)]
+                    task = asyncio.create_task(self._run_step(step, start_time))
+                    running[task] = step.id
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda finished: order[running[finished]]):
+                    step_id = running.pop(task)
+                    outcome = task.result()
+                    results[step_id] = outcome
+                    if outcome.status == 'succeeded':
+                        for dependent in dependents[step_id]:
+                            waiting_on[dependent] -= 1
+                            if waiting_on[dependent] == 0:
+                                ready.append(dependent)
+                        ready.sort(key=order.__getitem__)
+                    else:
+                        self._skip_dependents(step_id, dependents, by_id, results)
+                        if mode == STOP_ON_FAILURE and stopped_by is None:
+                            stopped_by = step_id
+        finally:
+            # Cancelled with the request: do not leave steps running unobserved
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        for step in steps:
+            if step.id not in results:
+                results[step.id] = StepResult(
+                    id=step.id, command=step.command, status='skipped',
+                    skipped_reason=f"batch stopped after step {stopped_by} failed"
+                )
+
+        ordered = [results[step.id] for step in steps]
+        batch = BatchResult(
+            success=all(step.status == 'succeeded' for step in ordered),
+            mode=mode,
+            steps=ordered,
+            duration=time.perf_counter() - start_time
+        )
+        self._record(batch)
+        return batch
+
+    async def _run_step(self, step: BatchStep, batch_start: float) -> StepResult:
+        started = time.perf_counter()
+        result = await self.automation.execute_command(step.command, step.params)
+        return StepResult(
+            id=step.id,
+            command=step.command,
+            status='succeeded' if result.success else 'failed',
+            result=result.to_dict(),
+            started=started - batch_start,
+            duration=time.perf_counter() - started
+        )
+
+    def _skip_dependents(self, failed_id: str, dependents: Dict[str, List[str]],
+                         by_id: Dict[str, BatchStep], results: Dict[str, StepResult]):
+        """Mark every step downstream of a failed or skipped step as skipped"""
+        pending = [(dependent, failed_id) for dependent in dependents[failed_id]]
+        while pending:
+            step_id, cause = pending.pop()
+            if step_id in results:
+                continue
+            results[step_id] = StepResult(
+                id=step_id, command=by_id[step_id].command, status='skipped',
+                skipped_reason=f"dependency {cause} did not succeed"
+            )
+            pending.extend((dependent, step_id) for dependent in dependents[step_id])
+
+    def _record(self, batch: BatchResult):
+        self._stats['batches'] += 1
+        self._stats['total_duration'] += batch.duration
+        for step in batch.steps:
+            self._stats[f"steps_{step.status}"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batch and step outcome counters"""
+        batches = self._stats['batches']
+        return {
+            'max_concurrent': self.max_concurrent,
+            'max_steps': BATCH_MAX_STEPS,
+            **{key: value for key, value in self._stats.items() if key != 'total_duration'},
+            'avg_duration': self._stats['total_duration'] / batches if batches else 0.0
+        }
+
+
+# Global batch executor instance
+batch_executor = BatchExecutor(system_automation)
@@ -0,0 +1,121 @@
+"""
+Automation Operation Registry for Samantha AI MCP Server
+Declarative specs (handler, parameters, platforms, side effects) for automation operations
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ParamSpec:
+    """One named parameter of an operation"""
+    name: str
+    type: type = str
+    required: bool = False
+    default: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'type': self.type.__name__,
+            'required': self.required,
+            'default': self.default
+        }
+
+
+@dataclass(frozen=True)
+class OperationSpec:
+    """
+    An automation operation as the dispatcher sees it
+
+    The handler is awaited with the bound parameters as keyword arguments
+    and returns an AutomationResult.
+    """
+    name: str                                   # dispatch name, e.g. 'file_create'
+    category: str                               # listing group, e.g. 'file_operations'
+    handler: Callable[..., Awaitable[Any]]
+    params: Tuple[ParamSpec, ...] = ()
+    platforms: Optional[FrozenSet[str]] = None  # platform.system().lower() values; None = all
+    mutating: bool = True                       # False for read-only operations
+    description: str = ''
+
+    def available_on(self, os_type: str) -> bool:
+        return self.platforms is None or os_type in self.platforms
+
+    def bind(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate request parameters against the schema
+
+        Missing optional parameters take their defaults, numeric strings are
+        accepted for int parameters and unknown parameters are ignored.
+
+        Raises:
+            ValueError: listing every missing or mistyped parameter
+        """
+        bound, problems = {}, []
+        for param in self.params:
+            value = params.get(param.name)
+            if value is None:
+                if param.required:
+                    problems.append(f"'{param.name}' is required")
+                else:
+                    bound[param.name] = param.default
+                continue
+            try:
+                if param.type is int and not isinstance(value, bool):
+                    value = int(value)
+                elif not isinstance(value, param.type):
+                    raise TypeError()
+            except (TypeError, ValueError):
+                problems.append(f"'{param.name}' must be {param.type.__name__}")
+                continue
+            bound[param.name] = value
+        if problems:
+            raise ValueError(', '.join(problems))
+        return bound
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'category': self.category,
+            'params': [param.to_dict() for param in self.params],
+            'platforms': sorted(self.platforms) if self.platforms is not None else None,
+            'mutating': self.mutating,
+            'description': self.description
+        }
+
+
+class OperationRegistry:
+    """Operations by dispatch name; lookup is a single dict access"""
+
+    def __init__(self):
+        self._operations: Dict[str, OperationSpec] = {}
+
+    def register(self, spec: OperationSpec) -> OperationSpec:
+        if spec.name in self._operations:
+            raise ValueError(f"Operation already registered: {spec.name}")
+        self._operations[spec.name] = spec
+        return spec
+
+    def get(self, name: str) -> Optional[OperationSpec]:
+        return self._operations.get(name)
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def available(self, os_type: str) -> List[OperationSpec]:
+        """Operations usable on this OS, in registration order"""
+        return [spec for spec in self._operations.values() if spec.available_on(os_type)]
+
+    def categories(self, os_type: str) -> Dict[str, List[str]]:
+        """Dispatch names usable on this OS, grouped by category"""
+        grouped: Dict[str, List[str]] = {}
+        for spec in self.available(os_type):
+            grouped.setdefault(spec.category, []).append(spec.name)
+        return grouped
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Audio Normalization Benchmark for Samantha AI MCP Server
+Compares the in-memory NumPy decode/resample path with Whisper's ffmpeg loader
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add the MCP server directory (backend package) to Python path
+MCP_SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(MCP_SERVER_DIR)
+
+from backend.audio_decoder import decode_wav_bytes
+from backend.audio_normalization import TARGET_SAMPLE_RATE, WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM, resample
+
+# (label, sample rate, channels, format tag, bits) covering what clients send
+FORMATS = [
+    ('16k mono pcm16', 16000, 1, WAVE_FORMAT_PCM, 16),
+    ('44.1k stereo pcm16', 44100, 2, WAVE_FORMAT_PCM, 16),
+    ('48k stereo pcm24', 48000, 2, WAVE_FORMAT_PCM, 24),
+    ('22.05k mono pcm8', 22050, 1, WAVE_FORMAT_PCM, 8),
+    ('48k mono float32', 48000, 1, WAVE_FORMAT_IEEE_FLOAT, 32),
+]
+
+
+def build_wav(seconds: float, sample_rate: int, channels: int, format_tag: int, bits: int) -> bytes:
+    """A speech-band test signal (tones plus noise) encoded as a WAV file"""
+    rng = np.random.default_rng(3)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    mono = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 1760 * t) + \
+        0.02 * rng.standard_normal(len(t))
+    frames = np.repeat(mono[:, None], channels, axis=1)
+
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        payload = frames.astype('<f4').tobytes()
+    elif bits == 8:
+        payload = (frames * 127 + 128).astype(np.uint8).tobytes()
+    elif bits == 16:
+        payload = (frames * 32767).astype('<i2').tobytes()
+    else:
+        ints = (frames * 8388607).astype('<i4').reshape(-1, 1).view(np.uint8).reshape(-1, 4)
+        payload = ints[:, :3].tobytes()
+
+    block_align = channels * bits // 8
+    header = struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + len(payload), b'WAVE', b'fmt ', 16, format_tag, channels, sample_rate,
+        sample_rate * block_align, block_align, bits, b'data', len(payload)
+    )
+    return header + payload
+
+
+def ffmpeg_load(data: bytes) -> np.ndarray:
+    """The fallback path: temp file plus the ffmpeg invocation of whisper.audio.load_audio"""
+    with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
+        temp_file.write(data)
+        temp_file.flush()
+        command = ['ffmpeg', '-nostdin', '-threads', '0', '-i', temp_file.name, '-f', 's16le',
+                   '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(TARGET_SAMPLE_RATE), '-']
+        output = subprocess.run(command, capture_output=True, check=True).stdout
+    return np.frombuffer(output, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+def linear_resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """The previous linear-interpolation resampler, for the aliasing comparison"""
+    target_length = int(round(len(samples) * target_rate / source_rate))
+    positions = np.arange(target_length, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def alias_db(resampler, source_rate: int, frequency: float = 10000.0) -> float:
+    """Level in dB of a full-scale tone above the target Nyquist after resampling (lower is better)"""
+    t = np.arange(source_rate) / source_rate
+    output = resampler(np.sin(2 * np.pi * frequency * t).astype(np.float32), source_rate, TARGET_SAMPLE_RATE)
+    steady = output[len(output) // 10:-len(output) // 10]
+    return 20.0 * np.log10(np.sqrt(np.mean(steady ** 2) * 2) + 1e-12)
+
+
+def time_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=10.0, help='clip length')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    has_ffmpeg = shutil.which('ffmpeg') is not None
+    if not has_ffmpeg:
+        print("ffmpeg not found; timing the in-memory path only\n")
+
+    print(f"{'format':>20} {'numpy ms':>10} {'ffmpeg ms':>10} {'speedup':>8}")
+    for label, sample_rate, channels, format_tag, bits in FORMATS:
+        data = build_wav(args.seconds, sample_rate, channels, format_tag, bits)
+        decoded = decode_wav_bytes(data)
+        assert decoded is not None and abs(decoded.duration - args.seconds) < 0.01, label
+
+        numpy_ms = time_ms(lambda: decode_wav_bytes(data), args.repeat)
+        if has_ffmpeg:
+            ffmpeg_ms = time_ms(lambda: ffmpeg_load(data), args.repeat)
+            print(f"{label:>20} {numpy_ms:>10.2f} {ffmpeg_ms:>10.2f} {ffmpeg_ms / numpy_ms:>7.1f}x")
+        else:
+            print(f"{label:>20} {numpy_ms:>10.2f} {'-':>10} {'-':>8}")
+
+    print("\n10 kHz tone folded below 8 kHz (dBFS, lower is better)")
+    print(f"{'source rate':>20} {'polyphase':>10} {'linear':>10}")
+    for sample_rate in (22050, 44100, 48000):
+        print(f"{sample_rate:>20} {alias_db(resample, sample_rate):>10.1f} "
+              f"{alias_db(linear_resample, sample_rate):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Intent Matcher Benchmark for Samantha AI MCP Server
+Compares the compiled Aho-Corasick matcher with the per-pattern substring loop
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from typing import Dict, List
+
+# Add the MCP server directory (backend package) to Python path
+MCP_SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(MCP_SERVER_DIR)
+
+from backend.intent_matcher import IntentMatcher
+
+BASE_PATTERNS = {
+    'browser_navigation': ['open', 'go to', 'navigate to', 'visit', 'search for',
+                           'new tab', 'close tab', 'switch tab'],
+    'system_control': ['open app', 'launch', 'start', 'quit', 'close',
+                       'volume up', 'volume down', 'mute', 'unmute'],
+    'file_operations': ['create file', 'save', 'delete', 'move', 'copy',
+                        'find file', 'open file', 'create folder'],
+    'web_automation': ['click', 'type', 'scroll', 'fill form', 'submit',
+                       'select', 'check', 'uncheck', 'hover'],
+    'information_query': ['what is', 'how to', 'tell me about', 'search',
+                          'find information', 'look up']
+}
+
+UTTERANCES = [
+    "open safari and go to github dot com",
+    "please turn the volume up a little bit",
+    "create folder called quarterly reports on the desktop",
+    "what is the weather like in san francisco today",
+    "scroll down and click the submit button",
+    "i would like you to tell me about the history of the roman empire",
+]
+
+
+def scaled_patterns(phrases_per_intent: int, seed: int = 7) -> Dict[str, List[str]]:
+    """Pad each intent with synthetic two-word phrases up to the requested size"""
+    rng = random.Random(seed)
+    patterns = {}
+    for intent, phrases in BASE_PATTERNS.items():
+        phrases = list(phrases)
+        while len(phrases) < phrases_per_intent:
+            words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(2)]
+            phrases.append(' '.join(words))
+        patterns[intent] = phrases
+    return patterns
+
+
+def loop_scores(patterns: Dict[str, List[str]], text: str) -> Dict[str, float]:
+    """The original nested loop from VoiceProcessor._extract_intent"""
+    scores = {}
+    for intent, phrases in patterns.items():
+        score = 0
+        for phrase in phrases:
+            if phrase in text:
+                score += 1
+        if score > 0:
+            scores[intent] = score / len(phrases)
+    return scores
+
+
+def matcher_scores(matcher: IntentMatcher, patterns: Dict[str, List[str]], text: str) -> Dict[str, float]:
+    hits = matcher.hits_by_label(text)
+    return {intent: len(hits[intent]) / len(phrases)
+            for intent, phrases in patterns.items() if intent in hits}
+
+
+def time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in UTTERANCES:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(UTTERANCES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='8,100,1000,5000',
+                        help='comma-separated phrases per intent')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'phrases/intent':>15} {'build ms':>10} {'loop us':>10} {'matcher us':>11} {'speedup':>8}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        patterns = scaled_patterns(size)
+
+        build_start = time.perf_counter()
+        matcher = IntentMatcher(patterns)
+        build_ms = (time.perf_counter() - build_start) * 1000.0
+
+        for text in UTTERANCES:
+            assert loop_scores(patterns, text) == matcher_scores(matcher, patterns, text), text
+
+        loop_us = time_per_call(lambda text: loop_scores(patterns, text), args.repeat) * 1e6
+        matcher_us = time_per_call(lambda text: matcher_scores(matcher, patterns, text), args.repeat) * 1e6
+        print(f"{size:>15} {build_ms:>10.1f} {loop_us:>10.1f} {matcher_us:>11.1f} {loop_us / matcher_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Command Runner for Samantha AI MCP Server
+Non-blocking subprocess execution with timeouts, a concurrency limit and streamed capture
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Set
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Runner configuration (overridable via environment)
+COMMAND_TIMEOUT = float(os.getenv("SAMANTHA_COMMAND_TIMEOUT", "10"))
+MAX_CONCURRENT_COMMANDS = int(os.getenv("SAMANTHA_MAX_CONCURRENT_COMMANDS", "4"))
+MAX_CAPTURE_BYTES = 1024 * 1024     # per stream; output beyond this is read and discarded
+READ_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one child process"""
+    argv: Sequence[str]
+    exit_code: Optional[int]    # None when the command was killed on timeout
+    stdout: str
+    stderr: str
+    duration: float
+    timed_out: bool = False
+    truncated: bool = False     # output exceeded MAX_CAPTURE_BYTES
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0 and not self.timed_out
+
+    def error_text(self) -> str:
+        """Why the command failed, for AutomationResult.error"""
+        if self.timed_out:
+            return f"{self.argv[0]} timed out after {self.duration:.1f}s"
+        detail = self.stderr.strip().splitlines()
+        return f"{self.argv[0]} exited with {self.exit_code}" + (f": {detail[-1]}" if detail else '')
+
+
+class CommandRunner:
+    """
+    Runs automation commands as asyncio subprocesses
+
+    Commands never block the event loop: stdout and stderr are read
+    concurrently as the child writes them (optionally passed to a callback
+    chunk by chunk), at most max_concurrent commands run at once, and a
+    command still running at its timeout is killed.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_COMMANDS,
+                 timeout: float = COMMAND_TIMEOUT, max_capture: int = MAX_CAPTURE_BYTES):
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self.max_capture = max_capture
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+        self._detached: Set[asyncio.Task] = set()
+        self._stats = {
+            'completed': 0,
+            'failed': 0,
+            'timeouts': 0,
+            'total_duration': 0.0
+        }
+
+    async def run(self, argv: Sequence[str], timeout: Optional[float] = None,
+                  on_output: Optional[Callable[[str, bytes], None]] = None) -> CommandResult:
+        """
+        Run a command to completion
+
+        Args:
+            argv: Program and arguments (no shell)
+            timeout: Seconds before the command is killed; defaults to the runner's
+            on_output: Called with ('stdout' | 'stderr', chunk) as output arrives
+
+        Returns:
+            CommandResult; a non-zero exit or timeout is reported, not raised
+
+        Raises:
+            OSError: when the program cannot be started (e.g. not installed)
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        timeout = self.timeout if timeout is None else timeout
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        start_time = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = bytearray(), bytearray()
+            readers = asyncio.gather(
+                self._drain(process.stdout, 'stdout', stdout, on_output),
+                self._drain(process.stderr, 'stderr', stderr, on_output)
+            )
+            timed_out = False
+            try:
+                await asyncio.wait_for(asyncio.shield(readers), timeout)
+                await asyncio.wait_for(process.wait(), max(timeout - (time.perf_counter() - start_time), 0.001))
+            except asyncio.TimeoutError:
+                timed_out = True
+            finally:
+                # Timed out or cancelled: the child must not outlive the request
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                if not readers.done():
+                    readers.cancel()
+                    await asyncio.gather(readers, return_exceptions=True)
+
+            result = CommandResult(
+                argv=list(argv),
+                exit_code=None if timed_out else process.returncode,
+                stdout=stdout.decode(errors='replace'),
+                stderr=stderr.decode(errors='replace'),
+                duration=time.perf_counter() - start_time,
+                timed_out=timed_out,
+                truncated=len(stdout) >= self.max_capture or len(stderr) >= self.max_capture
+            )
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+
+        self._stats['completed'] += 1
+        self._stats['total_duration'] += result.duration
+        if timed_out:
+            self._stats['timeouts'] += 1
+            logger.warning(f"Command {argv[0]} killed after {timeout:.1f}s")
+        elif not result.ok:
+            self._stats['failed'] += 1
+        return result
+
+    async def _drain(self, stream: asyncio.StreamReader, name: str, buffer: bytearray,
+                     on_output: Optional[Callable[[str, bytes], None]]):
+        """Read a pipe to EOF so the child never blocks on a full pipe"""
+        while True:
+            chunk = await stream.read(READ_CHUNK_BYTES)
+            if not chunk:
+                return
+            if on_output is not None:
+                on_output(name, chunk)
+            room = self.max_capture - len(buffer)
+            if room > 0:
+                buffer.extend(chunk[:room])
+
+    async def spawn(self, argv: Sequence[str]) -> int:
+        """
+        Start a long-running program (an application) without waiting for it
+
+        The child is reaped in the background when it exits.
+
+        Returns:
+            The child's process ID
+
+        Raises:
+            OSError: when the program cannot be started
+        """
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            start_new_session=True
+        )
+        # Holding the process keeps asyncio from killing it when the object is collected
+        task = asyncio.create_task(process.wait())
+        self._detached.add(task)
+        task.add_done_callback(self._detached.discard)
+        return process.pid
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get running/waiting commands and outcome counters"""
+        completed = self._stats['completed']
+        return {
+            'max_concurrent': self.max_concurrent,
+            'timeout': self.timeout,
+            'running': self._running,
+            'waiting': self._waiting,
+            'detached': len(self._detached),
+            'completed': completed,
+            'failed': self._stats['failed'],
+            'timeouts': self._stats['timeouts'],
+            'avg_duration': self._stats['total_duration'] / completed if completed else 0.0
+        }
+
+
+# Global command runner instance
+command_runner = CommandRunner()
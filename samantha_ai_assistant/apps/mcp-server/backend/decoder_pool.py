@@ -0,0 +1,322 @@
+"""
+Decoder Worker Pool for Samantha AI MCP Server
+Long-lived audio decoder processes for compressed formats (WebM/Opus, AAC, MP3, ...)
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .audio_decoder import DecodedAudio
+from .decoder_worker import FRAME, META, TARGET_SAMPLE_RATE
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool configuration (overridable via environment); 0 workers disables the
+# pool and non-WAV audio goes through Whisper's own ffmpeg loader
+DECODER_WORKERS = int(os.getenv("SAMANTHA_DECODER_WORKERS", "2"))
+DECODER_QUEUE_SIZE = int(os.getenv("SAMANTHA_DECODER_QUEUE_SIZE", "32"))
+DECODE_TIMEOUT = float(os.getenv("SAMANTHA_DECODE_TIMEOUT", "30"))
+MAX_DECODE_SECONDS = float(os.getenv("SAMANTHA_MAX_DECODE_SECONDS", "3600"))
+WORKER_MAX_DECODES = 500        # recycle workers so libav/ffmpeg leaks cannot accumulate
+WORKER_START_TIMEOUT = 30.0
+HEALTH_CHECK_INTERVAL = 30.0
+HEALTH_CHECK_TIMEOUT = 5.0
+
+WORKER_SCRIPT = Path(__file__).with_name('decoder_worker.py')
+
+
+class DecoderError(Exception):
+    """Raised when audio cannot be decoded"""
+
+
+class DecoderPoolFullError(DecoderError):
+    """Raised when too many decodes are already waiting for a worker"""
+
+
+class DecoderTimeoutError(DecoderError):
+    """Raised when a decode (or the wait for a worker) exceeds its timeout"""
+
+
+def decoder_backend_available() -> bool:
+    """Whether workers have something to decode with (PyAV, else ffmpeg)"""
+    return importlib.util.find_spec('av') is not None or shutil.which('ffmpeg') is not None
+
+
+class _DecoderWorker:
+    """One decoder process and its pipes"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.backend: Optional[str] = None
+        self.decodes = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, str(WORKER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self.decodes = 0
+        try:
+            kind, payload = await asyncio.wait_for(self._read(), WORKER_START_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            self.kill()
+            raise DecoderError(f"Decoder worker {self.index} failed to start: {e!r}")
+        if kind != b'RDY ':
+            self.kill()
+            raise DecoderError(f"Decoder worker {self.index} sent {kind!r} instead of RDY")
+        self.backend = payload.decode()
+
+    async def request(self, kind: bytes, payload: bytes = b'', argument: int = 0) -> Tuple[bytes, bytes]:
+        self.process.stdin.write(FRAME.pack(kind, len(payload), argument))
+        if payload:
+            self.process.stdin.write(payload)
+        await self.process.stdin.drain()
+        return await self._read()
+
+    async def _read(self) -> Tuple[bytes, bytes]:
+        kind, length, _ = FRAME.unpack(await self.process.stdout.readexactly(FRAME.size))
+        return kind, await self.process.stdout.readexactly(length) if length else b''
+
+    def kill(self):
+        """Stop the process now; the next checkout starts a fresh one"""
+        if self.alive:
+            self.process.kill()
+        self.process = None
+
+
+class DecoderPool:
+    """
+    Bounded pool of long-lived decoder processes fed over pipes
+
+    Each worker keeps its decoder (PyAV, or an ffmpeg pipe when PyAV is not
+    installed) loaded between requests, so a short clip costs a decode
+    rather than a process start. At most `workers` decodes run at once and
+    at most `max_queue` wait; a worker that times out, crashes or reaches
+    WORKER_MAX_DECODES is replaced, and idle workers are pinged every
+    HEALTH_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self, workers: int = DECODER_WORKERS, max_queue: int = DECODER_QUEUE_SIZE,
+                 timeout: float = DECODE_TIMEOUT, max_seconds: float = MAX_DECODE_SECONDS):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_samples = int(max_seconds * TARGET_SAMPLE_RATE)
+
+        self._workers: List[_DecoderWorker] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._waiting = 0
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._stats = {
+            'decodes': 0,
+            'failures': 0,
+            'timeouts': 0,
+            'rejected': 0,
+            'restarts': 0,
+            'total_latency': 0.0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0 and decoder_backend_available()
+
+    @property
+    def backend(self) -> Optional[str]:
+        return next((worker.backend for worker in self._workers if worker.backend), None)
+
+    async def start(self):
+        """Start the workers (done lazily on first decode)"""
+        if self._idle is not None:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            workers = [_DecoderWorker(index) for index in range(self.workers)]
+            results = await asyncio.gather(*(worker.start() for worker in workers), return_exceptions=True)
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                for worker in workers:
+                    worker.kill()
+                raise errors[0]
+            idle: asyncio.Queue = asyncio.Queue()
+            for worker in workers:
+                idle.put_nowait(worker)
+            self._workers, self._idle = workers, idle
+            self._health_task = asyncio.create_task(self._health_loop())
+            logger.info(f"DecoderPool started with {self.workers} {self.backend} worker(s)")
+
+    async def shutdown(self):
+        """Stop the health checks and every worker"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for worker in self._workers:
+            worker.kill()
+        self._workers, self._idle = [], None
+
+    async def decode(self, source: Union[bytes, str]) -> DecodedAudio:
+        """
+        Decode compressed audio to 16 kHz mono float32
+
+        Args:
+            source: Encoded audio bytes, or the path of a file holding them
+
+        Returns:
+            DecodedAudio
+
+        Raises:
+            DecoderPoolFullError: when max_queue decodes are already waiting
+            DecoderTimeoutError: when no worker frees up, or the decode takes
+                longer than the timeout
+            DecoderError: when the input cannot be decoded
+        """
+        await self.start()
+        start_time = time.perf_counter()
+        worker = await self._checkout()
+
+        healthy = False
+        try:
+            if not worker.alive:
+                await self._restart(worker)
+            kind, payload = (b'DATA', source) if isinstance(source, (bytes, bytearray)) \
+                else (b'PATH', os.fsencode(source))
+            remaining = max(self.timeout - (time.perf_counter() - start_time), 0.001)
+            try:
+                status, body = await asyncio.wait_for(
+                    worker.request(kind, bytes(payload), self.max_samples), remaining
+                )
+            except asyncio.TimeoutError:
+                self._stats['timeouts'] += 1
+                raise DecoderTimeoutError(f"Decode exceeded {self.timeout:.1f}s")
+            except (asyncio.IncompleteReadError, BrokenPipeError, ConnectionResetError) as e:
+                self._stats['failures'] += 1
+                raise DecoderError(f"Decoder worker {worker.index} exited: {e!r}")
+
+            worker.decodes += 1
+            healthy = worker.decodes < WORKER_MAX_DECODES
+            if status != b'PCM ':
+                self._stats['failures'] += 1
+                raise DecoderError(body.decode(errors='replace'))
+
+            sample_rate, channels, codec = META.unpack_from(body)
+            samples = np.frombuffer(body, dtype='<f4', offset=META.size)
+            self._stats['decodes'] += 1
+            self._stats['total_latency'] += time.perf_counter() - start_time
+            return DecodedAudio(
+                samples=samples,
+                sample_rate=TARGET_SAMPLE_RATE,
+                source_sample_rate=sample_rate,
+                source_channels=channels,
+                source_format=f"{worker.backend}/{codec.rstrip(bytes(1)).decode() or 'unknown'}"
+            )
+        finally:
+            # A worker interrupted mid-request (timeout, crash, cancellation)
+            # may still be writing a response; replace it rather than reuse it
+            if not healthy:
+                worker.kill()
+            self._idle.put_nowait(worker)
+
+    async def _checkout(self) -> _DecoderWorker:
+        """Take an idle worker, waiting (within the queue bound) when all are busy"""
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        if self._waiting >= self.max_queue:
+            self._stats['rejected'] += 1
+            raise DecoderPoolFullError(f"Decoder queue full ({self._waiting} decodes waiting)")
+        self._waiting += 1
+        try:
+            return await asyncio.wait_for(self._idle.get(), self.timeout)
+        except asyncio.TimeoutError:
+            self._stats['timeouts'] += 1
+            raise DecoderTimeoutError(f"No decoder worker free within {self.timeout:.1f}s")
+        finally:
+            self._waiting -= 1
+
+    async def _restart(self, worker: _DecoderWorker):
+        worker.kill()
+        self._stats['restarts'] += 1
+        logger.info(f"Restarting decoder worker {worker.index}")
+        await worker.start()
+
+    async def health_check(self) -> int:
+        """
+        Ping idle workers and restart any that do not answer
+
+        Returns:
+            Number of workers restarted
+        """
+        if self._idle is None:
+            return 0
+        restarted = 0
+        for _ in range(self._idle.qsize()):
+            try:
+                worker = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            try:
+                if worker.alive:
+                    kind, _ = await asyncio.wait_for(worker.request(b'PING'), HEALTH_CHECK_TIMEOUT)
+                    if kind == b'PONG':
+                        continue
+                restarted += 1
+                await self._restart(worker)
+            except Exception as e:
+                logger.warning(f"Decoder worker {worker.index} failed its health check: {e!r}")
+                restarted += 1
+                worker.kill()
+            finally:
+                self._idle.put_nowait(worker)
+        return restarted
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+            try:
+                await self.health_check()
+            except Exception as e:
+                logger.error(f"Decoder health check failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker liveness, queue depth and decode counters"""
+        decodes = self._stats['decodes']
+        return {
+            'enabled': self.enabled,
+            'backend': self.backend,
+            'workers': self.workers,
+            'alive': sum(1 for worker in self._workers if worker.alive),
+            'idle': self._idle.qsize() if self._idle is not None else 0,
+            'waiting': self._waiting,
+            'decodes': decodes,
+            'failures': self._stats['failures'],
+            'timeouts': self._stats['timeouts'],
+            'rejected': self._stats['rejected'],
+            'restarts': self._stats['restarts'],
+            'avg_latency': self._stats['total_latency'] / decodes if decodes else 0.0
+        }
+
+
+# Global decoder pool instance
+decoder_pool = DecoderPool()
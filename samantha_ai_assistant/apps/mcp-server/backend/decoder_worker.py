@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Audio Decoder Worker for Samantha AI MCP Server
+Long-lived process that decodes compressed audio to 16 kHz mono float32 over pipes
+
+Started by decoder_pool.DecoderPool. Requests and responses are frames of
+FRAME (kind, payload length, argument) followed by the payload:
+
+    DATA <audio bytes>, argument = sample limit  ->  PCM  <META + float32 samples>
+    PATH <file path>,   argument = sample limit  ->  PCM  ... or ERR <message>
+    PING                                         ->  PONG
+
+The worker announces itself with RDY <backend name> once its decoder is loaded.
+"""
+
+import io
+import shutil
+import struct
+import subprocess
+import sys
+from typing import List, Tuple, Union
+
+import numpy as np
+
+TARGET_SAMPLE_RATE = 16000
+
+FRAME = struct.Struct('<4sII')
+# Source sample rate, channel count and codec name ahead of the PCM
+META = struct.Struct('<IH16s')
+
+
+class _SampleLimitExceeded(Exception):
+    pass
+
+
+def _decode_pyav(av, source: Union[bytes, str], max_samples: int) -> Tuple[np.ndarray, int, int, str]:
+    """Decode in-process with libav; bytes are read through a seekable buffer so MP4/M4A work"""
+    container = av.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    try:
+        stream = next((s for s in container.streams if s.type == 'audio'), None)
+        if stream is None:
+            raise ValueError("No audio stream")
+        resampler = av.AudioResampler(format='flt', layout='mono', rate=TARGET_SAMPLE_RATE)
+        parts: List[np.ndarray] = []
+        total = 0
+
+        def collect(frames):
+            nonlocal total
+            # PyAV < 9 returns a single frame (or None) instead of a list
+            for frame in frames if isinstance(frames, list) else [frames] if frames is not None else []:
+                samples = frame.to_ndarray().reshape(-1)
+                total += len(samples)
+                if total > max_samples:
+                    raise _SampleLimitExceeded()
+                parts.append(samples)
+
+        for frame in container.decode(stream):
+            collect(resampler.resample(frame))
+        collect(resampler.resample(None))
+
+        context = stream.codec_context
+        samples = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        return samples.astype(np.float32, copy=False), context.sample_rate or 0, \
+            context.channels or 0, context.name or ''
+    finally:
+        container.close()
+
+
+def _decode_ffmpeg(executable: str, source: Union[bytes, str], max_samples: int) -> Tuple[np.ndarray, int, int, str]:
+    """Decode through an ffmpeg pipe; used when PyAV is not installed"""
+    command = [
+        executable, '-nostdin', '-loglevel', 'error', '-threads', '0',
+        '-i', 'pipe:0' if isinstance(source, bytes) else source,
+        '-t', str(max_samples / TARGET_SAMPLE_RATE),
+        '-f', 'f32le', '-ac', '1', '-ar', str(TARGET_SAMPLE_RATE), 'pipe:1'
+    ]
+    result = subprocess.run(command, input=source if isinstance(source, bytes) else None,
+                            capture_output=True)
+    if result.returncode != 0:
+        lines = result.stderr.decode(errors='replace').strip().splitlines()
+        raise ValueError(lines[-1] if lines else f"ffmpeg exited with {result.returncode}")
+    return np.frombuffer(result.stdout, dtype='<f4'), 0, 0, ''
+
+
+def _send(stdout, kind: bytes, payload: bytes = b''):
+    stdout.write(FRAME.pack(kind, len(payload), 0))
+    stdout.write(payload)
+    stdout.flush()
+
+
+def _read_exactly(stdin, size: int) -> bytes:
+    data = stdin.read(size)
+    return data if data is not None and len(data) == size else b''
+
+
+def main():
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    # Keep stray prints from libraries out of the protocol stream
+    sys.stdout = sys.stderr
+
+    try:
+        import av
+        av.logging.set_level(av.logging.ERROR)
+        backend = 'pyav'
+
+        def decode(source, max_samples):
+            return _decode_pyav(av, source, max_samples)
+    except ImportError:
+        executable = shutil.which('ffmpeg')
+        backend = 'ffmpeg' if executable else 'none'
+
+        def decode(source, max_samples):
+            if executable is None:
+                raise ValueError("Neither PyAV nor ffmpeg is installed")
+            return _decode_ffmpeg(executable, source, max_samples)
+
+    _send(stdout, b'RDY ', backend.encode())
+
+    while True:
+        header = _read_exactly(stdin, FRAME.size)
+        if not header:
+            break   # pool closed the pipe
+        kind, length, max_samples = FRAME.unpack(header)
+        payload = _read_exactly(stdin, length) if length else b''
+        if length and not payload:
+            break
+
+        if kind == b'PING':
+            _send(stdout, b'PONG')
+            continue
+        try:
+            source = payload if kind == b'DATA' else payload.decode()
+            samples, sample_rate, channels, codec = decode(source, max_samples)
+            if len(samples) > max_samples:
+                raise _SampleLimitExceeded()
+            meta = META.pack(sample_rate, channels, codec.encode()[:16])
+            _send(stdout, b'PCM ', meta + samples.astype('<f4', copy=False).tobytes())
+        except _SampleLimitExceeded:
+            _send(stdout, b'ERR ', f"Audio longer than {max_samples / TARGET_SAMPLE_RATE:.0f}s".encode())
+        except Exception as e:
+            _send(stdout, b'ERR ', (str(e) or type(e).__name__).encode(errors='replace'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Directory Listing for Samantha AI MCP Server
+os.scandir listings with sorting, filtering, cursor pagination and streaming
+"""
+
+import base64
+import binascii
+import fnmatch
+import heapq
+import json
+import logging
+import os
+from dataclasses import dataclass, field, asdict
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .file_transfer import file_transfers
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Listing configuration (overridable via environment)
+LISTING_PAGE_SIZE = int(os.getenv("SAMANTHA_LISTING_PAGE_SIZE", "1000"))
+MAX_LISTING_PAGE_SIZE = 10000
+STREAM_BATCH_SIZE = 500         # entries statted per I/O pool round trip when streaming
+
+SORT_ORDERS = ('name', 'size', 'modified', 'none')     # 'none' = directory order, no full scan
+ENTRY_KINDS = ('file', 'directory')
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or was issued for a different listing"""
+    pass
+
+
+@dataclass
+class ListingOptions:
+    """How a directory is filtered and ordered"""
+    sort: str = 'name'
+    reverse: bool = False
+    pattern: Optional[str] = None       # fnmatch glob on the entry name, e.g. '*.pdf'
+    kind: Optional[str] = None          # 'file' | 'directory'
+    include_hidden: bool = True
+
+    def __post_init__(self):
+        if self.sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort: {self.sort} (expected one of {', '.join(SORT_ORDERS)})")
+        if self.kind is not None and self.kind not in ENTRY_KINDS:
+            raise ValueError(f"Unknown kind: {self.kind} (expected one of {', '.join(ENTRY_KINDS)})")
+        if self.sort == 'none' and self.reverse:
+            raise ValueError("Directory order cannot be reversed")
+
+
+@dataclass
+class ListingPage:
+    """One page of a listing; next_cursor is None on the last page"""
+    path: str
+    entries: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None         # matching entries; unknown for sort='none'
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, path: str, options: ListingOptions) -> Dict[str, Any]:
+    """
+    Decode a cursor and check it belongs to this path and these options
+
+    Raises:
+        InvalidCursorError: when the cursor cannot be used for this listing
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Malformed cursor")
+    if not isinstance(state, dict) or state.get('path') != path or state.get('options') != asdict(options):
+        raise InvalidCursorError("Cursor was issued for a different listing")
+    return state
+
+
+def _stat(entry: os.DirEntry) -> Optional[os.stat_result]:
+    """The entry's stat, cached on the DirEntry; a broken symlink reports the link itself"""
+    try:
+        return entry.stat()
+    except OSError:
+        try:
+            return entry.stat(follow_symlinks=False)
+        except OSError:
+            return None     # removed since the scan
+
+
+def _matches(entry: os.DirEntry, options: ListingOptions) -> bool:
+    # is_dir() comes from the directory read itself (d_type), not a stat
+    if not options.include_hidden and entry.name.startswith('.'):
+        return False
+    if options.kind is not None and (entry.is_dir() != (options.kind == 'directory')):
+        return False
+    return options.pattern is None or fnmatch.fnmatch(entry.name, options.pattern)
+
+
+def _sort_key(entry: os.DirEntry, sort: str) -> Optional[Tuple]:
+    """Total order key: the sort field with the name as tie-breaker"""
+    if sort == 'name':
+        return (entry.name.casefold(), entry.name)
+    stat = _stat(entry)
+    if stat is None:
+        return None
+    value = stat.st_size if sort == 'size' else stat.st_mtime
+    return (value, entry.name.casefold(), entry.name)
+
+
+def entry_to_dict(entry: os.DirEntry) -> Optional[Dict[str, Any]]:
+    """Listing record for an entry, using at most one stat call"""
+    stat = _stat(entry)
+    if stat is None:
+        return None
+    is_file = entry.is_file()
+    return {
+        'name': entry.name,
+        'type': 'file' if is_file else 'directory',
+        'size': stat.st_size if is_file else None,
+        'modified': stat.st_mtime
+    }
+
+
+def _sorted_entries(path: str, options: ListingOptions, after: Optional[Tuple] = None,
+                    limit: Optional[int] = None) -> Tuple[List[Tuple[Tuple, os.DirEntry]], int]:
+    """
+    Keyed entries after a cursor key, in sort order, and the number of matches
+
+    Only the first limit entries are kept (a heap, not a full sort), so a
+    page of a huge directory costs one scan plus O(n log limit).
+    """
+    keyed, total = [], 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if not _matches(entry, options):
+                continue
+            key = _sort_key(entry, options.sort)
+            if key is None:
+                continue
+            total += 1
+            if after is not None and (key <= after if not options.reverse else key >= after):
+                continue
+            keyed.append((key, entry))
+    select = heapq.nlargest if options.reverse else heapq.nsmallest
+    if limit is None:
+        return sorted(keyed, key=lambda item: item[0], reverse=options.reverse), total
+    return select(limit, keyed, key=lambda item: item[0]), total
+
+
+def list_directory(path: str, options: ListingOptions = None, cursor: Optional[str] = None,
+                   limit: int = LISTING_PAGE_SIZE) -> ListingPage:
+    """
+    List one page of a directory (blocking; run it on the I/O pool)
+
+    Args:
+        path: Directory to list
+        options: Sort and filter options
+        cursor: next_cursor of the previous page, or None for the first page
+        limit: Entries per page (at most MAX_LISTING_PAGE_SIZE)
+
+    Returns:
+        ListingPage whose next_cursor resumes after its last entry
+
+    Raises:
+        InvalidCursorError: when the cursor does not belong to this listing
+        OSError: when the directory cannot be read
+
+    Directory order (sort='none') cannot seek, so each page rescans from the
+    start and costs time proportional to the entries before it; use
+    stream_directory to read a large directory in one pass. Its cursor
+    resumes after the last name returned, and only falls back to that
+    entry's position if it has been removed.
+    """
+    options = options or ListingOptions()
+    limit = max(1, min(limit, MAX_LISTING_PAGE_SIZE))
+    path = os.path.abspath(path)
+    state = decode_cursor(cursor, path, options) if cursor else {}
+    cursor_state = {'path': path, 'options': asdict(options)}
+
+    if options.sort == 'none':
+        # Directory order: resume after the previous page's last name, so entries
+        # added or removed before it do not shift the page. If that entry is gone,
+        # the page starts at its old position, which the next entry now holds.
+        last = state.get('last')
+        offset = state.get('offset', 0)
+        found = last is None
+        entries, fallback = [], []
+        with os.scandir(path) as scan:
+            for index, entry in enumerate(entry for entry in scan if _matches(entry, options)):
+                if found:
+                    entries.append((index, entry))
+                    if len(entries) > limit:
+                        break
+                elif entry.name == last:
+                    found = True
+                elif index >= offset and len(fallback) <= limit:
+                    fallback.append((index, entry))
+        if not found:
+            entries = fallback
+        page = [record for record in (entry_to_dict(entry) for _, entry in entries[:limit]) if record is not None]
+        next_cursor = None
+        if len(entries) > limit:
+            index, entry = entries[limit - 1]
+            next_cursor = encode_cursor({**cursor_state, 'last': entry.name, 'offset': index})
+        return ListingPage(path, page, next_cursor, None, asdict(options))
+
+    after = tuple(state['after']) if 'after' in state else None
+    keyed, total = _sorted_entries(path, options, after, limit + 1)
+    # Only the returned entries are statted for name order
+    page = [record for record in (entry_to_dict(entry) for _, entry in keyed[:limit]) if record is not None]
+    next_cursor = None
+    if len(keyed) > limit:
+        next_cursor = encode_cursor({**cursor_state, 'after': list(keyed[limit - 1][0])})
+    return ListingPage(path, page, next_cursor, total, asdict(options))
+
+
+async def stream_directory(path: str, options: ListingOptions = None,
+                           batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield every matching entry of a directory, reading it on the I/O pool in batches
+
+    Directory order ('none') starts yielding after the first batch is read;
+    sorted listings read and order the names first, then stat in batches.
+
+    Raises:
+        OSError: when the directory cannot be read
+    """
+    options = options or ListingOptions()
+    path = os.path.abspath(path)
+
+    if options.sort == 'none':
+        scan = await file_transfers.run(os.scandir, path)
+        try:
+            def next_batch() -> Optional[List[Dict[str, Any]]]:
+                """Records of the next batch_size matching entries; None once the scan is exhausted"""
+                entries = list(islice((entry for entry in scan if _matches(entry, options)), batch_size))
+                if not entries:
+                    return None
+                return [record for record in map(entry_to_dict, entries) if record is not None]
+
+            while True:
+                batch = await file_transfers.run(next_batch)
+                if batch is None:
+                    return
+                for record in batch:
+                    yield record
+        finally:
+            scan.close()
+    else:
+        keyed, _ = await file_transfers.run(_sorted_entries, path, options)
+        for start in range(0, len(keyed), batch_size):
+            chunk = [entry for _, entry in keyed[start:start + batch_size]]
+            batch = await file_transfers.run(lambda: [record for record in map(entry_to_dict, chunk) if record is not None])
+            for record in batch:
+                yield record
+
+
+async def stream_directory_ndjson(path: str, options: ListingOptions = None) -> AsyncIterator[str]:
+    """
+    NDJSON lines for a streamed listing: {"type": "entry", "entry": {...}} per entry, then a done event
+
+    The entry is nested because its own 'type' ('file' | 'directory') would
+    otherwise overwrite the event type. Once streaming has started a failure
+    can only be reported in-band, as a final error event.
+    """
+    count = 0
+    try:
+        async for entry in stream_directory(path, options):
+            count += 1
+            yield json.dumps({"type": "entry", "entry": entry}) + "\n"
+        yield json.dumps({"type": "done", "count": count}) + "\n"
+    except Exception as e:
+        logger.error(f"Streaming directory listing failed: {e}")
+        yield json.dumps({"type": "error", "error": str(e), "count": count}) + "\n"
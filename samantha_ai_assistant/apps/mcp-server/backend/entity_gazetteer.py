@@ -0,0 +1,217 @@
+"""
+Entity Gazetteer for Samantha AI MCP Server
+Single compiled matcher over app, site and file-type aliases
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .intent_matcher import AhoCorasickAutomaton
+from .system_automation import SYSTEM_APPS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Extra gazetteer entries: JSON file with optional "apps", "sites" and
+# "file_types" objects shaped like the tables below
+GAZETTEER_PATH = os.getenv("SAMANTHA_ENTITY_GAZETTEER")
+
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+# Spoken names for apps in SYSTEM_APPS (alias -> app key)
+APP_ALIASES: Dict[str, str] = {
+    'google chrome': 'chrome',
+    'mozilla firefox': 'firefox',
+    'microsoft edge': 'edge',
+    'vs code': 'vscode',
+    'visual studio code': 'vscode',
+    'file manager': 'file-manager',
+    'file explorer': 'explorer',
+}
+
+# Domain -> URL opened for it; "x dot com" style spoken forms are generated
+SITE_URLS: Dict[str, str] = {
+    'google.com': 'https://www.google.com',
+    'youtube.com': 'https://www.youtube.com',
+    'instagram.com': 'https://www.instagram.com',
+    'facebook.com': 'https://www.facebook.com',
+    'twitter.com': 'https://www.twitter.com',
+    'x.com': 'https://www.twitter.com',
+    'github.com': 'https://www.github.com',
+    'reddit.com': 'https://www.reddit.com',
+    'wikipedia.org': 'https://www.wikipedia.org',
+    'amazon.com': 'https://www.amazon.com',
+    'linkedin.com': 'https://www.linkedin.com',
+    'netflix.com': 'https://www.netflix.com',
+    'gmail.com': 'https://mail.google.com',
+    'stackoverflow.com': 'https://stackoverflow.com',
+}
+
+# Extension -> MIME type; ".pdf" and spoken "dot pdf" both match
+FILE_TYPES: Dict[str, str] = {
+    '.txt': 'text/plain',
+    '.md': 'text/markdown',
+    '.csv': 'text/csv',
+    '.json': 'application/json',
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.mp4': 'video/mp4',
+    '.mov': 'video/quicktime',
+    '.zip': 'application/zip',
+    '.py': 'text/x-python',
+}
+
+
+@dataclass
+class Entity:
+    """An entity found in an utterance"""
+    type: str
+    value: str
+    text: str
+    start: int
+    end: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _spoken(term: str) -> str:
+    """'google.com' -> 'google dot com', '.pdf' -> 'dot pdf'"""
+    return term.replace('.', ' dot ').strip()
+
+
+class EntityGazetteer:
+    """
+    Alias tables compiled into one Aho-Corasick automaton
+
+    Matches must sit on word boundaries ("mail" does not match inside
+    "email"); overlapping matches resolve to the leftmost, then longest.
+    """
+
+    def __init__(self, apps: Dict[str, str], sites: Dict[str, str], file_types: Dict[str, str]):
+        self.apps = apps
+        self.sites = sites
+        self.file_types = file_types
+        self._values: Dict[Tuple[str, str], str] = {}
+
+        aliases: Dict[str, List[str]] = {'app': [], 'url': [], 'file_type': []}
+        for alias, app in apps.items():
+            self._add(aliases, 'app', alias, app)
+        for domain, url in sites.items():
+            self._add(aliases, 'url', domain, url)
+            self._add(aliases, 'url', _spoken(domain), url)
+        for extension in file_types:
+            self._add(aliases, 'file_type', extension, extension)
+            self._add(aliases, 'file_type', _spoken(extension), extension)
+
+        self._automaton = AhoCorasickAutomaton(aliases)
+
+    def _add(self, aliases: Dict[str, List[str]], entity_type: str, alias: str, value: str):
+        alias = alias.lower()
+        if (entity_type, alias) not in self._values:
+            aliases[entity_type].append(alias)
+        self._values[(entity_type, alias)] = value
+
+    @property
+    def alias_count(self) -> int:
+        return len(self._values)
+
+    def extract(self, text: str) -> List[Entity]:
+        """
+        Find every entity in text in one pass
+
+        Args:
+            text: Utterance text
+
+        Returns:
+            Entities in order of position, including explicit http(s) URLs
+        """
+        text_lower = text.lower()
+        entities = [Entity('url', match.group(0), match.group(0), match.start(), match.end())
+                    for match in URL_PATTERN.finditer(text)]
+        taken = [(entity.start, entity.end) for entity in entities]
+
+        candidates = sorted(
+            (match for match in self._automaton.find_all(text_lower)
+             if self._on_word_boundary(text_lower, match.pattern, match.start, match.end)),
+            key=lambda match: (match.start, match.start - match.end)
+        )
+        for match in candidates:
+            if any(match.start < end and start < match.end for start, end in taken):
+                continue
+            taken.append((match.start, match.end))
+            entities.append(Entity(
+                type=match.label,
+                value=self._values[(match.label, match.pattern)],
+                text=text[match.start:match.end],
+                start=match.start,
+                end=match.end
+            ))
+
+        entities.sort(key=lambda entity: entity.start)
+        return entities
+
+    @staticmethod
+    def _on_word_boundary(text: str, alias: str, start: int, end: int) -> bool:
+        # Only alphanumeric alias edges need a boundary, so ".pdf" matches "report.pdf"
+        if alias[0].isalnum() and start > 0 and text[start - 1].isalnum():
+            return False
+        if alias[-1].isalnum() and end < len(text) and text[end].isalnum():
+            return False
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of compiled aliases per entity type"""
+        stats = {'aliases': self.alias_count}
+        for entity_type, _ in self._values:
+            stats[entity_type] = stats.get(entity_type, 0) + 1
+        return stats
+
+
+def build_gazetteer(path: Optional[str] = GAZETTEER_PATH) -> EntityGazetteer:
+    """
+    Build the gazetteer from SYSTEM_APPS and the built-in tables
+
+    Args:
+        path: Optional JSON file whose "apps", "sites" and "file_types"
+            objects extend the built-in tables
+
+    Returns:
+        Compiled EntityGazetteer
+    """
+    apps = {app: app for os_apps in SYSTEM_APPS.values() for app in os_apps}
+    apps.update(APP_ALIASES)
+    sites = dict(SITE_URLS)
+    file_types = dict(FILE_TYPES)
+
+    if path:
+        try:
+            with open(path) as f:
+                extra = json.load(f)
+            apps.update(extra.get('apps', {}))
+            sites.update(extra.get('sites', {}))
+            file_types.update(extra.get('file_types', {}))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Ignoring invalid entity gazetteer {path}: {e}")
+
+    gazetteer = EntityGazetteer(apps, sites, file_types)
+    logger.info(f"Entity gazetteer compiled with {gazetteer.alias_count} aliases")
+    return gazetteer
+
+
+# Global entity gazetteer instance
+entity_gazetteer = build_gazetteer()
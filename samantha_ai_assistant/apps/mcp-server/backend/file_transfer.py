@@ -0,0 +1,340 @@
+"""
+File Transfer for Samantha AI MCP Server
+Runs file writes, copies and moves on a bounded I/O thread pool with kernel zero-copy and progress jobs
+"""
+
+import asyncio
+import errno
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Transfer configuration (overridable via environment)
+FILE_IO_WORKERS = int(os.getenv("SAMANTHA_FILE_IO_WORKERS", "4"))
+COPY_CHUNK_BYTES = int(os.getenv("SAMANTHA_COPY_CHUNK_BYTES", str(8 * 1024 * 1024)))
+MAX_FINISHED_JOBS = 100     # finished jobs kept for progress queries, oldest dropped first
+
+# Errors meaning "this kernel/filesystem cannot do that zero-copy call", not "the copy failed"
+_UNSUPPORTED_ERRNOS = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+
+class CopyCancelledError(Exception):
+    """Raised inside a copy when its job was cancelled"""
+    pass
+
+
+@dataclass
+class FileJob:
+    """Progress of one copy or move; updated by the I/O thread, read by the event loop"""
+    id: str
+    operation: str                      # 'copy' | 'move'
+    source: str
+    destination: str
+    total_bytes: int = 0
+    copied_bytes: int = 0
+    status: str = 'running'             # 'running' | 'completed' | 'failed' | 'cancelled'
+    method: Optional[str] = None        # 'rename' | 'copy_file_range' | 'sendfile' | 'read_write'
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _cancelled: threading.Event = field(default_factory=threading.Event, repr=False)
+    _future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+    @property
+    def progress(self) -> float:
+        if self.status == 'completed':
+            return 1.0
+        return self.copied_bytes / self.total_bytes if self.total_bytes else 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.status != 'running'
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            'job_id': self.id,
+            'operation': self.operation,
+            'source': self.source,
+            'destination': self.destination,
+            'status': self.status,
+            'method': self.method,
+            'total_bytes': self.total_bytes,
+            'copied_bytes': self.copied_bytes,
+            'progress': self.progress,
+            'elapsed': elapsed,
+            'bytes_per_second': self.copied_bytes / elapsed if elapsed > 0 else 0.0,
+            'error': self.error
+        }
+
+
+def copy_file_data(source: str, destination: str, chunk_size: int = COPY_CHUNK_BYTES,
+                   on_progress: Optional[Callable[[int], None]] = None,
+                   cancelled: Optional[threading.Event] = None) -> str:
+    """
+    Copy a file's contents, then its metadata (like shutil.copy2)
+
+    Tries os.copy_file_range (in-kernel, reflinks on CoW filesystems), then
+    os.sendfile, then a plain read/write loop, moving on when the kernel or
+    filesystem does not support a path. The data goes to a temporary file
+    next to the destination that replaces it only once complete, so a
+    failed or cancelled copy leaves an existing destination untouched.
+
+    Args:
+        source: File to copy
+        destination: File to create or overwrite, or a directory to copy into
+        chunk_size: Bytes per system call (and per progress update)
+        on_progress: Called with the number of bytes copied so far
+        cancelled: Checked between chunks
+
+    Returns:
+        The method that copied the data
+
+    Raises:
+        shutil.SameFileError: when source and destination are the same file
+        IsADirectoryError: when source is a directory
+        CopyCancelledError: when cancelled is set mid-copy
+        OSError: when the copy fails
+    """
+    if os.path.isdir(source):
+        raise IsADirectoryError(errno.EISDIR, "Cannot copy a directory", source)
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(source))
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"{source} and {destination} are the same file")
+
+    copied = 0
+
+    def advance(count: int):
+        nonlocal copied
+        copied += count
+        if on_progress is not None:
+            on_progress(copied)
+        if cancelled is not None and cancelled.is_set():
+            raise CopyCancelledError(f"Copy cancelled after {copied} bytes")
+
+    with open(source, 'rb') as src:
+        directory, name = os.path.split(os.path.abspath(destination))
+        fd, partial = tempfile.mkstemp(prefix=f".{name}.", suffix='.part', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as dst:
+                in_fd, out_fd = src.fileno(), dst.fileno()
+                size = os.fstat(in_fd).st_size
+                method = None
+
+                for method_name, call in (
+                    ('copy_file_range', getattr(os, 'copy_file_range', None)),
+                    ('sendfile', getattr(os, 'sendfile', None))
+                ):
+                    if call is None or copied:
+                        continue
+                    try:
+                        while True:
+                            if method_name == 'sendfile':
+                                count = call(out_fd, in_fd, copied, chunk_size)
+                            else:
+                                count = call(in_fd, out_fd, chunk_size)
+                            if count == 0:
+                                break
+                            advance(count)
+                        method = method_name
+                        break
+                    except OSError as e:
+                        # Only give up on the zero-copy path before any data moved
+                        if copied or e.errno not in _UNSUPPORTED_ERRNOS:
+                            raise
+
+                if method is None:
+                    method = 'read_write'
+                    src.seek(copied)
+                    buffer = bytearray(min(chunk_size, max(size, 1)))
+                    view = memoryview(buffer)
+                    while True:
+                        count = src.readinto(buffer)
+                        if not count:
+                            break
+                        dst.write(view[:count])
+                        advance(count)
+
+            shutil.copystat(source, partial)
+            os.replace(partial, destination)
+            return method
+        except BaseException:
+            # Only the temporary file is ours to remove
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+
+
+class FileTransferManager:
+    """
+    Bounded thread pool for blocking file I/O, with job tracking for copies and moves
+
+    At most max_workers file operations touch the disk at once; the event
+    loop only awaits them. Copies and cross-device moves run as FileJobs
+    whose progress can be queried by ID while they run and for a while after.
+    """
+
+    def __init__(self, max_workers: int = FILE_IO_WORKERS, chunk_size: int = COPY_CHUNK_BYTES):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._jobs: 'OrderedDict[str, FileJob]' = OrderedDict()
+        self._active = 0
+        self._stats = {
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'bytes_copied': 0
+        }
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run a blocking file operation on the I/O pool and await its result"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='samantha-file-io')
+        loop = asyncio.get_running_loop()
+        self._active += 1
+        try:
+            return await loop.run_in_executor(self._pool, fn, *args)
+        finally:
+            self._active -= 1
+
+    async def write_text(self, path: Path, content: str):
+        """Create parent directories and write a text file"""
+        def write():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        await self.run(write)
+
+    async def unlink(self, path: Path):
+        await self.run(path.unlink)
+
+    def start_copy(self, source: Path, destination: Path) -> FileJob:
+        """Start copying a file in the background and return its job"""
+        return self._start(FileJob(id=uuid.uuid4().hex, operation='copy',
+                                   source=str(source), destination=str(destination)))
+
+    def start_move(self, source: Path, destination: Path) -> FileJob:
+        """Start moving a file or directory: a rename, or copy-and-unlink across devices"""
+        return self._start(FileJob(id=uuid.uuid4().hex, operation='move',
+                                   source=str(source), destination=str(destination)))
+
+    def _start(self, job: FileJob) -> FileJob:
+        self._jobs[job.id] = job
+        job._future = asyncio.ensure_future(self._run_job(job))
+        return job
+
+    async def _run_job(self, job: FileJob):
+        try:
+            worker = self._copy if job.operation == 'copy' else self._move
+            await self.run(worker, job)
+            job.status = 'completed'
+            self._stats['completed'] += 1
+        except CopyCancelledError:
+            job.status = 'cancelled'
+            self._stats['cancelled'] += 1
+        except asyncio.CancelledError:
+            # The task was cancelled (e.g. on shutdown): stop the worker thread
+            # after its current chunk rather than leaving the job 'running'
+            job._cancelled.set()
+            job.status = 'cancelled'
+            self._stats['cancelled'] += 1
+            raise
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            self._stats['failed'] += 1
+            logger.warning(f"File {job.operation} {job.source} -> {job.destination} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            self._stats['bytes_copied'] += job.copied_bytes
+            self._evict()
+
+    def _copy(self, job: FileJob):
+        """Worker thread: copy one file, recording progress on the job"""
+        Path(job.destination).parent.mkdir(parents=True, exist_ok=True)
+        job.total_bytes = os.stat(job.source).st_size
+        job.method = copy_file_data(
+            job.source, job.destination, self.chunk_size,
+            on_progress=lambda copied: setattr(job, 'copied_bytes', copied),
+            cancelled=job._cancelled
+        )
+
+    def _move(self, job: FileJob):
+        """Worker thread: rename, falling back to a chunked copy and unlink across devices"""
+        Path(job.destination).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(job.source, job.destination)
+            job.method = 'rename'
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        if os.path.isdir(job.source):
+            # Directory trees keep shutil's per-file copy (no byte progress)
+            shutil.move(job.source, job.destination)
+            job.method = 'copytree'
+            return
+        self._copy(job)
+        os.unlink(job.source)
+
+    async def wait(self, job: FileJob) -> FileJob:
+        """
+        Wait for a job to finish
+
+        If the waiter is cancelled (e.g. the client went away) the job is
+        cancelled too, so a blocking request never leaves a copy running.
+        """
+        try:
+            await asyncio.shield(job._future)
+        except asyncio.CancelledError:
+            job._cancelled.set()
+            raise
+        return job
+
+    def get_job(self, job_id: str) -> Optional[FileJob]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[FileJob]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a running copy to stop after its current chunk; False if unknown or finished"""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job._cancelled.set()
+        return True
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool occupancy and job outcome counters"""
+        return {
+            'workers': self.max_workers,
+            'active': self._active,
+            'running_jobs': sum(1 for job in self._jobs.values() if not job.done),
+            **self._stats
+        }
+
+
+# Global file transfer instance
+file_transfers = FileTransferManager()
@@ -0,0 +1,347 @@
+"""
+Inference Executor for Samantha AI MCP Server
+Runs Whisper transcription in worker processes so it never blocks the event loop
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .model_registry import model_registry, DEFAULT_MODEL_SIZE
+from .metrics import (
+    inference_queue_depth, inference_active_jobs, inference_worker_utilisation,
+    inference_jobs
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Executor configuration (overridable via environment).
+# INFERENCE_WORKERS=0 runs jobs on a thread against the shared in-process model.
+INFERENCE_WORKERS = int(os.getenv("SAMANTHA_INFERENCE_WORKERS", "1"))
+INFERENCE_QUEUE_SIZE = int(os.getenv("SAMANTHA_INFERENCE_QUEUE_SIZE", "16"))
+INFERENCE_TIMEOUT = float(os.getenv("SAMANTHA_INFERENCE_TIMEOUT", "120"))
+
+
+class InferenceQueueFullError(Exception):
+    """Raised when the submission queue is full and the job is rejected"""
+
+
+class InferenceTimeoutError(Exception):
+    """Raised when a job does not finish within its timeout"""
+
+
+def _worker_warm_up(model_sizes: List[str], device: Optional[str]):
+    """Load this worker's copy of each model and return their info"""
+    return model_registry.warm_up_models(model_sizes, device)
+
+
+def _worker_call_at_barrier(barrier, fn: Callable, *args) -> Tuple[int, Any]:
+    """Run fn(*args), then hold this worker until the rest of the broadcast is running"""
+    result = fn(*args)
+    barrier.wait()
+    return os.getpid(), result
+
+
+def _worker_transcribe(audio: Union[np.ndarray, str], model_size: str,
+                       device: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Transcribe in a worker using that process's registry model"""
+    model = model_registry.get(model_size, device)
+    return model.transcribe(audio, **options)
+
+
+def _worker_decode_batch(arrays: List[np.ndarray], model_size: str, device: Optional[str],
+                         options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Decode up to 30 s clips together in one batched forward pass"""
+    import torch
+    import whisper
+
+    model = model_registry.get(model_size, device)
+    mels = torch.stack([
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(audio)), n_mels=model.dims.n_mels)
+        for audio in arrays
+    ]).to(model.device)
+    decoding_options = whisper.DecodingOptions(
+        fp16=model.device.type == 'cuda', without_timestamps=True, **options
+    )
+    return [
+        {
+            'text': result.text,
+            'language': result.language,
+            'avg_logprob': result.avg_logprob,
+            'no_speech_prob': result.no_speech_prob
+        }
+        for result in whisper.decode(model, mels, decoding_options)
+    ]
+
+
+class InferenceExecutor:
+    """Bounded process-pool executor for model inference"""
+
+    def __init__(self, max_workers: int = INFERENCE_WORKERS,
+                 max_queue: int = INFERENCE_QUEUE_SIZE,
+                 timeout: float = INFERENCE_TIMEOUT,
+                 model_size: str = DEFAULT_MODEL_SIZE,
+                 device: Optional[str] = None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.model_size = model_size
+        self.device = device
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._stats = {
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'cancelled': 0,
+            'restarts': 0,
+            'total_latency': 0.0
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Jobs that can be in flight (running plus queued)"""
+        return max(self.max_workers, 1) + self.max_queue
+
+    def start(self):
+        """Start the worker processes, or the inference thread (done lazily on first submit)"""
+        if self._pool is None and self.max_workers > 0:
+            # spawn, not fork: torch's thread pools do not survive fork.
+            # Workers load models on first use; warm_up() preloads them on request.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"InferenceExecutor started with {self.max_workers} worker(s)")
+        elif self._threads is None and self.max_workers == 0:
+            # One thread, matching the single in-flight slot capacity assumes
+            self._threads = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor):
+        """Drop a pool whose worker died so the next job gets a fresh one"""
+        # Several in-flight jobs fail together; only the first replaces the pool
+        if self._pool is broken:
+            logger.error("Inference worker died; restarting the worker pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._stats['restarts'] += 1
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes and drop queued jobs"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        if self._threads is not None:
+            self._threads.shutdown(wait=wait, cancel_futures=True)
+            self._threads = None
+
+    async def warm_up(self, model_sizes: Optional[List[str]] = None):
+        """
+        Load the models in every worker (or in-process in thread mode)
+
+        Args:
+            model_sizes: Models to load, e.g. every model the language routes
+                and quality tiers use; defaults to the executor's model
+
+        Returns:
+            ModelInfo of each warmed-up model
+        """
+        model_sizes = list(model_sizes or [self.model_size])
+        if self.max_workers > 0:
+            infos = await self.run_on_each_worker(
+                _worker_warm_up, model_sizes, self.device,
+                timeout=self.timeout * 5 * len(model_sizes)
+            )
+            model_registry.mark_ready(model_sizes)
+            return next(iter(infos.values()))
+        return await asyncio.to_thread(model_registry.warm_up_models, model_sizes, self.device)
+
+    async def run_on_each_worker(self, fn: Callable, *args, timeout: float = None) -> Dict[int, Any]:
+        """
+        Run fn(*args) once in every worker process
+
+        The pool does not promise one job per worker: a worker that finishes
+        early takes the next queued job. Each job therefore waits at a shared
+        barrier until all max_workers jobs are running, so no worker can take
+        two of them.
+
+        Args:
+            fn: Module-level (picklable) function to run
+            *args: Arguments for fn
+            timeout: Per-job timeout in seconds; defaults to the executor timeout
+
+        Returns:
+            fn's return value keyed by worker PID
+        """
+        # Pool jobs cannot share a plain multiprocessing.Barrier, only a manager proxy
+        manager = await asyncio.to_thread(multiprocessing.get_context("spawn").Manager)
+        try:
+            barrier = manager.Barrier(self.max_workers, timeout=timeout or self.timeout)
+            answers = await asyncio.gather(*(
+                self.submit(_worker_call_at_barrier, barrier, fn, *args, timeout=timeout)
+                for _ in range(self.max_workers)
+            ))
+        finally:
+            manager.shutdown()
+        return dict(answers)
+
+    async def submit(self, fn: Callable, *args, timeout: float = None) -> Any:
+        """
+        Run fn(*args) on a worker and await its result
+
+        Args:
+            fn: Module-level (picklable) function to run
+            *args: Arguments for fn
+            timeout: Per-job timeout in seconds; defaults to the executor timeout
+
+        Returns:
+            The function's return value
+
+        Raises:
+            InferenceQueueFullError: when the queue is full
+            InferenceTimeoutError: when the job exceeds its timeout
+        """
+        if self._pending >= self.capacity:
+            self._stats['rejected'] += 1
+            inference_jobs.labels(outcome='rejected').inc()
+            raise InferenceQueueFullError(
+                f"Inference queue full ({self._pending} jobs in flight)"
+            )
+
+        loop = asyncio.get_running_loop()
+        self.start()
+        pool = None
+        if self.max_workers > 0:
+            pool = self._pool
+            try:
+                future = pool.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died after the last job finished: retry on a fresh pool
+                self._replace_broken_pool(pool)
+                self.start()
+                pool = self._pool
+                future = pool.submit(fn, *args)
+        else:
+            # Our own pool, not run_in_executor: its asyncio future is cancelled
+            # on timeout, which would release the slot while the thread still runs
+            future = self._threads.submit(fn, *args)
+
+        # The slot is released when the worker actually finishes, so a
+        # timed-out job that is still running keeps counting against capacity
+        self._pending += 1
+        self._update_gauges()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+
+        start_time = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=timeout or self.timeout
+            )
+        except asyncio.TimeoutError:
+            self._record('timeouts', 'timeout')
+            raise InferenceTimeoutError(f"Inference job exceeded {timeout or self.timeout:.1f}s")
+        except asyncio.CancelledError:
+            self._record('cancelled', 'cancelled')
+            raise
+        except BrokenProcessPool:
+            # The job itself may have killed the worker, so it is not retried
+            self._replace_broken_pool(pool)
+            self._record('failed', 'failed')
+            raise
+        except Exception:
+            self._record('failed', 'failed')
+            raise
+
+        self._stats['total_latency'] += time.perf_counter() - start_time
+        self._record('completed', 'completed')
+        return result
+
+    async def transcribe(self, audio: Union[np.ndarray, str], options: Dict[str, Any] = None,
+                         model_size: str = None, timeout: float = None) -> Dict[str, Any]:
+        """
+        Transcribe an array or file path on a worker
+
+        Args:
+            audio: 16 kHz float32 samples, or a path Whisper can load
+            options: Keyword arguments for model.transcribe
+            model_size: Whisper model name; defaults to the executor's model
+            timeout: Per-job timeout in seconds
+
+        Returns:
+            Whisper's transcription result dict
+        """
+        return await self.submit(
+            _worker_transcribe, audio, model_size or self.model_size, self.device,
+            options or {}, timeout=timeout
+        )
+
+    async def decode_batch(self, arrays: List[np.ndarray], options: Dict[str, Any] = None,
+                           model_size: str = None, timeout: float = None) -> List[Dict[str, Any]]:
+        """
+        Decode a batch of short clips in one job
+
+        Args:
+            arrays: 16 kHz float32 clips of at most 30 seconds each
+            options: Keyword arguments for whisper.DecodingOptions
+            model_size: Whisper model name; defaults to the executor's model
+            timeout: Per-job timeout in seconds
+
+        Returns:
+            One result dict per clip, in input order
+        """
+        return await self.submit(
+            _worker_decode_batch, arrays, model_size or self.model_size, self.device,
+            options or {}, timeout=timeout
+        )
+
+    def _release(self):
+        self._pending -= 1
+        self._update_gauges()
+
+    def _record(self, stat: str, outcome: str):
+        self._stats[stat] += 1
+        inference_jobs.labels(outcome=outcome).inc()
+
+    def _update_gauges(self):
+        stats = self.get_stats()
+        inference_queue_depth.set(stats['queue_depth'])
+        inference_active_jobs.set(stats['active_jobs'])
+        inference_worker_utilisation.set(stats['utilisation'])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, utilisation and job outcome counters"""
+        workers = max(self.max_workers, 1)
+        active = min(self._pending, workers)
+        completed = self._stats['completed']
+        return {
+            'workers': self.max_workers,
+            'mode': 'process' if self.max_workers > 0 else 'thread',
+            'capacity': self.capacity,
+            'queue_depth': max(self._pending - workers, 0),
+            'active_jobs': active,
+            'utilisation': active / workers,
+            'completed': completed,
+            'failed': self._stats['failed'],
+            'rejected': self._stats['rejected'],
+            'timeouts': self._stats['timeouts'],
+            'cancelled': self._stats['cancelled'],
+            'restarts': self._stats['restarts'],
+            'avg_latency': self._stats['total_latency'] / completed if completed else 0.0
+        }
+
+
+# Global inference executor instance
+inference_executor = InferenceExecutor()
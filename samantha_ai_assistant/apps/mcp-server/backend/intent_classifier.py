@@ -0,0 +1,243 @@
+"""
+Intent Classifier for Samantha AI MCP Server
+Hashed n-gram TF-IDF features with a cosine centroid model, scored in batches with NumPy
+"""
+
+import json
+import logging
+import os
+import re
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Classifier configuration (overridable via environment)
+N_FEATURES = int(os.getenv("SAMANTHA_INTENT_FEATURES", str(2 ** 13)))
+MIN_SIMILARITY = float(os.getenv("SAMANTHA_INTENT_MIN_SIMILARITY", "0.2"))
+TEMPERATURE = float(os.getenv("SAMANTHA_INTENT_TEMPERATURE", "0.05"))
+MAX_BATCH_TEXTS = int(os.getenv("SAMANTHA_INTENT_MAX_BATCH", "5000"))
+# Extra labelled examples: JSON file of {"intent": ["utterance", ...]}
+EXAMPLES_PATH = os.getenv("SAMANTHA_INTENT_EXAMPLES")
+
+# Rows vectorised per matrix multiply; bounds the dense feature matrix
+BATCH_CHUNK_ROWS = 256
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Labelled utterances per intent; command patterns are added as examples too
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    'browser_navigation': [
+        'go to google dot com', 'navigate to github', 'visit youtube',
+        'open a new tab', 'close this tab', 'switch to the next tab',
+        'take me to the news website', 'search for flights to paris',
+        'open reddit in the browser', 'go back to the previous page',
+        'go to google.com',
+    ],
+    'system_control': [
+        'open safari', 'launch spotify', 'start the terminal', 'quit chrome',
+        'close the mail app', 'turn the volume up', 'volume down please',
+        'mute the sound', 'unmute audio', 'make the screen brighter',
+        'lower the brightness', 'open the finder', 'put the computer to sleep',
+    ],
+    'file_operations': [
+        'create a new file', 'save this document', 'delete the old report',
+        'move the photo to my desktop', 'copy the file to documents',
+        'find the file named budget', 'open the file notes.txt',
+        'create a folder called projects', 'rename this file',
+        'list the files in downloads',
+    ],
+    'web_automation': [
+        'click the login button', 'type my email address', 'scroll down',
+        'scroll to the top of the page', 'fill in the form', 'submit the form',
+        'select the first option', 'check the remember me box',
+        'uncheck the newsletter box', 'hover over the menu',
+    ],
+    'information_query': [
+        'what is the weather like', 'how to bake bread', 'tell me about the moon',
+        'what time is it in tokyo', 'who wrote hamlet', 'look up the population of india',
+        'find information about black holes', 'how far away is the sun',
+        'what is the capital of france', 'explain how vaccines work',
+    ],
+}
+
+
+@dataclass
+class IntentPrediction:
+    """Classifier output for one text"""
+    intent: str
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'intent': self.intent, 'confidence': self.confidence, 'scores': self.scores}
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature: str, n_features: int) -> int:
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    return zlib.crc32(feature.encode('utf-8')) % n_features
+
+
+class HashedTfidfVectorizer:
+    """Word 1-2 gram and character 3-gram TF-IDF features hashed into a fixed width"""
+
+    def __init__(self, n_features: int = N_FEATURES):
+        self.n_features = n_features
+        self.idf = np.ones(n_features, dtype=np.float32)
+
+    def feature_indices(self, text: str) -> List[int]:
+        words = TOKEN_PATTERN.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return [_bucket(feature, self.n_features) for feature in features]
+
+    def fit(self, texts: List[str]):
+        """Learn smoothed inverse document frequencies"""
+        document_frequency = np.zeros(self.n_features, dtype=np.float32)
+        for text in texts:
+            document_frequency[np.unique(self.feature_indices(text))] += 1
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """L2-normalised TF-IDF rows (sublinear term frequency)"""
+        rows, columns = [], []
+        for row, text in enumerate(texts):
+            indices = self.feature_indices(text)
+            rows.extend([row] * len(indices))
+            columns.extend(indices)
+        counts = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)), 1.0)
+        features = np.log1p(counts, out=counts)
+        features *= self.idf
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return features / np.maximum(norms, 1e-12)
+
+
+class IntentClassifier:
+    """
+    Nearest-centroid intent classifier
+
+    Each intent's centroid is the normalised mean of its examples' TF-IDF
+    vectors, so a batch is scored with one (texts x features) @ (features x
+    intents) multiply. Cosine similarities are turned into confidences with a
+    temperature softmax; texts whose best similarity is below min_similarity
+    are 'unknown'.
+    """
+
+    def __init__(self, n_features: int = N_FEATURES, min_similarity: float = MIN_SIMILARITY,
+                 temperature: float = TEMPERATURE):
+        self.n_features = n_features
+        self.min_similarity = min_similarity
+        self.temperature = temperature
+        # (vectorizer, labels, centroids), replaced as a whole on retraining
+        self._model: Optional[Tuple[HashedTfidfVectorizer, List[str], np.ndarray]] = None
+        self._example_count = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self._model is not None
+
+    @property
+    def labels(self) -> List[str]:
+        return self._model[1] if self._model else []
+
+    def fit(self, examples: Dict[str, List[str]]):
+        """
+        Train from labelled examples
+
+        Args:
+            examples: Mapping of intent to example utterances
+        """
+        examples = {intent: texts for intent, texts in examples.items() if texts}
+        texts = [text for intent_texts in examples.values() for text in intent_texts]
+        vectorizer = HashedTfidfVectorizer(self.n_features)
+        vectorizer.fit(texts)
+
+        centroids = []
+        for intent_texts in examples.values():
+            centroid = vectorizer.transform(intent_texts).mean(axis=0)
+            centroids.append(centroid / max(float(np.linalg.norm(centroid)), 1e-12))
+
+        # Swap in the trained model only once it is complete
+        self._model = (vectorizer, list(examples), np.stack(centroids, axis=1).astype(np.float32))
+        self._example_count = len(texts)
+        logger.info(f"Intent classifier trained on {len(texts)} examples across {len(examples)} intents")
+
+    def classify(self, text: str) -> IntentPrediction:
+        """Classify a single text"""
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: List[str]) -> List[IntentPrediction]:
+        """
+        Classify many texts, vectorised in chunks of BATCH_CHUNK_ROWS
+
+        Args:
+            texts: Texts to classify
+
+        Returns:
+            One IntentPrediction per text, in order
+        """
+        model = self._model
+        if model is None:
+            return [IntentPrediction('unknown', 0.0) for _ in texts]
+
+        vectorizer, labels, centroids = model
+        predictions = []
+        for offset in range(0, len(texts), BATCH_CHUNK_ROWS):
+            similarities = vectorizer.transform(texts[offset:offset + BATCH_CHUNK_ROWS]) @ centroids
+            logits = similarities / self.temperature
+            probabilities = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            best = similarities.argmax(axis=1)
+
+            for row, label_index in enumerate(best):
+                scores = {label: round(float(p), 4) for label, p in zip(labels, probabilities[row])}
+                if similarities[row, label_index] < self.min_similarity:
+                    predictions.append(IntentPrediction('unknown', 0.0, scores))
+                else:
+                    predictions.append(IntentPrediction(
+                        labels[label_index], float(probabilities[row, label_index]), scores
+                    ))
+        return predictions
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get model size and thresholds"""
+        return {
+            'trained': self.is_trained,
+            'intents': len(self.labels),
+            'examples': self._example_count,
+            'features': self.n_features,
+            'min_similarity': self.min_similarity,
+            'temperature': self.temperature
+        }
+
+
+def build_training_examples(command_patterns: Dict[str, List[str]],
+                            path: Optional[str] = EXAMPLES_PATH) -> Dict[str, List[str]]:
+    """
+    Merge INTENT_EXAMPLES, an optional examples file and the command patterns
+
+    Only intents that have command patterns are kept, so reloading the
+    patterns also defines the classifier's label set.
+    """
+    examples = {intent: list(INTENT_EXAMPLES.get(intent, [])) + list(patterns)
+                for intent, patterns in command_patterns.items()}
+    if path:
+        try:
+            with open(path) as f:
+                for intent, texts in json.load(f).items():
+                    if intent in examples:
+                        examples[intent].extend(texts)
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Ignoring invalid intent examples {path}: {e}")
+    return examples
@@ -0,0 +1,131 @@
+"""
+Compiled Multi-Pattern Matcher for Samantha AI MCP Server
+Aho-Corasick automaton that finds every labelled phrase in one pass over the text
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+
+@dataclass(frozen=True)
+class PatternMatch:
+    """One occurrence of a phrase in the text"""
+    pattern: str
+    label: str
+    start: int
+    end: int
+
+
+class AhoCorasickAutomaton:
+    """
+    Immutable Aho-Corasick automaton over labelled phrases
+
+    Matching is plain substring matching (the same semantics as
+    ``pattern in text``), so callers lower-case text and phrases themselves.
+    """
+
+    def __init__(self, patterns: Dict[str, Iterable[str]]):
+        # Node 0 is the root. Outputs hold pattern ids and include those
+        # reachable through failure links, so matching never walks them.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._patterns: List[Tuple[str, Tuple[str, ...]]] = []
+
+        labels_by_phrase: Dict[str, List[str]] = {}
+        for label, phrases in patterns.items():
+            for phrase in phrases:
+                if phrase and label not in labels_by_phrase.setdefault(phrase, []):
+                    labels_by_phrase[phrase].append(label)
+
+        for phrase, labels in labels_by_phrase.items():
+            self._add(phrase, len(self._patterns))
+            self._patterns.append((phrase, tuple(labels)))
+
+        self._build_failure_links()
+
+    def _add(self, phrase: str, pattern_id: int):
+        node = 0
+        for char in phrase:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(pattern_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._patterns)
+
+    def find_all(self, text: str) -> List[PatternMatch]:
+        """
+        Find every occurrence of every phrase
+
+        Args:
+            text: Text to scan (already normalised, e.g. lower-cased)
+
+        Returns:
+            Matches in order of their end position; a phrase shared by several
+            labels yields one match per label
+        """
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self._patterns
+        matches = []
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in output[node]:
+                phrase, labels = patterns[pattern_id]
+                start = index + 1 - len(phrase)
+                for label in labels:
+                    matches.append(PatternMatch(phrase, label, start, index + 1))
+        return matches
+
+
+class IntentMatcher:
+    """Reloadable matcher: rebuilding swaps in a new automaton atomically"""
+
+    def __init__(self, patterns: Dict[str, Iterable[str]]):
+        self._lock = threading.Lock()
+        self._automaton = AhoCorasickAutomaton(patterns)
+
+    def reload(self, patterns: Dict[str, Iterable[str]]):
+        """Compile a new pattern set; in-flight lookups finish on the old one"""
+        automaton = AhoCorasickAutomaton(patterns)
+        with self._lock:
+            self._automaton = automaton
+
+    @property
+    def pattern_count(self) -> int:
+        return self._automaton.pattern_count
+
+    def find_all(self, text: str) -> List[PatternMatch]:
+        """Find every labelled phrase in text (see AhoCorasickAutomaton.find_all)"""
+        return self._automaton.find_all(text)
+
+    def hits_by_label(self, text: str) -> Dict[str, set]:
+        """Distinct phrases matched per label"""
+        hits: Dict[str, set] = {}
+        for match in self._automaton.find_all(text):
+            hits.setdefault(match.label, set()).add(match.pattern)
+        return hits
@@ -0,0 +1,131 @@
+"""
+Language Routing for Samantha AI MCP Server
+Maps request language codes to a Whisper language and model variant
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from .model_registry import DEFAULT_MODEL_SIZE
+from .metrics import asr_route_latency
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whisper sizes that ship an English-only ".en" variant
+ENGLISH_ONLY_SIZES = ('tiny', 'base', 'small', 'medium')
+
+
+@dataclass(frozen=True)
+class LanguageRoute:
+    """Where a request in a given language is sent"""
+    name: str
+    whisper_language: Optional[str]
+    model_size: str
+    # Decoding settings of the quality tier applied to this route (see quality_tiers)
+    beam_size: Optional[int] = None
+    temperature_fallback: bool = True
+    tier: Optional[str] = None
+
+    def decode_options(self) -> Dict[str, Any]:
+        """Options for model.transcribe; a fixed language skips auto-detection"""
+        options = self.batch_decode_options()
+        if not self.temperature_fallback:
+            # A single temperature disables transcribe()'s retry ladder
+            options['temperature'] = 0.0
+        return options
+
+    def batch_decode_options(self) -> Dict[str, Any]:
+        """Options for whisper.DecodingOptions (one pass, no temperature fallback)"""
+        options: Dict[str, Any] = {'language': self.whisper_language} if self.whisper_language else {}
+        if self.beam_size:
+            options['beam_size'] = self.beam_size
+        return options
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'language': self.whisper_language,
+            'model': self.model_size
+        }
+
+
+def english_variant(model_size: str) -> str:
+    """'base' -> 'base.en'; sizes without an English-only model are unchanged"""
+    return f"{model_size}.en" if model_size in ENGLISH_ONLY_SIZES else model_size
+
+
+class LanguageRouter:
+    """Resolves language codes to routes, with configurable rules"""
+
+    def __init__(self, language_codes: Iterable[str], default_model: str = DEFAULT_MODEL_SIZE):
+        self.default_model = default_model
+        # Unknown or missing languages fall back to detection on the multilingual model
+        self.fallback = LanguageRoute('auto', None, default_model)
+        self.routes: Dict[str, LanguageRoute] = {}
+
+        for code in language_codes:
+            language = code.split('-')[0].lower()
+            model = english_variant(default_model) if language == 'en' else default_model
+            self.routes[code] = LanguageRoute(code, language, model)
+
+        self.update_routes(self._load_env_rules())
+
+    @staticmethod
+    def _load_env_rules() -> Dict[str, Dict[str, Any]]:
+        """SAMANTHA_LANGUAGE_ROUTES, e.g. '{"en-US": {"model": "small.en"}, "hi-IN": {"language": "hi"}}'"""
+        raw = os.getenv("SAMANTHA_LANGUAGE_ROUTES")
+        if not raw:
+            return {}
+        try:
+            rules = json.loads(raw)
+            return rules if isinstance(rules, dict) else {}
+        except ValueError as e:
+            logger.error(f"Ignoring invalid SAMANTHA_LANGUAGE_ROUTES: {e}")
+            return {}
+
+    def update_routes(self, rules: Dict[str, Dict[str, Any]]):
+        """
+        Add or override routes
+
+        Args:
+            rules: Language code -> {"language": whisper code or null, "model": model name};
+                omitted fields keep the current (or derived) value
+        """
+        for code, rule in rules.items():
+            current = self.routes.get(code)
+            language = rule.get('language', current.whisper_language if current else code.split('-')[0].lower())
+            model = rule.get('model', current.model_size if current else self.default_model)
+            self.routes[code] = LanguageRoute(code, language, model)
+
+    def route(self, language: Optional[str]) -> LanguageRoute:
+        """Route for a code ('en-US'), then any route for its bare language ('en-AU' -> 'en'), then detection"""
+        if not language:
+            return self.fallback
+        route = self.routes.get(language)
+        if route is None:
+            bare = language.split('-')[0].lower()
+            route = self.routes.get(bare) or next(
+                (candidate for candidate in self.routes.values() if candidate.whisper_language == bare),
+                self.fallback
+            )
+        return route
+
+    def model_sizes(self) -> List[str]:
+        """Every model a request can be routed to, the detection fallback first"""
+        sizes = [self.fallback.model_size]
+        for route in self.routes.values():
+            if route.model_size not in sizes:
+                sizes.append(route.model_size)
+        return sizes
+
+    def observe(self, route: LanguageRoute, seconds: float):
+        """Record transcription latency for a route"""
+        asr_route_latency.labels(route=route.name, model=route.model_size).observe(seconds)
+
+    def get_routes(self) -> Dict[str, Dict[str, Any]]:
+        """Get the routing table"""
+        return {code: route.to_dict() for code, route in self.routes.items()}
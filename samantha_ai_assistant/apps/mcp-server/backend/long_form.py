@@ -0,0 +1,258 @@
+"""
+Long-form Transcription for Samantha AI MCP Server
+Splits long recordings at pauses and transcribes the chunks in parallel
+"""
+
+import asyncio
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_normalization import TARGET_SAMPLE_RATE
+from .inference_executor import inference_executor, InferenceExecutor
+from .language_router import LanguageRoute
+from .speech_confidence import AcousticConfidence, aggregate_confidence, confidence_from_result
+from .voice_activity import FRAME_MS, frame_energies_db
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Chunking configuration (overridable via environment)
+CHUNK_SECONDS = float(os.getenv("SAMANTHA_LONG_FORM_CHUNK_SECONDS", "30"))   # one Whisper window
+MIN_CHUNK_SECONDS = float(os.getenv("SAMANTHA_LONG_FORM_MIN_CHUNK_SECONDS", "5"))
+LONG_FORM_CONCURRENCY = int(os.getenv(
+    "SAMANTHA_LONG_FORM_CONCURRENCY", str(max(inference_executor.max_workers, 1) + 1)
+))
+OVERLAP_SECONDS = 1.0       # chunks cut mid-speech repeat this much audio from the previous one
+PAUSE_MIN_MS = 200          # a cut needs a pause at least this long...
+PAUSE_MARGIN_DB = 6.0       # ...no louder than the recording's noise floor plus this...
+PAUSE_BELOW_SPEECH_DB = 12.0    # ...and this far below its median (speech) level
+MAX_DEDUP_WORDS = 6         # longest repeated run looked for; about what a 1 s overlap holds
+
+_WORD_PATTERN = re.compile(r"[\w']+")
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """One window of a long recording (sample offsets into it)"""
+    index: int
+    start: int
+    end: int
+    overlap: int = 0    # leading samples shared with the previous chunk
+
+    def seconds(self, sample_rate: int = TARGET_SAMPLE_RATE) -> Tuple[float, float]:
+        return self.start / sample_rate, self.end / sample_rate
+
+
+@dataclass
+class TranscriptSegment:
+    """Text with its time span in the whole recording"""
+    start: float
+    end: float
+    text: str
+    acoustic: Optional[AcousticConfidence] = None
+
+    def to_dict(self, offset: float = 0.0) -> Dict[str, Any]:
+        segment = {
+            'start': round(self.start + offset, 2),
+            'end': round(self.end + offset, 2),
+            'text': self.text
+        }
+        if self.acoustic is not None:
+            segment['confidence'] = round(self.acoustic.confidence, 4)
+        return segment
+
+
+def plan_chunks(samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE,
+                chunk_seconds: float = CHUNK_SECONDS,
+                min_chunk_seconds: float = MIN_CHUNK_SECONDS) -> List[AudioChunk]:
+    """
+    Split a recording into windows of at most chunk_seconds, cutting at pauses
+
+    Each cut goes in the middle of the latest pause between min_chunk_seconds
+    and chunk_seconds into the current chunk. A pause is PAUSE_MIN_MS of
+    frames no louder than the recording's noise floor plus PAUSE_MARGIN_DB and
+    at least PAUSE_BELOW_SPEECH_DB under its median level (so a recording
+    with almost no pauses does not mistake its quietest speech for one).
+    Without such a pause the chunk is cut at chunk_seconds and the next one
+    starts OVERLAP_SECONDS earlier so no word is lost at the boundary.
+
+    Args:
+        samples: Mono float32 audio
+        sample_rate: Sample rate of samples
+        chunk_seconds: Longest chunk
+        min_chunk_seconds: Earliest point at which a chunk may end at a pause
+
+    Returns:
+        Chunks in order, covering the whole recording
+    """
+    total = len(samples)
+    max_chunk = int(chunk_seconds * sample_rate)
+    if total <= max_chunk:
+        return [AudioChunk(0, 0, total)]
+
+    frame = sample_rate * FRAME_MS // 1000
+    energy_db = frame_energies_db(samples, sample_rate)
+    noise_floor, median = np.percentile(energy_db, [10, 50])
+    pause_threshold = min(noise_floor + PAUSE_MARGIN_DB, median - PAUSE_BELOW_SPEECH_DB)
+    pause_frames = max(PAUSE_MIN_MS // FRAME_MS, 1)
+    # Frames that sit in the middle of a run of pause_frames quiet frames
+    quiet = (energy_db <= pause_threshold).astype(np.int32)
+    runs = np.convolve(quiet, np.ones(pause_frames, dtype=np.int32), mode='valid') == pause_frames
+    pause_centres = np.flatnonzero(runs) + pause_frames // 2
+
+    overlap = int(OVERLAP_SECONDS * sample_rate)
+    chunks: List[AudioChunk] = []
+    start, lead = 0, 0
+    while total - start > max_chunk:
+        earliest = (start + int(min_chunk_seconds * sample_rate)) // frame
+        latest = (start + max_chunk) // frame - 1
+        candidates = pause_centres[(pause_centres >= earliest) & (pause_centres <= latest)]
+        if len(candidates):
+            cut = int(candidates[-1]) * frame + frame // 2
+            chunks.append(AudioChunk(len(chunks), start, cut, lead))
+            start, lead = cut, 0
+        else:
+            cut = start + max_chunk
+            chunks.append(AudioChunk(len(chunks), start, cut, lead))
+            start, lead = cut - overlap, overlap
+    chunks.append(AudioChunk(len(chunks), start, total, lead))
+    return chunks
+
+
+def _words(text: str) -> List[str]:
+    return [word.lower() for word in _WORD_PATTERN.findall(text)]
+
+
+def drop_repeated_words(previous: List[str], segments: List[TranscriptSegment]) -> List[TranscriptSegment]:
+    """
+    Remove the words an overlapping chunk repeats from the end of the previous one
+
+    Finds the longest run (up to MAX_DEDUP_WORDS) that ends the previous text
+    and starts the next, and strips it from the head of the next chunk's
+    segments.
+    """
+    head = _words(' '.join(segment.text for segment in segments))[:MAX_DEDUP_WORDS]
+    tail = previous[-MAX_DEDUP_WORDS:]
+    repeated = next(
+        (size for size in range(min(len(head), len(tail)), 0, -1) if tail[-size:] == head[:size]), 0
+    )
+
+    deduplicated = []
+    for segment in segments:
+        if repeated:
+            tokens = segment.text.split()
+            while tokens and repeated:
+                # A token such as "world," counts as one word; punctuation-only tokens are dropped too
+                repeated -= len(_words(tokens.pop(0)))
+                repeated = max(repeated, 0)
+            if not tokens:
+                continue
+            segment = TranscriptSegment(segment.start, segment.end, ' '.join(tokens), segment.acoustic)
+        deduplicated.append(segment)
+    return deduplicated
+
+
+class LongFormTranscriber:
+    """Parallel chunked transcription over the inference worker pool"""
+
+    def __init__(self, executor: InferenceExecutor = inference_executor,
+                 concurrency: int = LONG_FORM_CONCURRENCY):
+        self.executor = executor
+        # Bounded below the executor's capacity so one recording cannot
+        # fill the shared queue and starve other requests
+        self.concurrency = max(min(concurrency, executor.capacity - 1), 1)
+
+    async def stream(self, samples: np.ndarray, route: LanguageRoute,
+                     sample_rate: int = TARGET_SAMPLE_RATE
+                     ) -> AsyncIterator[Tuple[AudioChunk, List[TranscriptSegment]]]:
+        """
+        Transcribe chunks in parallel and yield them in order as they complete
+
+        Chunk k is yielded as soon as chunks 0..k are done, so callers can
+        stream the transcript while later chunks are still decoding.
+
+        Args:
+            samples: Mono float32 audio at sample_rate
+            route: Language route (model and decoding options)
+            sample_rate: Sample rate of samples
+
+        Yields:
+            (chunk, segments) with segment times relative to the recording,
+            and repeated words at overlapping cuts removed
+        """
+        chunks = plan_chunks(samples, sample_rate)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def transcribe(chunk: AudioChunk) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.executor.transcribe(
+                    samples[chunk.start:chunk.end], route.decode_options(), model_size=route.model_size
+                )
+
+        tasks = [asyncio.create_task(transcribe(chunk)) for chunk in chunks]
+        if len(chunks) > 1:
+            logger.info(f"Transcribing {len(samples) / sample_rate:.1f}s as {len(chunks)} chunks "
+                        f"({self.concurrency} in parallel)")
+        previous_words: List[str] = []
+        try:
+            for chunk, task in zip(chunks, tasks):
+                segments = self._segments(chunk, await task, sample_rate)
+                if chunk.overlap:
+                    segments = drop_repeated_words(previous_words, segments)
+                previous_words = (previous_words + _words(' '.join(s.text for s in segments)))[-MAX_DEDUP_WORDS:]
+                yield chunk, segments
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def transcribe(self, samples: np.ndarray, route: LanguageRoute,
+                         sample_rate: int = TARGET_SAMPLE_RATE) -> Dict[str, Any]:
+        """
+        Transcribe a whole recording
+
+        Returns:
+            Dict with the stitched 'text', its 'segments', the chunk count and
+            the duration-weighted acoustic 'confidence' (None without statistics)
+        """
+        segments: List[TranscriptSegment] = []
+        chunk_count = 0
+        async for _, chunk_segments in self.stream(samples, route, sample_rate):
+            segments.extend(chunk_segments)
+            chunk_count += 1
+        acoustic = aggregate_confidence(
+            (segment.end - segment.start, segment.acoustic.no_speech_prob, segment.acoustic.avg_logprob)
+            for segment in segments if segment.acoustic is not None
+        )
+        return {
+            'text': ' '.join(segment.text for segment in segments),
+            'segments': [segment.to_dict() for segment in segments],
+            'chunks': chunk_count,
+            'confidence': acoustic.to_dict() if acoustic is not None else None
+        }
+
+    @staticmethod
+    def _segments(chunk: AudioChunk, result: Dict[str, Any], sample_rate: int) -> List[TranscriptSegment]:
+        """Whisper segments shifted to recording time; one segment per chunk if none are returned"""
+        offset, chunk_end = chunk.seconds(sample_rate)
+        raw = result.get('segments') or [{'start': 0.0, 'end': chunk_end - offset, 'text': result.get('text', '')}]
+        segments = []
+        for segment in raw:
+            text = segment['text'].strip()
+            if text:
+                segments.append(TranscriptSegment(
+                    start=offset + float(segment['start']),
+                    end=min(offset + float(segment['end']), chunk_end),
+                    text=text,
+                    acoustic=confidence_from_result({'segments': [segment]})
+                ))
+        return segments
+
+
+# Global long-form transcriber instance
+long_form_transcriber = LongFormTranscriber()
@@ -1,16 +1,28 @@
+import asyncio
+import logging
+import os
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from typing import List
+from typing import List, Set
 from .api_v1_endpoints import router as api_v1_router
-from .middleware import RateLimitMiddleware, ErrorHandlingMiddleware
+from .middleware import RateLimitMiddleware, ErrorHandlingMiddleware, RequestSizeLimitMiddleware
+from .inference_executor import inference_executor
+from .decoder_pool import decoder_pool
+from .streaming_recognizer import StreamingSession, parse_control_message
+from .speech_synthesis import speech_synthesizer
+from .response_audio_cache import response_audio_cache, RESPONSE_AUDIO_WARMUP
+from .voice_processor import voice_processor
+
+logger = logging.getLogger(__name__)
 
 
 app = FastAPI(title="Samantha AI Backend", version="1.0.0")
 
-# Add global error handling and rate limiting middleware
+# Add global error handling, rate limiting and request size middleware
 app.add_middleware(ErrorHandlingMiddleware)
 app.add_middleware(RateLimitMiddleware)
+app.add_middleware(RequestSizeLimitMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -21,6 +33,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Startup work running in the background; the loop only holds weak
+# references to tasks, and shutdown must not leave them running
+background_tasks: Set[asyncio.Task] = set()
+
+
+def _start_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+@app.on_event("startup")
+async def warm_up_models():
+    # Opt-in: load Whisper in the background so startup is not blocked and
+    # /api/v1/voice/ready flips once every routed model (and tier variant) is resident
+    if os.getenv("SAMANTHA_WHISPER_WARMUP", "false").lower() in ("1", "true", "yes"):
+        _start_background(_warm_up_quietly())
+
+
+async def _warm_up_quietly():
+    try:
+        await inference_executor.warm_up(voice_processor.model_sizes())
+    except Exception as e:
+        logger.error(f"Background warm-up failed: {e}")
+
+
+@app.on_event("startup")
+async def warm_up_reply_audio():
+    # Pre-render every reply template so common replies need no synthesis
+    if RESPONSE_AUDIO_WARMUP and speech_synthesizer.is_available():
+        _start_background(response_audio_cache.warm_up(voice_processor.response_text_variants()))
+
+
+@app.on_event("startup")
+async def start_decoder_pool():
+    # Start decoder workers up front so the first compressed upload pays no process start
+    if decoder_pool.enabled:
+        try:
+            await decoder_pool.start()
+        except Exception as e:
+            logger.error(f"Decoder pool failed to start: {e}")
+
+
+@app.on_event("shutdown")
+async def cancel_background_tasks():
+    tasks = list(background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@app.on_event("shutdown")
+async def stop_inference_workers():
+    inference_executor.shutdown(wait=False)
+
+
+@app.on_event("shutdown")
+async def stop_decoder_workers():
+    await decoder_pool.shutdown()
+
 
 # WebSocket manager
 class ConnectionManager:
@@ -32,7 +105,9 @@ class ConnectionManager:
         self.active_connections.append(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        # Safe to call more than once, and for a socket that never finished connecting
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
 
     async def broadcast(self, message: str):
         for connection in self.active_connections:
@@ -44,14 +119,73 @@ manager = ConnectionManager()
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
+    """
+    Text messages are broadcast as before. Streaming recognition:
+    send {"type": "start", "language": "en-US", "sample_rate": 16000},
+    then binary 16-bit mono PCM frames, then {"type": "stop"}. The server
+    replies with "partial" and "final" transcript messages. Adding
+    "wake_word": true to "start" listens for the enrolled wake word first:
+    the server sends "wake", then recognises one utterance, and sends
+    "sleep" if none follows. Speech
+    synthesis: send {"type": "tts", "text": "...", "voice": "en-us"}; audio
+    arrives as binary PCM chunks between "tts_start" and "tts_end".
+    """
     await manager.connect(websocket)
+    session = None
+    tts_task = None
     try:
         while True:
-            data = await websocket.receive_text()
-            # Echo for now; extend for command processing
-            await manager.broadcast(f"Message: {data}")
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes") is not None:
+                if session is None:
+                    session = StreamingSession(websocket.send_json)
+                await session.feed(message["bytes"])
+                continue
+
+            data = message.get("text")
+            if data is None:
+                continue
+            control = parse_control_message(data)
+            if control is None:
+                # Echo for now; extend for command processing
+                await manager.broadcast(f"Message: {data}")
+            elif control["type"] == "start":
+                if session is not None:
+                    await session.close()
+                session = None
+                try:
+                    session = StreamingSession(
+                        websocket.send_json,
+                        language=control.get("language"),
+                        sample_rate=int(control.get("sample_rate", 16000)),
+                        wake_word=bool(control.get("wake_word", False))
+                    )
+                except (TypeError, ValueError) as e:
+                    # e.g. "sample_rate": null or "abc"
+                    await websocket.send_json({"type": "error", "error": str(e)})
+                    continue
+                await websocket.send_json({"type": "ready", "wake_word": session.wake_detector is not None})
+            elif control["type"] == "stop" and session is not None:
+                await session.finalize()
+            elif control["type"] == "tts" and control.get("text"):
+                # Synthesize in the background so recognition frames keep flowing
+                if tts_task is not None and not tts_task.done():
+                    tts_task.cancel()
+                tts_task = asyncio.create_task(response_audio_cache.send_speech(
+                    websocket.send_json, websocket.send_bytes, control["text"], control.get("voice")
+                ))
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Any exit, including an error mid-session, drops the socket from broadcasts
         manager.disconnect(websocket)
+        if session is not None:
+            await session.close()
+        if tts_task is not None and not tts_task.done():
+            tts_task.cancel()
 
 
 # Include API router
@@ -0,0 +1,48 @@
+"""
+Metrics for Samantha AI MCP Server
+Prometheus metrics from the monitoring package, or no-ops when it is not installed
+"""
+
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _NoOpMetric:
+    """Stands in for a Counter, Gauge or Histogram (and its labelled children)"""
+
+    def labels(self, *args, **kwargs) -> '_NoOpMetric':
+        return self
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+
+try:
+    from samantha_ai_assistant.packages.monitoring.metrics import (
+        inference_queue_depth, inference_active_jobs, inference_worker_utilisation,
+        inference_jobs, transcription_batch_size, transcription_batch_wait,
+        cache_events, cache_memory_bytes, asr_quality_tier, asr_quality_tier_switches,
+        asr_route_latency, asr_confidence, asr_gated_transcriptions,
+        automation_operation_latency, automation_operation_errors
+    )
+except ImportError:
+    # The standalone MCP servers and their Docker image ship apps/mcp-server
+    # only, without samantha_ai_assistant.packages or prometheus_client
+    logger.info("Monitoring package not available; backend metrics are disabled")
+    inference_queue_depth = inference_active_jobs = inference_worker_utilisation = _NoOpMetric()
+    inference_jobs = transcription_batch_size = transcription_batch_wait = _NoOpMetric()
+    cache_events = cache_memory_bytes = asr_quality_tier = asr_quality_tier_switches = _NoOpMetric()
+    asr_route_latency = asr_confidence = asr_gated_transcriptions = _NoOpMetric()
+    automation_operation_latency = automation_operation_errors = _NoOpMetric()
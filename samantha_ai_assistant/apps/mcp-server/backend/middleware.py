@@ -1,13 +1,18 @@
-from fastapi import Request
+from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+from starlette.status import HTTP_413_REQUEST_ENTITY_TOO_LARGE, HTTP_429_TOO_MANY_REQUESTS
 import time
 
+from .audio_upload import MAX_UPLOAD_BYTES
+
 
 RATE_LIMIT = 60  # requests per minute per IP
 rate_limit_store = {}
 
+# Largest request body accepted; audio uploads plus room for form fields
+MAX_REQUEST_BYTES = MAX_UPLOAD_BYTES + 64 * 1024
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -32,3 +37,70 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
         except Exception as exc:
             return JSONResponse({"detail": str(exc)}, status_code=500)
+
+
+class RequestBodyTooLargeError(HTTPException):
+    """Raised from receive() once a streamed body passes the limit"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                         detail=f"Request body exceeds {max_bytes} bytes")
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_bytes
+
+    A declared Content-Length is checked before any of the body is read.
+    Chunked bodies, and bodies longer than they declared, are counted as
+    the application reads them and cut off with a 413 as soon as the count
+    passes the limit, so no route ever buffers more than max_bytes.
+    Plain ASGI rather than BaseHTTPMiddleware, which cannot wrap receive().
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope.get("headers") or []).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise RequestBodyTooLargeError(self.max_bytes)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestBodyTooLargeError:
+            # Routes normally turn it into a 413 themselves; this covers readers outside them
+            if response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope, receive, send):
+        response = JSONResponse(
+            {"detail": f"Request body exceeds {self.max_bytes} bytes"},
+            status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+        await response(scope, receive, send)
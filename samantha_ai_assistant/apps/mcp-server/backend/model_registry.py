@@ -0,0 +1,197 @@
+"""
+Whisper Model Registry for Samantha AI MCP Server
+Loads each (model size, device) pair once per process and shares it
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Default model configuration (overridable via environment)
+DEFAULT_MODEL_SIZE = os.getenv("SAMANTHA_WHISPER_MODEL", "base")
+DEFAULT_DEVICE = os.getenv("SAMANTHA_WHISPER_DEVICE") or None
+
+
+@dataclass
+class ModelInfo:
+    """Load statistics for a registered model"""
+    model_size: str
+    device: str
+    load_time: float
+    memory_bytes: int
+    loaded_at: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'model_size': self.model_size,
+            'device': self.device,
+            'load_time': self.load_time,
+            'memory_bytes': self.memory_bytes,
+            'loaded_at': self.loaded_at.isoformat()
+        }
+
+
+class ModelRegistry:
+    """Process-wide registry of lazily loaded Whisper models"""
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._info: Dict[Tuple[str, str], ModelInfo] = {}
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._warm_models: List[str] = []
+        self._warmup_error: Optional[str] = None
+
+    def _resolve_device(self, device: Optional[str]) -> str:
+        """Resolve the device Whisper would pick when none is given"""
+        device = device or DEFAULT_DEVICE
+        if device:
+            return device
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    def get(self, model_size: str = None, device: str = None) -> Any:
+        """
+        Return the shared model for (model_size, device), loading it on first use
+
+        Args:
+            model_size: Whisper model name (e.g. "base", "small.en")
+            device: Torch device; defaults to CUDA when available
+
+        Returns:
+            Loaded Whisper model
+        """
+        key = (model_size or DEFAULT_MODEL_SIZE, self._resolve_device(device))
+
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model; the rest wait and share it
+        with load_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._load(*key)
+                self._models[key] = model
+        return model
+
+    def _load(self, model_size: str, device: str) -> Any:
+        import whisper
+
+        logger.info(f"Loading Whisper model '{model_size}' on {device}")
+        start_time = time.perf_counter()
+        model = whisper.load_model(model_size, device=device)
+        load_time = time.perf_counter() - start_time
+
+        memory_bytes = sum(
+            tensor.numel() * tensor.element_size()
+            for tensor in list(model.parameters()) + list(model.buffers())
+        )
+        self._info[(model_size, device)] = ModelInfo(
+            model_size=model_size,
+            device=device,
+            load_time=load_time,
+            memory_bytes=memory_bytes,
+            loaded_at=datetime.now()
+        )
+        logger.info(
+            f"Whisper model '{model_size}' loaded in {load_time:.2f}s "
+            f"({memory_bytes / (1024 * 1024):.1f} MiB)"
+        )
+        return model
+
+    def warm_up(self, model_size: str = None, device: str = None) -> ModelInfo:
+        """
+        Load a model ahead of the first request and mark the registry ready
+
+        Args:
+            model_size: Whisper model name
+            device: Torch device
+
+        Returns:
+            ModelInfo for the warmed-up model
+        """
+        return self.warm_up_models([model_size or DEFAULT_MODEL_SIZE], device)[0]
+
+    def warm_up_models(self, model_sizes: Iterable[str], device: str = None) -> List[ModelInfo]:
+        """
+        Load several models (e.g. every model the language router uses), then mark the registry ready
+
+        Args:
+            model_sizes: Whisper model names
+            device: Torch device
+
+        Returns:
+            ModelInfo for each warmed-up model, in order
+        """
+        device = self._resolve_device(device)
+        model_sizes = list(model_sizes)
+        try:
+            for model_size in model_sizes:
+                self.get(model_size, device)
+        except Exception as e:
+            self._warmup_error = str(e)
+            logger.error(f"Model warm-up failed: {e}")
+            raise
+        self.mark_ready(model_sizes)
+        return [self._info[(model_size, device)] for model_size in model_sizes]
+
+    def mark_ready(self, model_sizes: Iterable[str] = None):
+        """Mark the registry ready once models are warm (here or in worker processes)"""
+        for model_size in model_sizes or [DEFAULT_MODEL_SIZE]:
+            if model_size not in self._warm_models:
+                self._warm_models.append(model_size)
+        self._warmup_error = None
+        self._ready.set()
+
+    def is_loaded(self, model_size: str = None, device: str = None) -> bool:
+        """Check whether a model is resident without loading it"""
+        key = (model_size or DEFAULT_MODEL_SIZE, self._resolve_device(device))
+        return key in self._models
+
+    def missing_models(self, model_sizes: Iterable[str]) -> List[str]:
+        """The given models that no warm-up has covered yet"""
+        return [model_size for model_size in model_sizes if model_size not in self._warm_models]
+
+    def is_ready(self, model_sizes: Iterable[str] = None) -> bool:
+        """True once a warm-up has completed and covered every given model"""
+        return self._ready.is_set() and not self.missing_models(model_sizes or [])
+
+    def get_loaded_models(self) -> List[Dict[str, Any]]:
+        """Get load time and memory statistics for every resident model"""
+        return [info.to_dict() for info in self._info.values()]
+
+    def get_status(self, model_sizes: Iterable[str] = None) -> Dict[str, Any]:
+        """
+        Get registry readiness and model statistics
+
+        Args:
+            model_sizes: Models that must be warm to count as ready (e.g. the routed models)
+        """
+        models = self.get_loaded_models()
+        missing = self.missing_models(model_sizes or [])
+        return {
+            'ready': self.is_ready() and not missing,
+            'default_model': DEFAULT_MODEL_SIZE,
+            'warm_models': list(self._warm_models),
+            'missing_models': missing,
+            'models': models,
+            'total_memory_bytes': sum(model['memory_bytes'] for model in models),
+            'warmup_error': self._warmup_error
+        }
+
+
+# Global model registry instance
+model_registry = ModelRegistry()
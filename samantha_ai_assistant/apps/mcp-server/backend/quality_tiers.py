@@ -0,0 +1,223 @@
+"""
+Adaptive ASR Quality Tiers for Samantha AI MCP Server
+Trades decoding quality for speed as inference queue depth and latency rise
+"""
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .inference_executor import inference_executor
+from .language_router import LanguageRoute, english_variant
+from .metrics import asr_quality_tier, asr_quality_tier_switches
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Policy configuration (overridable via environment)
+ASR_LATENCY_TARGET = float(os.getenv("SAMANTHA_ASR_LATENCY_TARGET_MS", "2000")) / 1000.0
+STEP_DOWN_QUEUE_DEPTH = int(os.getenv("SAMANTHA_QUALITY_STEP_DOWN_QUEUE_DEPTH", "2"))
+STEP_DOWN_LATENCY_RATIO = 0.8   # p95 at 80% of the target counts as about to miss it
+STEP_UP_LATENCY_RATIO = 0.5     # climb back only with ample headroom, to avoid flapping
+LATENCY_WINDOW = 50             # recent transcriptions the p95 is taken over
+MIN_STEP_UP_SAMPLES = 10
+STEP_DOWN_HOLD_SECONDS = 2.0
+STEP_UP_HOLD_SECONDS = 30.0
+# Tier to start in; unset starts in the tier that decodes as before tiers existed
+INITIAL_QUALITY_TIER = os.getenv("SAMANTHA_QUALITY_INITIAL_TIER") or None
+
+
+@dataclass(frozen=True)
+class QualityTier:
+    """One ASR operating point"""
+    name: str
+    model_size: Optional[str] = None    # None keeps the language route's model
+    beam_size: Optional[int] = None     # None decodes greedily
+    temperature_fallback: bool = True   # retry at higher temperatures on poor output
+
+    def apply(self, route: LanguageRoute) -> LanguageRoute:
+        """The route with this tier's model and decoding settings"""
+        model_size = route.model_size
+        if self.model_size:
+            # Keep English routes on the English-only variant of the tier's model
+            model_size = english_variant(self.model_size) if route.model_size.endswith('.en') \
+                else self.model_size
+        return replace(
+            route,
+            model_size=model_size,
+            beam_size=self.beam_size,
+            temperature_fallback=self.temperature_fallback,
+            tier=self.name
+        )
+
+    @property
+    def is_baseline(self) -> bool:
+        """Decodes like the pre-tier pipeline: the route's model, greedy, with temperature fallback"""
+        return self.model_size is None and self.beam_size is None and self.temperature_fallback
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'model': self.model_size,
+            'beam_size': self.beam_size,
+            'temperature_fallback': self.temperature_fallback
+        }
+
+
+# Most accurate first; 'balanced' is the decoding used before tiers existed, and the starting tier
+DEFAULT_QUALITY_TIERS = [
+    QualityTier('accurate', beam_size=5),
+    QualityTier('balanced'),
+    QualityTier('fast', model_size='tiny', temperature_fallback=False),
+]
+
+
+def load_quality_tiers() -> List[QualityTier]:
+    """SAMANTHA_QUALITY_TIERS, e.g. '[{"name": "hq", "model": "small", "beam_size": 5}, {"name": "lo"}]'"""
+    raw = os.getenv("SAMANTHA_QUALITY_TIERS")
+    if not raw:
+        return list(DEFAULT_QUALITY_TIERS)
+    try:
+        tiers = [
+            QualityTier(
+                name=rule['name'],
+                model_size=rule.get('model'),
+                beam_size=rule.get('beam_size'),
+                temperature_fallback=rule.get('temperature_fallback', True)
+            )
+            for rule in json.loads(raw)
+        ]
+        if tiers:
+            return tiers
+        logger.error("SAMANTHA_QUALITY_TIERS is empty; using the default tiers")
+    except (ValueError, TypeError, KeyError) as e:
+        logger.error(f"Ignoring invalid SAMANTHA_QUALITY_TIERS: {e}")
+    return list(DEFAULT_QUALITY_TIERS)
+
+
+class QualityTierPolicy:
+    """
+    Picks the quality tier for each transcription
+
+    Starts in the tier that decodes as before tiers existed ('balanced'),
+    steps one tier faster as soon as the inference queue backs up or the p95
+    latency of the current tier nears the target, and one tier slower once
+    the queue is empty and p95 has been comfortably under the target for a
+    while. Latency samples are kept per tier and cleared on every switch, so
+    each decision is based on how the current tier performs.
+    """
+
+    def __init__(self, tiers: Optional[List[QualityTier]] = None,
+                 latency_target: float = ASR_LATENCY_TARGET,
+                 queue_depth: Optional[Callable[[], int]] = None,
+                 step_down_queue_depth: int = STEP_DOWN_QUEUE_DEPTH,
+                 clock: Callable[[], float] = time.monotonic,
+                 initial_tier: Optional[str] = INITIAL_QUALITY_TIER):
+        self.tiers = tiers or load_quality_tiers()
+        self.latency_target = latency_target
+        self.queue_depth = queue_depth or (lambda: inference_executor.get_stats()['queue_depth'])
+        self.step_down_queue_depth = step_down_queue_depth
+        self.clock = clock
+
+        # Slower tiers are earned through measured headroom, not assumed at startup
+        self._index = self._initial_index(initial_tier)
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._switched_at = clock()
+        self._stats = {'step_downs': 0, 'step_ups': 0}
+        asr_quality_tier.set(self._index)
+
+    def _initial_index(self, name: Optional[str]) -> int:
+        """The named tier, else the first baseline tier, else the most accurate one"""
+        names = [tier.name for tier in self.tiers]
+        if name is not None:
+            if name in names:
+                return names.index(name)
+            logger.error(f"Unknown initial quality tier '{name}'; expected one of {', '.join(names)}")
+        return next((index for index, tier in enumerate(self.tiers) if tier.is_baseline), 0)
+
+    @property
+    def current(self) -> QualityTier:
+        return self.tiers[self._index]
+
+    def select(self) -> QualityTier:
+        """Re-evaluate load and return the tier for the next transcription"""
+        if len(self.tiers) > 1:
+            self._evaluate()
+        return self.current
+
+    def apply(self, route: LanguageRoute) -> LanguageRoute:
+        """Apply the currently selected tier to a language route"""
+        return self.select().apply(route)
+
+    def model_sizes(self, routes: Iterable[LanguageRoute]) -> List[str]:
+        """Every model some tier switches the given routes to (e.g. 'tiny.en' for 'base.en')"""
+        sizes: List[str] = []
+        for route in routes:
+            for tier in self.tiers:
+                model_size = tier.apply(route).model_size
+                if model_size not in sizes:
+                    sizes.append(model_size)
+        return sizes
+
+    def observe(self, tier: Optional[str], seconds: float):
+        """Record a transcription latency; samples from a previous tier are ignored"""
+        if tier == self.current.name:
+            self._latencies.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        """95th percentile latency of the current tier, or None without samples"""
+        if not self._latencies:
+            return None
+        return float(np.percentile(np.fromiter(self._latencies, dtype=np.float64), 95))
+
+    def _evaluate(self):
+        held_for = self.clock() - self._switched_at
+        depth = self.queue_depth()
+        p95 = self.p95()
+
+        about_to_miss = depth >= self.step_down_queue_depth or \
+            (p95 is not None and p95 >= self.latency_target * STEP_DOWN_LATENCY_RATIO)
+        if about_to_miss:
+            if self._index < len(self.tiers) - 1 and held_for >= STEP_DOWN_HOLD_SECONDS:
+                self._switch(self._index + 1, 'down', depth, p95)
+            return
+
+        headroom = depth == 0 and len(self._latencies) >= MIN_STEP_UP_SAMPLES and \
+            p95 <= self.latency_target * STEP_UP_LATENCY_RATIO
+        if headroom and self._index > 0 and held_for >= STEP_UP_HOLD_SECONDS:
+            self._switch(self._index - 1, 'up', depth, p95)
+
+    def _switch(self, index: int, direction: str, depth: int, p95: Optional[float]):
+        previous = self.current.name
+        self._index = index
+        self._latencies.clear()
+        self._switched_at = self.clock()
+        self._stats['step_downs' if direction == 'down' else 'step_ups'] += 1
+        asr_quality_tier.set(index)
+        asr_quality_tier_switches.labels(direction=direction).inc()
+        p95_text = f"{p95 * 1000:.0f}ms" if p95 is not None else "n/a"
+        logger.info(f"ASR quality tier {previous} -> {self.current.name} "
+                    f"(queue depth {depth}, p95 {p95_text}, target {self.latency_target * 1000:.0f}ms)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the active tier, the recent latency percentile and switch counters"""
+        p95 = self.p95()
+        return {
+            'tier': self.current.name,
+            'tiers': [tier.to_dict() for tier in self.tiers],
+            'latency_target_ms': round(self.latency_target * 1000.0, 1),
+            'p95_ms': round(p95 * 1000.0, 1) if p95 is not None else None,
+            'samples': len(self._latencies),
+            **self._stats
+        }
+
+
+# Global quality tier policy instance
+quality_tier_policy = QualityTierPolicy()
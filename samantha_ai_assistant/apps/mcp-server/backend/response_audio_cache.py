@@ -0,0 +1,191 @@
+"""
+Response Audio Cache for Samantha AI MCP Server
+Pre-rendered reply audio keyed by text, voice and format
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import struct
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .speech_synthesis import (
+    speech_synthesizer, SpeechSynthesizer, SpeechSynthesisError, SynthesizedSpeech, SAMPLE_WIDTH,
+    TTS_CHUNK_BYTES, wav_header
+)
+from .tiered_cache import TieredCache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache configuration (overridable via environment); the disk tier is off
+# unless a directory is configured
+RESPONSE_AUDIO_CACHE_BYTES = int(os.getenv("SAMANTHA_RESPONSE_AUDIO_CACHE_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_AUDIO_CACHE_DIR = os.getenv("SAMANTHA_RESPONSE_AUDIO_CACHE_DIR") or None
+RESPONSE_AUDIO_CACHE_DISK_BYTES = int(os.getenv("SAMANTHA_RESPONSE_AUDIO_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+RESPONSE_AUDIO_WARMUP = os.getenv("SAMANTHA_RESPONSE_AUDIO_WARMUP", "true").lower() in ("1", "true", "yes")
+WARMUP_CONCURRENCY = 2
+
+WAV_HEADER_BYTES = 44
+
+
+def _speech_from_wav(audio_data: bytes) -> SynthesizedSpeech:
+    """Rebuild SynthesizedSpeech from a cached canonical WAV file"""
+    sample_rate = struct.unpack_from('<I', audio_data, 24)[0]
+    pcm_bytes = len(audio_data) - WAV_HEADER_BYTES
+    return SynthesizedSpeech(audio_data, sample_rate, pcm_bytes / (sample_rate * SAMPLE_WIDTH))
+
+
+class ResponseAudioCache:
+    """Synthesized speech in a TieredCache, filled on demand and by warm-up"""
+
+    audio_format = 'wav'
+
+    def __init__(self, synthesizer: SpeechSynthesizer = speech_synthesizer,
+                 max_memory_bytes: int = RESPONSE_AUDIO_CACHE_BYTES,
+                 disk_dir: Optional[str] = RESPONSE_AUDIO_CACHE_DIR,
+                 max_disk_bytes: int = RESPONSE_AUDIO_CACHE_DISK_BYTES):
+        self.synthesizer = synthesizer
+        self.cache = TieredCache('response_audio', max_memory_bytes, disk_dir, max_disk_bytes)
+        self._warmup: Dict[str, Any] = {'rendered': 0, 'cached': 0, 'failed': 0, 'seconds': 0.0}
+
+    def key(self, text: str, voice: Optional[str] = None) -> str:
+        """Content-addressed key over backend, resolved voice, format and text"""
+        voice = self.synthesizer.resolve_voice(voice)
+        material = f"{self.synthesizer.backend_name}|{voice}|{self.audio_format}|{text}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    async def lookup(self, text: str, voice: Optional[str] = None) -> Optional[SynthesizedSpeech]:
+        """Cached audio for text, or None"""
+        audio_data = await self.cache.get(self.key(text, voice))
+        return _speech_from_wav(audio_data) if audio_data is not None else None
+
+    async def get_or_synthesize(self, text: str, voice: Optional[str] = None) -> Tuple[SynthesizedSpeech, str]:
+        """
+        Return cached audio, synthesizing and storing it on a miss
+
+        Args:
+            text: Text to speak
+            voice: TTS voice name
+
+        Returns:
+            Tuple of (SynthesizedSpeech, cache source)
+        """
+        async def render() -> bytes:
+            return (await self.synthesizer.synthesize(text, voice)).audio_data
+
+        audio_data, source = await self.cache.get_or_compute(self.key(text, voice), render)
+        return _speech_from_wav(audio_data), source
+
+    async def stream(self, text: str, voice: Optional[str] = None) -> AsyncIterator[Tuple[int, bytes]]:
+        """
+        Stream PCM for text from the cache, or from the synthesizer while filling the cache
+
+        Yields:
+            (sample_rate, 16-bit mono PCM chunk) pairs
+        """
+        cached = await self.lookup(text, voice)
+        if cached is not None:
+            for offset in range(WAV_HEADER_BYTES, len(cached.audio_data), TTS_CHUNK_BYTES):
+                yield cached.sample_rate, cached.audio_data[offset:offset + TTS_CHUNK_BYTES]
+            return
+
+        chunks = []
+        async for chunk in self.synthesizer.stream(text, voice):
+            chunks.append(chunk)
+            yield self.synthesizer.sample_rate, chunk
+        # Only complete renders are stored; errors propagate before this point
+        pcm = b''.join(chunks)
+        await self.cache.put(self.key(text, voice), wav_header(self.synthesizer.sample_rate, len(pcm)) + pcm)
+
+    async def stream_wav(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Stream a WAV file: an open-ended header followed by PCM chunks"""
+        header_sent = False
+        async for sample_rate, chunk in self.stream(text, voice):
+            if not header_sent:
+                header_sent = True
+                chunk = wav_header(sample_rate) + chunk
+            yield chunk
+        if not header_sent:
+            yield wav_header(self.synthesizer.sample_rate)
+
+    async def send_speech(self, send_json: Callable[[Dict[str, Any]], Awaitable[None]],
+                          send_bytes: Callable[[bytes], Awaitable[None]],
+                          text: str, voice: Optional[str] = None):
+        """
+        Speak text over a message channel (e.g. a WebSocket)
+
+        Sends {"type": "tts_start"}, binary 16-bit PCM chunks, then
+        {"type": "tts_end"}; text that renders to no audio still gets the
+        pair. A failure sends {"type": "error"} instead of "tts_end".
+
+        Args:
+            send_json: Sends one JSON message
+            send_bytes: Sends one binary message
+            text: Text to speak
+            voice: TTS voice name
+        """
+        if not self.synthesizer.is_available():
+            await send_json({"type": "error", "error": "No speech synthesis backend available"})
+            return
+
+        async def start(sample_rate: int):
+            await send_json({"type": "tts_start", "format": "s16le", "channels": 1, "sample_rate": sample_rate})
+
+        # The rate is only known for certain once the first chunk exists
+        sent = 0
+        sample_rate = self.synthesizer.sample_rate
+        try:
+            async for sample_rate, chunk in self.stream(text, voice):
+                if sent == 0:
+                    await start(sample_rate)
+                await send_bytes(chunk)
+                sent += len(chunk)
+        except SpeechSynthesisError as e:
+            await send_json({"type": "error", "error": str(e)})
+            return
+        if sent == 0:
+            await start(sample_rate)
+        await send_json({"type": "tts_end", "duration": sent / (sample_rate * SAMPLE_WIDTH)})
+
+    async def warm_up(self, texts: Iterable[str], voice: Optional[str] = None,
+                      concurrency: int = WARMUP_CONCURRENCY) -> Dict[str, Any]:
+        """
+        Pre-render replies so they are served without synthesis latency
+
+        Args:
+            texts: Reply texts to render
+            voice: TTS voice name
+            concurrency: Renders in flight at once
+
+        Returns:
+            Counts of rendered, already cached and failed texts
+        """
+        started_at = time.perf_counter()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def render(text: str):
+            async with semaphore:
+                try:
+                    _, source = await self.get_or_synthesize(text, voice)
+                except Exception as e:
+                    logger.warning(f"Could not pre-render reply '{text}': {e}")
+                    self._warmup['failed'] += 1
+                    return
+                self._warmup['rendered' if source == 'computed' else 'cached'] += 1
+
+        await asyncio.gather(*(render(text) for text in dict.fromkeys(texts)))
+        self._warmup['seconds'] = round(time.perf_counter() - started_at, 3)
+        logger.info(f"Reply audio warm-up: {self._warmup}")
+        return dict(self._warmup)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters and the last warm-up summary"""
+        return {**self.cache.get_stats(), 'warmup': dict(self._warmup)}
+
+
+# Global response audio cache instance
+response_audio_cache = ResponseAudioCache()
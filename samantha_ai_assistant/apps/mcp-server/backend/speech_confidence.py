@@ -0,0 +1,155 @@
+"""
+Speech Confidence Gate for Samantha AI MCP Server
+Acoustic confidence from Whisper segment statistics and the no-speech early exit
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .metrics import asr_confidence, asr_gated_transcriptions
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Gate configuration (overridable via environment); the first two are
+# Whisper's own silence rule (no_speech_threshold / logprob_threshold)
+SPEECH_GATE_ENABLED = os.getenv("SAMANTHA_SPEECH_GATE", "true").lower() in ("1", "true", "yes")
+NO_SPEECH_THRESHOLD = float(os.getenv("SAMANTHA_NO_SPEECH_THRESHOLD", "0.6"))
+LOGPROB_THRESHOLD = float(os.getenv("SAMANTHA_LOGPROB_THRESHOLD", "-1.0"))
+MIN_ASR_CONFIDENCE = float(os.getenv("SAMANTHA_MIN_ASR_CONFIDENCE", "0.15"))
+
+
+@dataclass(frozen=True)
+class AcousticConfidence:
+    """How likely a transcript is to be real speech, from the decoder's own statistics"""
+    no_speech_prob: float   # probability of the <|nospeech|> token at the start of decoding
+    avg_logprob: float      # mean log-probability of the decoded tokens
+
+    @property
+    def confidence(self) -> float:
+        """
+        Probability-scale confidence in [0, 1]
+
+        exp(avg_logprob) is the geometric-mean token probability, which
+        Whisper's training keeps reasonably calibrated; it is discounted by
+        the chance the audio held no speech at all.
+        """
+        return max(min(math.exp(self.avg_logprob) * (1.0 - self.no_speech_prob), 1.0), 0.0)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'confidence': round(self.confidence, 4),
+            'no_speech_prob': round(self.no_speech_prob, 4),
+            'avg_logprob': round(self.avg_logprob, 4)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional['AcousticConfidence']:
+        if not data:
+            return None
+        return cls(no_speech_prob=float(data['no_speech_prob']), avg_logprob=float(data['avg_logprob']))
+
+
+def aggregate_confidence(parts: Iterable[Tuple[float, float, float]]) -> Optional[AcousticConfidence]:
+    """
+    Duration-weighted mean over (seconds, no_speech_prob, avg_logprob) parts
+
+    Returns:
+        AcousticConfidence, or None when there are no parts
+    """
+    total = no_speech = logprob = 0.0
+    for seconds, part_no_speech, part_logprob in parts:
+        weight = max(seconds, 0.01)
+        total += weight
+        no_speech += weight * part_no_speech
+        logprob += weight * part_logprob
+    if not total:
+        return None
+    return AcousticConfidence(no_speech_prob=no_speech / total, avg_logprob=logprob / total)
+
+
+def confidence_from_result(result: Dict[str, Any]) -> Optional[AcousticConfidence]:
+    """
+    Acoustic confidence of a Whisper result
+
+    Full transcriptions carry statistics per segment; batched decodes carry
+    them for the whole clip.
+
+    Returns:
+        AcousticConfidence, or None when the result has no statistics
+    """
+    segments = [
+        segment for segment in result.get('segments') or []
+        if segment.get('no_speech_prob') is not None and segment.get('avg_logprob') is not None
+    ]
+    if segments:
+        return aggregate_confidence(
+            (segment['end'] - segment['start'], segment['no_speech_prob'], segment['avg_logprob'])
+            for segment in segments
+        )
+    if result.get('no_speech_prob') is not None and result.get('avg_logprob') is not None:
+        return AcousticConfidence(no_speech_prob=result['no_speech_prob'], avg_logprob=result['avg_logprob'])
+    return None
+
+
+class SpeechGate:
+    """
+    Decides whether a transcript is worth passing on to intent extraction
+
+    A transcript is stopped as 'no_speech' when Whisper itself would call the
+    audio silent (no_speech_prob above the threshold and avg_logprob below
+    the log-probability threshold), and as 'low_confidence' when its acoustic
+    confidence is under min_confidence. Transcripts without statistics
+    (cached before they were recorded, or from the ffmpeg file path) pass.
+    """
+
+    def __init__(self, enabled: bool = SPEECH_GATE_ENABLED,
+                 no_speech_threshold: float = NO_SPEECH_THRESHOLD,
+                 logprob_threshold: float = LOGPROB_THRESHOLD,
+                 min_confidence: float = MIN_ASR_CONFIDENCE):
+        self.enabled = enabled
+        self.no_speech_threshold = no_speech_threshold
+        self.logprob_threshold = logprob_threshold
+        self.min_confidence = min_confidence
+        self._stats = {'checked': 0, 'no_speech': 0, 'low_confidence': 0}
+
+    def reason(self, confidence: Optional[AcousticConfidence]) -> Optional[str]:
+        """Why the transcript should be dropped, or None to keep it"""
+        if not self.enabled or confidence is None:
+            return None
+        if confidence.no_speech_prob > self.no_speech_threshold and \
+                confidence.avg_logprob < self.logprob_threshold:
+            return 'no_speech'
+        if confidence.confidence < self.min_confidence:
+            return 'low_confidence'
+        return None
+
+    def check(self, confidence: Optional[AcousticConfidence]) -> Optional[str]:
+        """reason(), counted in the gate's stats and metrics"""
+        if confidence is None:
+            return None
+        self._stats['checked'] += 1
+        asr_confidence.observe(confidence.confidence)
+        reason = self.reason(confidence)
+        if reason:
+            self._stats[reason] += 1
+            asr_gated_transcriptions.labels(reason=reason).inc()
+        return reason
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the thresholds and how many transcripts were stopped"""
+        return {
+            'enabled': self.enabled,
+            'no_speech_threshold': self.no_speech_threshold,
+            'logprob_threshold': self.logprob_threshold,
+            'min_confidence': self.min_confidence,
+            **self._stats
+        }
+
+
+# Global speech gate instance
+speech_gate = SpeechGate()
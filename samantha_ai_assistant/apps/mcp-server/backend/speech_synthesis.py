@@ -0,0 +1,255 @@
+"""
+Speech Synthesis Module for Samantha AI MCP Server
+Pluggable text-to-speech backends with chunked PCM streaming
+"""
+
+import asyncio
+import logging
+import os
+import re
+import shutil
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Type
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Synthesis configuration (overridable via environment)
+TTS_BACKEND = os.getenv("SAMANTHA_TTS_BACKEND", "espeak-ng")
+TTS_VOICE = os.getenv("SAMANTHA_TTS_VOICE", "en-us")
+TTS_RATE_WPM = int(os.getenv("SAMANTHA_TTS_RATE", "175"))
+TTS_TIMEOUT = float(os.getenv("SAMANTHA_TTS_TIMEOUT", "30"))
+TTS_CHUNK_BYTES = 4096
+
+# espeak-ng voice names look like 'en-us', 'fr', 'en+f3'; anything else
+# (e.g. cloud voice names such as 'alloy') falls back to the default voice
+ESPEAK_VOICE_PATTERN = re.compile(r'^[a-z]{2,3}(-[a-z0-9]+)*(\+[a-z0-9]+)?$')
+
+SAMPLE_WIDTH = 2  # all backends produce 16-bit little-endian mono PCM
+
+
+class SpeechSynthesisError(Exception):
+    """Raised when a backend fails to synthesize speech"""
+
+
+@dataclass
+class SynthesizedSpeech:
+    """A complete synthesized utterance"""
+    audio_data: bytes   # WAV file
+    sample_rate: int
+    duration: float
+
+
+def wav_header(sample_rate: int, data_size: Optional[int] = None, channels: int = 1) -> bytes:
+    """
+    Canonical 44-byte PCM WAV header
+
+    Args:
+        sample_rate: Samples per second
+        data_size: PCM byte count, or None for a stream of unknown length
+        channels: Channel count
+
+    Returns:
+        Header bytes; streaming headers use the 0xFFFFFFFF size convention
+    """
+    riff_size = 0xFFFFFFFF if data_size is None else 36 + data_size
+    data_size = 0xFFFFFFFF if data_size is None else data_size
+    block_align = channels * SAMPLE_WIDTH
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', riff_size, b'WAVE', b'fmt ', 16, 1, channels, sample_rate,
+        sample_rate * block_align, block_align, SAMPLE_WIDTH * 8, b'data', data_size
+    )
+
+
+class TTSBackend(ABC):
+    """Interface for text-to-speech engines"""
+
+    name = 'base'
+    sample_rate = 22050
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Whether the engine can run on this host"""
+
+    @abstractmethod
+    def stream(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Yield 16-bit mono PCM chunks as they are generated"""
+
+    def resolve_voice(self, voice: Optional[str]) -> str:
+        """The voice the engine will actually use for a requested voice"""
+        return voice or ''
+
+
+class EspeakNgBackend(TTSBackend):
+    """Offline CPU synthesis through the espeak-ng command line"""
+
+    name = 'espeak-ng'
+
+    def __init__(self, voice: str = TTS_VOICE, rate_wpm: int = TTS_RATE_WPM):
+        self.executable = shutil.which('espeak-ng') or shutil.which('espeak')
+        self.voice = voice
+        self.rate_wpm = rate_wpm
+
+    def is_available(self) -> bool:
+        return self.executable is not None
+
+    def resolve_voice(self, voice: Optional[str]) -> str:
+        if voice is None or not ESPEAK_VOICE_PATTERN.match(voice):
+            return self.voice
+        return voice
+
+    async def stream(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        if not self.is_available():
+            raise SpeechSynthesisError("espeak-ng is not installed")
+        voice = self.resolve_voice(voice)
+
+        # Text goes through stdin so it can neither be parsed as an option
+        # nor hit argv length limits
+        process = await asyncio.create_subprocess_exec(
+            self.executable, '--stdout', '-v', voice, '-s', str(self.rate_wpm),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            process.stdin.write(text.encode('utf-8'))
+            await process.stdin.drain()
+            process.stdin.close()
+
+            # espeak-ng writes a WAV header with placeholder sizes, then PCM
+            header = await process.stdout.readexactly(44)
+            if header[:4] != b'RIFF':
+                raise SpeechSynthesisError("espeak-ng produced no WAV output")
+            self.sample_rate = struct.unpack_from('<I', header, 24)[0]
+
+            while True:
+                chunk = await process.stdout.read(TTS_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+            if await process.wait() != 0:
+                stderr = (await process.stderr.read()).decode(errors='replace').strip()
+                raise SpeechSynthesisError(f"espeak-ng failed: {stderr}")
+        except asyncio.IncompleteReadError:
+            stderr = (await process.stderr.read()).decode(errors='replace').strip()
+            raise SpeechSynthesisError(f"espeak-ng produced no audio: {stderr}")
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+
+# Backend registry; register_backend adds engines without touching callers
+TTS_BACKENDS: Dict[str, Type[TTSBackend]] = {
+    'espeak-ng': EspeakNgBackend,
+}
+
+
+def register_backend(name: str, backend_class: Type[TTSBackend]):
+    """Make a TTS backend selectable through SAMANTHA_TTS_BACKEND"""
+    TTS_BACKENDS[name] = backend_class
+
+
+class SpeechSynthesizer:
+    """Front end over the configured TTS backend"""
+
+    def __init__(self, backend_name: str = TTS_BACKEND, timeout: float = TTS_TIMEOUT):
+        self.backend_name = backend_name
+        self.timeout = timeout
+        self._backend: Optional[TTSBackend] = None
+        self._stats = {'requests': 0, 'failures': 0, 'audio_seconds': 0.0}
+
+    @property
+    def backend(self) -> TTSBackend:
+        if self._backend is None:
+            backend_class = TTS_BACKENDS.get(self.backend_name)
+            if backend_class is None:
+                raise SpeechSynthesisError(f"Unknown TTS backend: {self.backend_name}")
+            self._backend = backend_class()
+        return self._backend
+
+    def is_available(self) -> bool:
+        try:
+            return self.backend.is_available()
+        except SpeechSynthesisError:
+            return False
+
+    @property
+    def sample_rate(self) -> int:
+        return self.backend.sample_rate
+
+    def resolve_voice(self, voice: Optional[str]) -> str:
+        return self.backend.resolve_voice(voice)
+
+    async def stream(self, text: str, voice: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Stream PCM chunks for text, bounded by the synthesis timeout
+
+        Args:
+            text: Text to speak
+            voice: Backend voice name; unknown voices use the default
+
+        Yields:
+            16-bit little-endian mono PCM at self.sample_rate (known once
+            the first chunk has been produced)
+        """
+        self._stats['requests'] += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        pcm_bytes = 0
+        chunks = self.backend.stream(text, voice).__aiter__()
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise SpeechSynthesisError(f"Speech synthesis timed out after {self.timeout:.1f}s")
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), remaining)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise SpeechSynthesisError(f"Speech synthesis timed out after {self.timeout:.1f}s")
+                pcm_bytes += len(chunk)
+                yield chunk
+        except SpeechSynthesisError:
+            self._stats['failures'] += 1
+            raise
+        finally:
+            await chunks.aclose()
+            self._stats['audio_seconds'] += pcm_bytes / (self.backend.sample_rate * SAMPLE_WIDTH)
+
+    async def synthesize(self, text: str, voice: Optional[str] = None) -> SynthesizedSpeech:
+        """
+        Synthesize a whole utterance
+
+        Args:
+            text: Text to speak
+            voice: Backend voice name
+
+        Returns:
+            SynthesizedSpeech holding a complete WAV file and its duration
+        """
+        pcm = b''.join([chunk async for chunk in self.stream(text, voice)])
+        sample_rate = self.sample_rate
+        return SynthesizedSpeech(
+            audio_data=wav_header(sample_rate, len(pcm)) + pcm,
+            sample_rate=sample_rate,
+            duration=len(pcm) / (sample_rate * SAMPLE_WIDTH)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get backend availability and synthesis counters"""
+        return {
+            'backend': self.backend_name,
+            'available': self.is_available(),
+            **self._stats
+        }
+
+
+# Global speech synthesizer instance
+speech_synthesizer = SpeechSynthesizer()
@@ -0,0 +1,268 @@
+"""
+Streaming Speech Recognition for Samantha AI MCP Server
+Incremental recognition over a sliding window with partial and final transcripts
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import numpy as np
+
+from .audio_normalization import (
+    PolyphaseResampler, TARGET_SAMPLE_RATE, WAVE_FORMAT_PCM, normalize_level, to_mono_float32
+)
+from .inference_executor import inference_executor
+from .speech_confidence import confidence_from_result, speech_gate
+from .voice_processor import voice_processor, VoiceProcessor, TranscriptionResult
+from .voice_activity import FRAME_MS, frame_energies_db, get_vad_thresholds
+from .wake_word import WAKE_LISTEN_SECONDS, WAKE_WORD, WakeWordDetection, WakeWordDetector, wake_word_model
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Streaming configuration (overridable via environment)
+PARTIAL_INTERVAL_MS = float(os.getenv("SAMANTHA_STREAM_PARTIAL_INTERVAL_MS", "300"))
+PARTIAL_WINDOW_SECONDS = float(os.getenv("SAMANTHA_STREAM_WINDOW_SECONDS", "8"))
+ENDPOINT_SILENCE_MS = float(os.getenv("SAMANTHA_STREAM_ENDPOINT_SILENCE_MS", "600"))
+MIN_SPEECH_MS = 200.0
+
+# One Whisper window; longer utterances are finalised and a new one begins
+MAX_UTTERANCE_SECONDS = 30.0
+
+
+class StreamingSession:
+    """
+    Recognition state for one WebSocket audio stream
+
+    Clients send little-endian 16-bit mono PCM frames. The session decodes the
+    most recent window every PARTIAL_INTERVAL_MS and emits partial transcripts;
+    once ENDPOINT_SILENCE_MS of trailing silence follows speech (or the client
+    stops), the whole utterance is decoded once more and emitted as final
+    together with its intent.
+
+    In wake word mode nothing is decoded until the wake word detector fires;
+    the session then sends "wake", recognises one utterance (or sends
+    "sleep" if none starts within WAKE_LISTEN_SECONDS) and goes back to
+    listening for the wake word.
+    """
+
+    def __init__(self, send: Callable[[Dict[str, Any]], Awaitable[None]],
+                 language: Optional[str] = None,
+                 sample_rate: int = TARGET_SAMPLE_RATE,
+                 processor: VoiceProcessor = voice_processor,
+                 wake_word: bool = False):
+        self.send = send
+        self.vad_thresholds = get_vad_thresholds(language)
+        self.sample_rate = sample_rate
+        # One resampler for the whole stream so the filter runs across frame boundaries
+        self._resampler = PolyphaseResampler(sample_rate, TARGET_SAMPLE_RATE)
+        self.processor = processor
+        self.route = processor.language_router.route(language)
+        if wake_word and not wake_word_model.ready:
+            raise ValueError("No wake word templates enrolled")
+        self.wake_detector = WakeWordDetector(wake_word_model) if wake_word else None
+        self._awake = self.wake_detector is None
+        self._awake_samples = 0
+
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._pending_bytes = b''
+        self._speech_samples = 0
+        self._trailing_silence_samples = 0
+        self._samples_at_last_partial = 0
+        self._last_partial = ''
+        self._utterance_started_at: Optional[float] = None
+        self._partial_task: Optional[asyncio.Task] = None
+        # Background finalisations; the next utterance can end before one finishes
+        self._final_tasks: Set[asyncio.Task] = set()
+        self._final_lock = asyncio.Lock()
+
+    @property
+    def duration(self) -> float:
+        return len(self._audio) / TARGET_SAMPLE_RATE
+
+    async def feed(self, pcm: bytes):
+        """Append a binary PCM frame and emit partial/final results as they become due"""
+        pcm = self._pending_bytes + pcm
+        usable = len(pcm) - len(pcm) % 2
+        self._pending_bytes = pcm[usable:]
+        if usable == 0:
+            return
+
+        samples = to_mono_float32(memoryview(pcm)[:usable], WAVE_FORMAT_PCM, 16)
+        samples = self._resampler.process(samples)
+        if not self._awake:
+            detection = self.wake_detector.process(samples)
+            if detection is None:
+                return
+            await self._wake(detection)
+            # Whatever followed the wake word is the start of the command
+            samples = detection.trailing
+        elif self.wake_detector is not None:
+            self._awake_samples += len(samples)
+            if self._speech_samples == 0 and self._awake_samples >= WAKE_LISTEN_SECONDS * TARGET_SAMPLE_RATE:
+                self._sleep()
+                await self.send({"type": "sleep", "reason": "timeout"})
+                return
+        self._track_speech(samples)
+        if self._speech_samples == 0:
+            # Drop leading silence so it never reaches the model
+            return
+
+        if self._utterance_started_at is None:
+            self._utterance_started_at = time.perf_counter()
+        self._audio = np.concatenate([self._audio, samples])
+
+        endpoint_samples = ENDPOINT_SILENCE_MS / 1000.0 * TARGET_SAMPLE_RATE
+        if self._trailing_silence_samples >= endpoint_samples or self.duration >= MAX_UTTERANCE_SECONDS:
+            # Finalise in the background so the socket keeps receiving frames
+            # for the next utterance while this one decodes
+            final_task = asyncio.create_task(self.finalize())
+            self._final_tasks.add(final_task)
+            final_task.add_done_callback(self._final_tasks.discard)
+            if self.wake_detector is not None:
+                self._sleep()
+            return
+
+        interval_samples = PARTIAL_INTERVAL_MS / 1000.0 * TARGET_SAMPLE_RATE
+        speech_ready = self._speech_samples >= MIN_SPEECH_MS / 1000.0 * TARGET_SAMPLE_RATE
+        partial_idle = self._partial_task is None or self._partial_task.done()
+        if speech_ready and partial_idle and \
+                len(self._audio) - self._samples_at_last_partial >= interval_samples:
+            self._samples_at_last_partial = len(self._audio)
+            self._partial_task = asyncio.create_task(self._emit_partial())
+
+    def _track_speech(self, samples: np.ndarray):
+        """Update speech / trailing-silence counters from per-frame energy"""
+        frame = TARGET_SAMPLE_RATE * FRAME_MS // 1000
+        energy_db = frame_energies_db(samples, TARGET_SAMPLE_RATE)
+        frame_count = len(energy_db)
+        if frame_count == 0:
+            return
+        # No whole-clip noise floor while streaming; use the absolute floor
+        voiced = energy_db > self.vad_thresholds.min_energy_db
+
+        self._speech_samples += int(voiced.sum()) * frame
+        if voiced.any():
+            # Silence after the last voiced frame in this chunk
+            last_voiced = frame_count - 1 - int(np.argmax(voiced[::-1]))
+            self._trailing_silence_samples = (frame_count - 1 - last_voiced) * frame
+        elif self._speech_samples:
+            self._trailing_silence_samples += frame_count * frame
+
+    async def _emit_partial(self):
+        window = self._audio[-int(PARTIAL_WINDOW_SECONDS * TARGET_SAMPLE_RATE):]
+        route = self.processor.quality_policy.apply(self.route)
+        try:
+            result = (await inference_executor.decode_batch(
+                [normalize_level(window)], route.batch_decode_options(), model_size=route.model_size
+            ))[0]
+        except Exception as e:
+            logger.warning(f"Partial decode failed: {e}")
+            return
+        text = result['text'].strip()
+        if speech_gate.reason(confidence_from_result(result)):
+            return  # noise; the partial would be a hallucination
+        if text and text != self._last_partial and self._utterance_started_at is not None:
+            self._last_partial = text
+            await self.send({
+                "type": "partial",
+                "text": text,
+                "audio_seconds": round(self.duration, 3),
+                "elapsed_ms": round((time.perf_counter() - self._utterance_started_at) * 1000.0, 1)
+            })
+
+    async def finalize(self):
+        """Decode the buffered utterance, emit the final transcript and intent, and reset"""
+        async with self._final_lock:
+            if self._partial_task is not None and not self._partial_task.done():
+                self._partial_task.cancel()
+            audio = self._audio
+            started_at = self._utterance_started_at
+            self._reset()
+            if self.wake_detector is not None and self._awake:
+                self._sleep()
+            if len(audio) == 0:
+                return
+
+            route = self.processor.quality_policy.apply(self.route)
+            try:
+                result = (await inference_executor.decode_batch(
+                    [normalize_level(audio)], route.batch_decode_options(), model_size=route.model_size
+                ))[0]
+                command = await self.processor.process_transcription(
+                    TranscriptionResult(
+                        text=result['text'].strip(), decode_path='stream', quality_tier=route.tier,
+                        acoustic=confidence_from_result(result)
+                    )
+                )
+            except ValueError:
+                await self.send({"type": "final", "text": "", "command": None})
+                return
+            except Exception as e:
+                logger.error(f"Final decode failed: {e}")
+                await self.send({"type": "error", "error": str(e)})
+                return
+
+            await self.send({
+                "type": "final",
+                "text": command.original_text,
+                "audio_seconds": round(len(audio) / TARGET_SAMPLE_RATE, 3),
+                "elapsed_ms": round((time.perf_counter() - started_at) * 1000.0, 1),
+                "command": {
+                    "id": command.id,
+                    "intent": command.intent,
+                    "confidence": command.confidence,
+                    "asr_confidence": command.asr_confidence,
+                    "no_speech_reason": command.no_speech_reason,
+                    "entities": command.entities,
+                    "timestamp": command.timestamp.isoformat()
+                }
+            })
+
+    async def _wake(self, detection: WakeWordDetection):
+        """Open a recognition window after the wake word"""
+        self._awake = True
+        self._awake_samples = 0
+        await self.send({
+            "type": "wake",
+            "wake_word": WAKE_WORD,
+            "score": round(detection.score, 3),
+            "at_seconds": round(detection.at_seconds, 3)
+        })
+
+    def _sleep(self):
+        """Close the recognition window and listen for the wake word again"""
+        self._awake = False
+        self.wake_detector.reset()
+
+    def _reset(self):
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._speech_samples = 0
+        self._trailing_silence_samples = 0
+        self._samples_at_last_partial = 0
+        self._last_partial = ''
+        self._utterance_started_at = None
+
+    async def close(self):
+        """Stop any in-flight partial decode and background finalisation, and wait for them"""
+        tasks = [task for task in (self._partial_task, *self._final_tasks)
+                 if task is not None and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def parse_control_message(text: str) -> Optional[Dict[str, Any]]:
+    """Return a streaming control message ({"type": ...}) or None for plain text"""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return None
+    if isinstance(message, dict) and message.get('type') in ('start', 'stop', 'tts'):
+        return message
+    return None
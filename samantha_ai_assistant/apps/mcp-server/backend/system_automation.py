@@ -4,22 +4,62 @@ Handles OS-level operations, browser automation, and file system operations
 """
 
 import asyncio
+import functools
 import json
 import logging
-import subprocess
 import platform
 import os
 import sys
+import time
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 import aiohttp
 from pathlib import Path
 
+from .command_runner import command_runner, CommandResult
+from .automation_registry import OperationRegistry, OperationSpec, ParamSpec
+from .file_transfer import file_transfers, FileJob
+from .directory_listing import list_directory, ListingOptions, LISTING_PAGE_SIZE
+from .metrics import (
+    automation_operation_latency, automation_operation_errors
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# System applications launchable per OS (also the source of app entities)
+SYSTEM_APPS = {
+    'macos': {
+        'safari': '/Applications/Safari.app',
+        'chrome': '/Applications/Google Chrome.app',
+        'firefox': '/Applications/Firefox.app',
+        'mail': '/Applications/Mail.app',
+        'messages': '/Applications/Messages.app',
+        'facetime': '/Applications/FaceTime.app',
+        'photos': '/Applications/Photos.app',
+        'finder': '/System/Library/CoreServices/Finder.app',
+        'terminal': '/Applications/Utilities/Terminal.app',
+        'spotify': '/Applications/Spotify.app',
+        'xcode': '/Applications/Xcode.app',
+        'vscode': '/Applications/Visual Studio Code.app'
+    },
+    'windows': {
+        'chrome': 'C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe',
+        'firefox': 'C:\\Program Files\\Mozilla Firefox\\firefox.exe',
+        'edge': 'C:\\Program Files (x86)\\Microsoft\\Edge\\Application\\msedge.exe',
+        'notepad': 'C:\\Windows\\System32\\notepad.exe',
+        'explorer': 'C:\\Windows\\explorer.exe'
+    },
+    'linux': {
+        'firefox': 'firefox',
+        'chrome': 'google-chrome',
+        'terminal': 'gnome-terminal',
+        'file-manager': 'nautilus'
+    }
+}
+
 @dataclass
 class AutomationResult:
     """Result of an automation operation"""
@@ -28,13 +68,17 @@ class AutomationResult:
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     execution_time: float = 0.0
+    exit_code: Optional[int] = None     # of the command run, if any (None when killed on timeout)
+    command_duration: float = 0.0       # seconds the command itself ran
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
 
 class SystemAutomation:
     """System automation engine for the MCP server"""
 
     def __init__(self):
         self.os_type = platform.system().lower()
-        self.supported_operations = self._get_supported_operations()
 
         # Browser automation capabilities
         self.browser_automation = {
@@ -44,71 +88,94 @@ class SystemAutomation:
         }
 
         # System applications
-        self.system_apps = {
-            'macos': {
-                'safari': '/Applications/Safari.app',
-                'chrome': '/Applications/Google Chrome.app',
-                'firefox': '/Applications/Firefox.app',
-                'mail': '/Applications/Mail.app',
-                'messages': '/Applications/Messages.app',
-                'facetime': '/Applications/FaceTime.app',
-                'photos': '/Applications/Photos.app',
-                'finder': '/System/Library/CoreServices/Finder.app',
-                'terminal': '/Applications/Utilities/Terminal.app',
-                'spotify': '/Applications/Spotify.app'
-            },
-            'windows': {
-                'chrome': 'C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe',
-                'firefox': 'C:\\Program Files\\Mozilla Firefox\\firefox.exe',
-                'edge': 'C:\\Program Files (x86)\\Microsoft\\Edge\\Application\\msedge.exe',
-                'notepad': 'C:\\Windows\\System32\\notepad.exe',
-                'explorer': 'C:\\Windows\\explorer.exe'
-            },
-            'linux': {
-                'firefox': 'firefox',
-                'chrome': 'google-chrome',
-                'terminal': 'gnome-terminal',
-                'file-manager': 'nautilus'
-            }
-        }
+        self.system_apps = SYSTEM_APPS
 
-        logger.info(f"SystemAutomation initialized for {self.os_type}")
+        self.operations = OperationRegistry()
+        self._register_operations()
+        self.supported_operations = self._get_supported_operations()
 
-    def _get_supported_operations(self) -> Dict[str, List[str]]:
-        """Get supported operations based on OS"""
-        base_operations = {
-            'file_operations': [
-                'create_file', 'delete_file', 'move_file', 'copy_file',
-                'create_folder', 'delete_folder', 'list_files', 'search_files'
-            ],
-            'application_control': [
-                'launch_app', 'close_app', 'focus_app', 'list_running_apps'
-            ],
-            'system_control': [
-                'volume_up', 'volume_down', 'mute', 'unmute',
-                'brightness_up', 'brightness_down', 'sleep', 'restart', 'shutdown'
-            ],
-            'browser_automation': [
-                'open_url', 'new_tab', 'close_tab', 'switch_tab',
-                'click_element', 'type_text', 'scroll_page', 'fill_form'
-            ]
-        }
+        logger.info(f"SystemAutomation initialized for {self.os_type} with {len(self.operations)} operations")
+
+    def _register_operations(self):
+        """Declare every operation: dispatch name, handler, parameters, platforms and side effects"""
+        register = self.operations.register
+        path = ParamSpec('path', required=True)
+        source = ParamSpec('source', required=True)
+        destination = ParamSpec('destination', required=True)
+        app_name = ParamSpec('app_name', required=True)
+        amount = ParamSpec('amount', int, default=10)
+        browser = ParamSpec('browser', default='chrome')
+
+        # File operations
+        register(OperationSpec('file_create', 'file_operations', self._create_file,
+                               (path, ParamSpec('content', default='')), description="Create a file"))
+        register(OperationSpec('file_delete', 'file_operations', self._delete_file, (path,),
+                               description="Delete a file"))
+        background = ParamSpec('background', bool, default=False)
+        register(OperationSpec('file_move', 'file_operations', self._move_file, (source, destination, background),
+                               description="Move a file; background=true returns a job ID at once"))
+        register(OperationSpec('file_copy', 'file_operations', self._copy_file, (source, destination, background),
+                               description="Copy a file; background=true returns a job ID at once"))
+        register(OperationSpec('file_job_status', 'file_operations', self._file_job_status,
+                               (ParamSpec('job_id', required=True),), mutating=False,
+                               description="Progress of a copy or move"))
+        register(OperationSpec('file_list', 'file_operations', self._list_files,
+                               (ParamSpec('path', default='.'), ParamSpec('sort', default='name'),
+                                ParamSpec('reverse', bool, default=False), ParamSpec('pattern'),
+                                ParamSpec('kind'), ParamSpec('limit', int, default=LISTING_PAGE_SIZE),
+                                ParamSpec('cursor')),
+                               mutating=False,
+                               description="List a directory page by page (sort: name, size, modified or none)"))
+        register(OperationSpec('file_search', 'file_operations', self._search_files,
+                               (ParamSpec('pattern', required=True), ParamSpec('path', default='.')),
+                               mutating=False, description="Find files matching a glob pattern"))
+
+        # Application control
+        register(OperationSpec('app_launch', 'application_control', self._launch_app, (app_name,),
+                               description="Launch an application"))
+        register(OperationSpec('app_close', 'application_control', self._close_app, (app_name,),
+                               description="Close an application"))
+        register(OperationSpec('app_focus', 'application_control', self._focus_app, (app_name,),
+                               description="Bring an application to the front"))
+        register(OperationSpec('app_list', 'application_control', self._list_running_apps, mutating=False,
+                               description="List running applications"))
+
+        # System control (amixer/osascript; brightness is only wired up on macOS)
+        audio_platforms = frozenset({'darwin', 'linux'})
+        register(OperationSpec('system_volume_up', 'system_control', self._volume_up, (amount,),
+                               platforms=audio_platforms, description="Raise the volume"))
+        register(OperationSpec('system_volume_down', 'system_control', self._volume_down, (amount,),
+                               platforms=audio_platforms, description="Lower the volume"))
+        register(OperationSpec('system_mute', 'system_control', self._mute_audio,
+                               platforms=audio_platforms, description="Mute audio"))
+        register(OperationSpec('system_unmute', 'system_control', self._unmute_audio,
+                               platforms=audio_platforms, description="Unmute audio"))
+        register(OperationSpec('system_brightness_up', 'system_control', self._brightness_up, (amount,),
+                               platforms=frozenset({'darwin'}), description="Raise screen brightness"))
+        register(OperationSpec('system_brightness_down', 'system_control', self._brightness_down, (amount,),
+                               platforms=frozenset({'darwin'}), description="Lower screen brightness"))
+
+        # Browser automation
+        register(OperationSpec('browser_open_url', 'browser_automation',
+                               functools.partial(self._browser_action, 'open_url'),
+                               (browser, ParamSpec('url', required=True)), description="Open a URL"))
+        register(OperationSpec('browser_new_tab', 'browser_automation',
+                               functools.partial(self._browser_action, 'new_tab'), (browser,),
+                               description="Open a tab"))
+        register(OperationSpec('browser_close_tab', 'browser_automation',
+                               functools.partial(self._browser_action, 'close_tab'), (browser,),
+                               description="Close the current tab"))
+        register(OperationSpec('browser_click', 'browser_automation',
+                               functools.partial(self._browser_action, 'click'),
+                               (browser, ParamSpec('selector', required=True)), description="Click an element"))
+        register(OperationSpec('browser_type', 'browser_automation',
+                               functools.partial(self._browser_action, 'type'),
+                               (browser, ParamSpec('selector', required=True), ParamSpec('text', required=True)),
+                               description="Type into an element"))
 
-        # Add OS-specific operations
-        if self.os_type == 'darwin':  # macOS
-            base_operations['macos_specific'] = [
-                'spotlight_search', 'mission_control', 'expose', 'dashboard'
-            ]
-        elif self.os_type == 'windows':
-            base_operations['windows_specific'] = [
-                'start_menu', 'task_manager', 'control_panel'
-            ]
-        elif self.os_type == 'linux':
-            base_operations['linux_specific'] = [
-                'terminal_command', 'package_manager', 'system_monitor'
-            ]
-
-        return base_operations
+    def _get_supported_operations(self) -> Dict[str, List[str]]:
+        """Get supported operations (dispatch names by category) based on OS"""
+        return self.operations.categories(self.os_type)
 
     async def execute_command(self, command: str, params: Dict[str, Any] = None) -> AutomationResult:
         """
@@ -121,163 +188,77 @@ class SystemAutomation:
         Returns:
             AutomationResult with execution details
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
+        spec = self.operations.get(command)
+        # Unknown names share one label so arbitrary input cannot grow the metric
+        label = spec.name if spec is not None else 'unknown'
 
         try:
-            # Parse command and route to appropriate handler
-            if command.startswith('file_'):
-                result = await self._handle_file_operation(command, params or {})
-            elif command.startswith('app_'):
-                result = await self._handle_app_operation(command, params or {})
-            elif command.startswith('system_'):
-                result = await self._handle_system_operation(command, params or {})
-            elif command.startswith('browser_'):
-                result = await self._handle_browser_operation(command, params or {})
-            else:
+            if spec is None:
                 result = AutomationResult(
                     success=False,
                     message=f"Unknown command: {command}",
                     error="Unsupported operation"
                 )
+                reason = 'unknown'
+            elif not spec.available_on(self.os_type):
+                result = AutomationResult(
+                    success=False,
+                    message=f"{command} is not available on {self.os_type}",
+                    error="Unsupported operation on this OS"
+                )
+                reason = 'unavailable'
+            else:
+                try:
+                    arguments = spec.bind(params or {})
+                except ValueError as e:
+                    result = AutomationResult(
+                        success=False,
+                        message=f"Invalid parameters for {command}",
+                        error=str(e)
+                    )
+                    reason = 'invalid_params'
+                else:
+                    result = await spec.handler(**arguments)
+                    reason = 'failed'
 
             # Calculate execution time
-            execution_time = (datetime.now() - start_time).total_seconds()
-            result.execution_time = execution_time
+            result.execution_time = time.perf_counter() - start_time
+            automation_operation_latency.labels(operation=label).observe(result.execution_time)
+            if not result.success:
+                automation_operation_errors.labels(operation=label, reason=reason).inc()
 
             return result
 
         except Exception as e:
             logger.error(f"Error executing command {command}: {e}")
+            execution_time = time.perf_counter() - start_time
+            automation_operation_latency.labels(operation=label).observe(execution_time)
+            automation_operation_errors.labels(operation=label, reason='exception').inc()
             return AutomationResult(
                 success=False,
                 message=f"Error executing {command}",
                 error=str(e),
-                execution_time=(datetime.now() - start_time).total_seconds()
+                execution_time=execution_time
             )
 
-    async def _handle_file_operation(self, command: str, params: Dict[str, Any]) -> AutomationResult:
-        """Handle file system operations"""
-        try:
-            if command == 'file_create':
-                return await self._create_file(params.get('path'), params.get('content', ''))
-            elif command == 'file_delete':
-                return await self._delete_file(params.get('path'))
-            elif command == 'file_move':
-                return await self._move_file(params.get('source'), params.get('destination'))
-            elif command == 'file_copy':
-                return await self._copy_file(params.get('source'), params.get('destination'))
-            elif command == 'file_list':
-                return await self._list_files(params.get('path', '.'))
-            elif command == 'file_search':
-                return await self._search_files(params.get('pattern'), params.get('path', '.'))
-            else:
-                return AutomationResult(
-                    success=False,
-                    message=f"Unknown file operation: {command}",
-                    error="Unsupported file operation"
-                )
-        except Exception as e:
-            return AutomationResult(
-                success=False,
-                message=f"File operation failed: {command}",
-                error=str(e)
-            )
-
-    async def _handle_app_operation(self, command: str, params: Dict[str, Any]) -> AutomationResult:
-        """Handle application control operations"""
-        try:
-            if command == 'app_launch':
-                return await self._launch_app(params.get('app_name'))
-            elif command == 'app_close':
-                return await self._close_app(params.get('app_name'))
-            elif command == 'app_focus':
-                return await self._focus_app(params.get('app_name'))
-            elif command == 'app_list':
-                return await self._list_running_apps()
-            else:
-                return AutomationResult(
-                    success=False,
-                    message=f"Unknown app operation: {command}",
-                    error="Unsupported app operation"
-                )
-        except Exception as e:
-            return AutomationResult(
-                success=False,
-                message=f"App operation failed: {command}",
-                error=str(e)
-            )
-
-    async def _handle_system_operation(self, command: str, params: Dict[str, Any]) -> AutomationResult:
-        """Handle system control operations"""
-        try:
-            if command == 'system_volume_up':
-                return await self._volume_up(params.get('amount', 10))
-            elif command == 'system_volume_down':
-                return await self._volume_down(params.get('amount', 10))
-            elif command == 'system_mute':
-                return await self._mute_audio()
-            elif command == 'system_unmute':
-                return await self._unmute_audio()
-            elif command == 'system_brightness_up':
-                return await self._brightness_up(params.get('amount', 10))
-            elif command == 'system_brightness_down':
-                return await self._brightness_down(params.get('amount', 10))
-            else:
-                return AutomationResult(
-                    success=False,
-                    message=f"Unknown system operation: {command}",
-                    error="Unsupported system operation"
-                )
-        except Exception as e:
-            return AutomationResult(
-                success=False,
-                message=f"System operation failed: {command}",
-                error=str(e)
-            )
-
-    async def _handle_browser_operation(self, command: str, params: Dict[str, Any]) -> AutomationResult:
-        """Handle browser automation operations"""
-        try:
-            browser = params.get('browser', 'chrome')
-            browser_func = self.browser_automation.get(browser)
-
-            if not browser_func:
-                return AutomationResult(
-                    success=False,
-                    message=f"Unsupported browser: {browser}",
-                    error="Browser not supported"
-                )
-
-            if command == 'browser_open_url':
-                return await browser_func('open_url', params.get('url'))
-            elif command == 'browser_new_tab':
-                return await browser_func('new_tab')
-            elif command == 'browser_close_tab':
-                return await browser_func('close_tab')
-            elif command == 'browser_click':
-                return await browser_func('click', params.get('selector'))
-            elif command == 'browser_type':
-                return await browser_func('type', params.get('selector'), params.get('text'))
-            else:
-                return AutomationResult(
-                    success=False,
-                    message=f"Unknown browser operation: {command}",
-                    error="Unsupported browser operation"
-                )
-        except Exception as e:
+    async def _browser_action(self, action: str, browser: str = 'chrome', **arguments) -> AutomationResult:
+        """Run a browser action with the automation backend for the requested browser"""
+        browser_func = self.browser_automation.get(browser)
+        if not browser_func:
             return AutomationResult(
                 success=False,
-                message=f"Browser operation failed: {command}",
-                error=str(e)
+                message=f"Unsupported browser: {browser}",
+                error="Browser not supported"
             )
+        return await browser_func(action, *arguments.values())
 
     # File Operations Implementation
     async def _create_file(self, path: str, content: str = '') -> AutomationResult:
         """Create a new file"""
         try:
             file_path = Path(path)
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(content)
+            await file_transfers.write_text(file_path, content)
             return AutomationResult(
                 success=True,
                 message=f"File created: {path}",
@@ -295,7 +276,7 @@ class SystemAutomation:
         try:
             file_path = Path(path)
             if file_path.exists():
-                file_path.unlink()
+                await file_transfers.unlink(file_path)
                 return AutomationResult(
                     success=True,
                     message=f"File deleted: {path}"
@@ -313,19 +294,16 @@ class SystemAutomation:
                 error=str(e)
             )
 
-    async def _move_file(self, source: str, destination: str) -> AutomationResult:
-        """Move a file"""
+    async def _move_file(self, source: str, destination: str, background: bool = False) -> AutomationResult:
+        """Move a file (a rename, or a chunked copy and unlink across devices)"""
         try:
             source_path = Path(source)
-            dest_path = Path(destination)
 
             if source_path.exists():
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                source_path.rename(dest_path)
-                return AutomationResult(
-                    success=True,
-                    message=f"File moved: {source} -> {destination}",
-                    data={'source': source, 'destination': destination}
+                job = file_transfers.start_move(source_path, Path(destination))
+                return await self._file_job_result(
+                    job, background, f"File moved: {source} -> {destination}",
+                    f"Failed to move file: {source} -> {destination}"
                 )
             else:
                 return AutomationResult(
@@ -340,20 +318,16 @@ class SystemAutomation:
                 error=str(e)
             )
 
-    async def _copy_file(self, source: str, destination: str) -> AutomationResult:
+    async def _copy_file(self, source: str, destination: str, background: bool = False) -> AutomationResult:
         """Copy a file"""
         try:
             source_path = Path(source)
-            dest_path = Path(destination)
 
             if source_path.exists():
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                import shutil
-                shutil.copy2(source_path, dest_path)
-                return AutomationResult(
-                    success=True,
-                    message=f"File copied: {source} -> {destination}",
-                    data={'source': source, 'destination': destination}
+                job = file_transfers.start_copy(source_path, Path(destination))
+                return await self._file_job_result(
+                    job, background, f"File copied: {source} -> {destination}",
+                    f"Failed to copy file: {source} -> {destination}"
                 )
             else:
                 return AutomationResult(
@@ -368,23 +342,63 @@ class SystemAutomation:
                 error=str(e)
             )
 
-    async def _list_files(self, path: str) -> AutomationResult:
-        """List files in a directory"""
+    async def _file_job_result(self, job: FileJob, background: bool, message: str,
+                               failure_message: str) -> AutomationResult:
+        """Return a started job's ID at once, or wait for the job and report its outcome"""
+        if background:
+            return AutomationResult(
+                success=True,
+                message=f"Started {job.operation}: {job.source} -> {job.destination}",
+                data=job.to_dict()
+            )
+        await file_transfers.wait(job)
+        if job.status == 'completed':
+            return AutomationResult(success=True, message=message, data=job.to_dict())
+        return AutomationResult(
+            success=False,
+            message=failure_message,
+            error=job.error or f"{job.operation} {job.status}",
+            data=job.to_dict()
+        )
+
+    async def _file_job_status(self, job_id: str) -> AutomationResult:
+        """Report the progress of a copy or move"""
+        job = file_transfers.get_job(job_id)
+        if job is None:
+            return AutomationResult(
+                success=False,
+                message=f"File job not found: {job_id}",
+                error="Unknown or expired job ID"
+            )
+        return AutomationResult(
+            success=True,
+            message=f"{job.operation} {job.status}: {job.progress:.0%}",
+            data=job.to_dict()
+        )
+
+    async def _list_files(self, path: str = '.', sort: str = 'name', reverse: bool = False,
+                          pattern: Optional[str] = None, kind: Optional[str] = None,
+                          limit: int = LISTING_PAGE_SIZE, cursor: Optional[str] = None) -> AutomationResult:
+        """
+        List one page of a directory; pass next_cursor back for the next page
+
+        With sort='none' every page rescans the directory up to the previous
+        page's last entry, so deep pages of a huge directory get slower.
+        """
         try:
             dir_path = Path(path)
             if dir_path.exists() and dir_path.is_dir():
-                files = []
-                for item in dir_path.iterdir():
-                    files.append({
-                        'name': item.name,
-                        'type': 'file' if item.is_file() else 'directory',
-                        'size': item.stat().st_size if item.is_file() else None,
-                        'modified': item.stat().st_mtime
-                    })
+                options = ListingOptions(sort=sort, reverse=reverse, pattern=pattern, kind=kind)
+                page = await file_transfers.run(list_directory, str(dir_path), options, cursor, limit)
                 return AutomationResult(
                     success=True,
                     message=f"Files listed: {path}",
-                    data={'files': files, 'path': path}
+                    data={
+                        'files': page.entries,
+                        'path': path,
+                        'next_cursor': page.next_cursor,
+                        'total': page.total
+                    }
                 )
             else:
                 return AutomationResult(
@@ -440,16 +454,16 @@ class SystemAutomation:
 
             if app_path:
                 if self.os_type == 'darwin':  # macOS
-                    subprocess.Popen(['open', app_path])
+                    pid = await command_runner.spawn(['open', app_path])
                 elif self.os_type == 'windows':
-                    subprocess.Popen([app_path])
+                    pid = await command_runner.spawn([app_path])
                 else:  # Linux
-                    subprocess.Popen([app_name])
+                    pid = await command_runner.spawn([app_name])
 
                 return AutomationResult(
                     success=True,
                     message=f"Application launched: {app_name}",
-                    data={'app': app_name}
+                    data={'app': app_name, 'pid': pid}
                 )
             else:
                 return AutomationResult(
@@ -468,16 +482,14 @@ class SystemAutomation:
         """Close an application"""
         try:
             if self.os_type == 'darwin':  # macOS
-                subprocess.run(['pkill', '-f', app_name])
+                result = await command_runner.run(['pkill', '-f', app_name])
             elif self.os_type == 'windows':
-                subprocess.run(['taskkill', '/IM', f'{app_name}.exe', '/F'])
+                result = await command_runner.run(['taskkill', '/IM', f'{app_name}.exe', '/F'])
             else:  # Linux
-                subprocess.run(['pkill', app_name])
+                result = await command_runner.run(['pkill', app_name])
 
-            return AutomationResult(
-                success=True,
-                message=f"Application closed: {app_name}",
-                data={'app': app_name}
+            return self._command_result(
+                result, f"Application closed: {app_name}", f"Failed to close app: {app_name}", {'app': app_name}
             )
         except Exception as e:
             return AutomationResult(
@@ -490,15 +502,13 @@ class SystemAutomation:
         """Focus an application"""
         try:
             if self.os_type == 'darwin':  # macOS
-                subprocess.run(['osascript', '-e', f'tell application "{app_name}" to activate'])
+                result = await command_runner.run(['osascript', '-e', f'tell application "{app_name}" to activate'])
             else:
                 # For Windows/Linux, we'll just launch the app
                 return await self._launch_app(app_name)
 
-            return AutomationResult(
-                success=True,
-                message=f"Application focused: {app_name}",
-                data={'app': app_name}
+            return self._command_result(
+                result, f"Application focused: {app_name}", f"Failed to focus app: {app_name}", {'app': app_name}
             )
         except Exception as e:
             return AutomationResult(
@@ -511,22 +521,20 @@ class SystemAutomation:
         """List running applications"""
         try:
             if self.os_type == 'darwin':  # macOS
-                result = subprocess.run(['ps', 'ax'], capture_output=True, text=True)
+                result = await command_runner.run(['ps', 'ax'])
                 apps = []
                 for line in result.stdout.split('\n'):
                     if '.app' in line:
                         apps.append(line.strip())
             elif self.os_type == 'windows':
-                result = subprocess.run(['tasklist'], capture_output=True, text=True)
+                result = await command_runner.run(['tasklist'])
                 apps = result.stdout.split('\n')
             else:  # Linux
-                result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
+                result = await command_runner.run(['ps', 'aux'])
                 apps = result.stdout.split('\n')
 
-            return AutomationResult(
-                success=True,
-                message="Running applications listed",
-                data={'apps': apps}
+            return self._command_result(
+                result, "Running applications listed", "Failed to list running apps", {'apps': apps}
             )
         except Exception as e:
             return AutomationResult(
@@ -540,15 +548,14 @@ class SystemAutomation:
         """Increase system volume"""
         try:
             if self.os_type == 'darwin':  # macOS
-                subprocess.run(['osascript', '-e', f'set volume output volume (output volume of (get volume settings) + {amount})'])
+                result = await command_runner.run(['osascript', '-e', f'set volume output volume (output volume of (get volume settings) + {amount})'])
             else:
                 # Use amixer for Linux or other methods for Windows
-                subprocess.run(['amixer', 'set', 'Master', f'{amount}%+'])
+                result = await command_runner.run(['amixer', 'set', 'Master', f'{amount}%+'])
 
-            return AutomationResult(
-                success=True,
-                message=f"Volume increased by {amount}%",
-                data={'action': 'volume_up', 'amount': amount}
+            return self._command_result(
+                result, f"Volume increased by {amount}%", "Failed to increase volume",
+                {'action': 'volume_up', 'amount': amount}
             )
         except Exception as e:
             return AutomationResult(
@@ -561,14 +568,13 @@ class SystemAutomation:
         """Decrease system volume"""
         try:
             if self.os_type == 'darwin':  # macOS
-                subprocess.run(['osascript', '-e', f'set volume output volume (output volume of (get volume settings) - {amount})'])
+                result = await command_runner.run(['osascript', '-e', f'set volume output volume (output volume of (get volume settings) - {amount})'])
             else:
-                subprocess.run(['amixer', 'set', 'Master', f'{amount}%-'])
+                result = await command_runner.run(['amixer', 'set', 'Master', f'{amount}%-'])
 
-            return AutomationResult(
-                success=True,
-                message=f"Volume decreased by {amount}%",
-                data={'action': 'volume_down', 'amount': amount}
+            return self._command_result(
+                result, f"Volume decreased by {amount}%", "Failed to decrease volume",
+                {'action': 'volume_down', 'amount': amount}
             )
         except Exception as e:
             return AutomationResult(
@@ -581,14 +587,13 @@ class SystemAutomation:
         """Mute system audio"""
         try:
             if self.os_type == 'darwin':  # macOS
-                subprocess.run(['osascript', '-e', 'set volume output muted true'])
+                result = await command_runner.run(['osascript', '-e', 'set volume output muted true'])
             else:
-                subprocess.run(['amixer', 'set', 'Master', 'mute'])
+                result = await command_runner.run(['amixer', 'set', 'Master', 'mute'])
 
-            return AutomationResult(
-                success=True,
-                message="Audio muted",
-                data={'action': 'mute'}
+            return self._command_result(
+                result, "Audio muted", "Failed to mute audio",
+                {'action': 'mute'}
             )
         except Exception as e:
             return AutomationResult(
@@ -601,14 +606,13 @@ class SystemAutomation:
         """Unmute system audio"""
         try:
             if self.os_type == 'darwin':  # macOS
-                subprocess.run(['osascript', '-e', 'set volume output muted false'])
+                result = await command_runner.run(['osascript', '-e', 'set volume output muted false'])
             else:
-                subprocess.run(['amixer', 'set', 'Master', 'unmute'])
+                result = await command_runner.run(['amixer', 'set', 'Master', 'unmute'])
 
-            return AutomationResult(
-                success=True,
-                message="Audio unmuted",
-                data={'action': 'unmute'}
+            return self._command_result(
+                result, "Audio unmuted", "Failed to unmute audio",
+                {'action': 'unmute'}
             )
         except Exception as e:
             return AutomationResult(
@@ -618,18 +622,12 @@ class SystemAutomation:
             )
 
     async def _brightness_up(self, amount: int = 10) -> AutomationResult:
-        """Increase screen brightness"""
+        """Increase screen brightness (registered for macOS only)"""
         try:
-            if self.os_type == 'darwin':  # macOS
-                subprocess.run(['osascript', '-e', f'tell application "System Events" to key code 144'])
-            else:
-                # Use xrandr for Linux or other methods
-                pass
-
-            return AutomationResult(
-                success=True,
-                message=f"Brightness increased by {amount}%",
-                data={'action': 'brightness_up', 'amount': amount}
+            result = await command_runner.run(['osascript', '-e', 'tell application "System Events" to key code 144'])
+            return self._command_result(
+                result, f"Brightness increased by {amount}%", "Failed to increase brightness",
+                {'action': 'brightness_up', 'amount': amount}
             )
         except Exception as e:
             return AutomationResult(
@@ -639,18 +637,12 @@ class SystemAutomation:
             )
 
     async def _brightness_down(self, amount: int = 10) -> AutomationResult:
-        """Decrease screen brightness"""
+        """Decrease screen brightness (registered for macOS only)"""
         try:
-            if self.os_type == 'darwin':  # macOS
-                subprocess.run(['osascript', '-e', f'tell application "System Events" to key code 145'])
-            else:
-                # Use xrandr for Linux or other methods
-                pass
-
-            return AutomationResult(
-                success=True,
-                message=f"Brightness decreased by {amount}%",
-                data={'action': 'brightness_down', 'amount': amount}
+            result = await command_runner.run(['osascript', '-e', 'tell application "System Events" to key code 145'])
+            return self._command_result(
+                result, f"Brightness decreased by {amount}%", "Failed to decrease brightness",
+                {'action': 'brightness_down', 'amount': amount}
             )
         except Exception as e:
             return AutomationResult(
@@ -659,6 +651,18 @@ class SystemAutomation:
                 error=str(e)
             )
 
+    def _command_result(self, result: CommandResult, message: str, failure_message: str,
+                        data: Optional[Dict[str, Any]] = None) -> AutomationResult:
+        """AutomationResult for a handler's command: success only on a zero exit within the timeout"""
+        return AutomationResult(
+            success=result.ok,
+            message=message if result.ok else failure_message,
+            data=data,
+            error=None if result.ok else result.error_text(),
+            exit_code=result.exit_code,
+            command_duration=result.duration
+        )
+
     # Browser Automation Implementation (Placeholder)
     async def _chrome_automation(self, action: str, *args) -> AutomationResult:
         """Chrome browser automation"""
@@ -691,13 +695,20 @@ class SystemAutomation:
         """Get list of supported operations"""
         return self.supported_operations
 
+    def describe_operations(self) -> List[Dict[str, Any]]:
+        """Parameter schema, platforms and side effects of each operation available on this OS"""
+        return [spec.to_dict() for spec in self.operations.available(self.os_type)]
+
     async def health_check(self) -> Dict[str, Any]:
         """Check system automation health"""
         return {
             'status': 'healthy',
             'os_type': self.os_type,
             'supported_operations': len(self.supported_operations),
-            'browser_automation': list(self.browser_automation.keys())
+            'operations': len(self.operations.available(self.os_type)),
+            'browser_automation': list(self.browser_automation.keys()),
+            'commands': command_runner.get_stats(),
+            'file_io': file_transfers.get_stats()
         }
 
 # Global system automation instance
@@ -5,21 +5,73 @@ Tests voice processing, system automation, and integrated functionality
 """
 
 import asyncio
+import hashlib
+import io
 import json
 import aiohttp
 import tempfile
 import wave
-import struct
+import time
 import numpy as np
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import sys
 import os
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add the MCP server directory (backend package) and the repository root
+# (samantha_ai_assistant.packages) to Python path
+MCP_SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(MCP_SERVER_DIR)
+sys.path.append(str(Path(MCP_SERVER_DIR).parents[2]))
+
+from backend.audio_decoder import decode_wav_bytes
+from backend.audio_upload import read_audio_upload, AudioUploadTooLargeError
+from backend.voice_processor import voice_processor, VoiceCommand, TranscriptionResult
+from backend.system_automation import system_automation, AutomationResult
+from backend.model_registry import model_registry, ModelRegistry
+from backend.inference_executor import InferenceExecutor, InferenceQueueFullError, InferenceTimeoutError
+from backend.tiered_cache import TieredCache
+from backend.transcription_batcher import TranscriptionBatcher
+from backend.voice_activity import detect_speech
+from backend.audio_normalization import PolyphaseResampler, peak_normalize, resample, to_mono_float32
+from backend.intent_matcher import IntentMatcher
+from backend.quality_tiers import QualityTier, QualityTierPolicy
+from backend.transcription_cache import transcription_cache_key, raw_audio_cache_key
+from backend.language_router import LanguageRoute, LanguageRouter
+from backend.decoder_pool import decoder_pool, DecoderError
+from backend.long_form import plan_chunks, drop_repeated_words, TranscriptSegment
+from backend.speech_confidence import SpeechGate, confidence_from_result
+from backend.streaming_recognizer import StreamingSession
+from backend.wake_word import WakeWordModel, WakeWordDetector
+from backend.command_runner import CommandRunner
+from backend.automation_batch import BatchExecutor, BatchStep
+from backend.file_transfer import FileTransferManager, file_transfers
+from backend.directory_listing import list_directory, stream_directory, stream_directory_ndjson, ListingOptions, InvalidCursorError
+from backend.speech_synthesis import SpeechSynthesizer, SpeechSynthesisError, TTSBackend, register_backend
+from backend.response_audio_cache import ResponseAudioCache
+
+
+class ToneBackend(TTSBackend):
+    """TTS backend for tests: 0.1 s of tone per character, in two chunks"""
+
+    name = 'test-tone'
+    sample_rate = 16000
+
+    def is_available(self) -> bool:
+        return True
+
+    async def stream(self, text, voice=None):
+        if text == 'stall':
+            await asyncio.sleep(5)
+        t = np.arange(int(0.1 * self.sample_rate * len(text.strip('.')))) / self.sample_rate
+        pcm = (0.3 * 32767 * np.sin(2 * np.pi * 220 * t)).astype('<i2').tobytes()
+        if pcm:
+            yield pcm[:len(pcm) // 2]
+            yield pcm[len(pcm) // 2:]
+
+
+register_backend('test-tone', ToneBackend)
 
-from voice_processor import voice_processor, VoiceCommand
-from system_automation import system_automation, AutomationResult
 
 class MCPServerTester:
     """Test suite for MCP Server functionality"""
@@ -86,7 +138,7 @@ class MCPServerTester:
         try:
             health = await voice_processor.health_check()
 
-            required_fields = ['status', 'supported_languages', 'command_patterns', 'ai_api_configured']
+            required_fields = ['status', 'supported_languages', 'command_patterns', 'ai_api_configured', 'model_ready']
             success = all(field in health for field in required_fields)
 
             self.log_test(
@@ -98,6 +150,843 @@ class MCPServerTester:
         except Exception as e:
             self.log_test("Voice Processor Health Check", False, str(e))
 
+    async def test_model_registry_sharing(self):
+        """Test that processors share one registry model and readiness flips after warm-up"""
+        try:
+            was_loaded = model_registry.is_loaded()
+            info = model_registry.warm_up()
+            first = voice_processor.whisper_model
+            second = type(voice_processor)().whisper_model
+
+            success = first is second and model_registry.is_ready()
+            self.log_test(
+                "Model Registry Sharing",
+                success,
+                f"Loaded '{info.model_size}' on {info.device} in {info.load_time:.2f}s "
+                f"(already loaded: {was_loaded})"
+            )
+
+        except Exception as e:
+            self.log_test("Model Registry Sharing", False, str(e))
+
+    async def test_language_routing(self):
+        """Test language routes, and that readiness waits for every routed model"""
+        try:
+            router = LanguageRouter(['en-US', 'en-GB', 'fr-FR', 'ja-JP'], 'base')
+            routed = {
+                code: router.route(code).model_size
+                for code in ('en-US', 'en-AU', 'fr-FR', 'ja-JP', 'xx-XX', None)
+            }
+            large = LanguageRouter(['en-US'], 'large').route('en-US').model_size
+
+            # Warming only the default model must not report the English route ready
+            registry = ModelRegistry()
+            registry.mark_ready(['base'])
+            partly_ready = registry.is_ready(router.model_sizes())
+            missing = registry.get_status(router.model_sizes())['missing_models']
+            registry.mark_ready(['base.en'])
+            fully_ready = registry.is_ready(router.model_sizes()) and registry.get_status(router.model_sizes())['ready']
+
+            # Tier step-downs switch models too; warm-up and readiness must cover them
+            tier_models = QualityTierPolicy(queue_depth=lambda: 0).model_sizes(
+                [router.fallback, *router.routes.values()]
+            )
+            processor_models = voice_processor.model_sizes()
+
+            success = (
+                sorted(tier_models) == ['base', 'base.en', 'tiny', 'tiny.en']
+                and set(processor_models) >= {voice_processor.model_size, 'tiny', 'tiny.en'}
+                and routed == {'en-US': 'base.en', 'en-AU': 'base.en', 'fr-FR': 'base', 'ja-JP': 'base',
+                           'xx-XX': 'base', None: 'base'}
+                and router.route('fr-FR').whisper_language == 'fr' and router.route(None).whisper_language is None
+                and large == 'large'
+                and router.model_sizes() == ['base', 'base.en']
+                and not partly_ready and missing == ['base.en'] and fully_ready
+            )
+
+            self.log_test(
+                "Language Routing",
+                success,
+                f"routes {routed}, warm-up set {processor_models}, missing after default only {missing}"
+            )
+
+        except Exception as e:
+            self.log_test("Language Routing", False, str(e))
+
+    async def test_voice_activity_detection(self):
+        """Test that VAD rejects silence and trims silence around a tone"""
+        try:
+            sample_rate = 16000
+            silence = np.zeros(sample_rate, dtype=np.float32)
+            t = np.arange(sample_rate // 2) / sample_rate
+            tone = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+            rejected = detect_speech(np.concatenate([silence, silence]), sample_rate)
+            trimmed = detect_speech(np.concatenate([silence, tone, silence]), sample_rate)
+
+            success = (not rejected.has_speech and trimmed.has_speech and
+                       len(trimmed.samples) < sample_rate * 2 and trimmed.trimmed_duration > 1.0)
+            self.log_test(
+                "Voice Activity Detection",
+                success,
+                f"Trimmed {trimmed.trimmed_duration:.2f}s, kept {len(trimmed.samples) / sample_rate:.2f}s"
+            )
+
+        except Exception as e:
+            self.log_test("Voice Activity Detection", False, str(e))
+
+    async def test_audio_normalization(self):
+        """Test stereo downmix, chunked vs one-shot resampling and peak normalisation"""
+        try:
+            t = np.arange(44100) / 44100
+            tone = (0.2 * np.sin(2 * np.pi * 440 * t) * 32767).astype('<i2')
+            stereo = np.stack([tone, tone], axis=1).tobytes()
+
+            mono = to_mono_float32(stereo, 1, 16, channels=2)
+            whole = resample(mono, 44100, 16000)
+            resampler = PolyphaseResampler(44100, 16000)
+            chunked = np.concatenate(
+                [resampler.process(mono[i:i + 1000]) for i in range(0, len(mono), 1000)] + [resampler.flush()]
+            )
+            normalized = peak_normalize(whole)
+
+            # Hostile header rates are refused at once instead of building a huge filter
+            start = time.perf_counter()
+            pcm = np.zeros(1600, dtype='<i2').tobytes()
+            refused = all(
+                decode_wav_bytes(self.create_wav_bytes(pcm, sample_rate=rate)) is None
+                for rate in (1000003, 4294967295, 100)
+            )
+            refused_quickly = time.perf_counter() - start < 0.5
+            odd_rate = PolyphaseResampler(44101, 16000)
+
+            success = (len(whole) == 16000 and np.allclose(whole, chunked, atol=1e-6) and
+                       abs(float(np.abs(normalized).max()) - 0.95) < 0.01 and
+                       refused and refused_quickly and odd_rate.down <= 1000)
+            self.log_test(
+                "Audio Normalization",
+                success,
+                f"{len(mono)} stereo frames -> {len(whole)} samples, peak {np.abs(normalized).max():.3f}"
+            )
+
+        except Exception as e:
+            self.log_test("Audio Normalization", False, str(e))
+
+    async def test_wav_decoding(self):
+        """Test in-memory WAV decoding of PCM16, float and extensible headers, and the fallback for anything else"""
+        try:
+            t = np.arange(16000) / 16000
+            signal = (0.25 * np.sin(2 * np.pi * 300 * t)).astype(np.float32)
+            pcm16 = (signal * 32767).astype('<i2')
+
+            pcm = decode_wav_bytes(self.create_wav_bytes(pcm16.tobytes()))
+            pcm_ok = (pcm is not None and pcm.source_format == 'wav/pcm16' and len(pcm.samples) == 16000
+                      and np.allclose(pcm.samples, signal, atol=1e-4))
+
+            t48 = np.arange(48000) / 48000
+            float_wav = self.create_wav_bytes((0.25 * np.sin(2 * np.pi * 300 * t48)).astype('<f4').tobytes(),
+                                              sample_rate=48000, bits=32, format_tag=3)
+            floats = decode_wav_bytes(float_wav)
+            float_ok = (floats is not None and floats.source_format == 'wav/float32'
+                        and floats.source_sample_rate == 48000 and len(floats.samples) == 16000
+                        and np.allclose(floats.samples[100:-100], signal[100:-100], atol=1e-2))
+
+            stereo = np.stack([pcm16, pcm16], axis=1).tobytes()
+            extensible = decode_wav_bytes(self.create_wav_bytes(stereo, channels=2, extensible=True))
+            extensible_ok = (extensible is not None and extensible.source_channels == 2
+                             and extensible.source_format == 'wav/pcm16'
+                             and np.allclose(extensible.samples, signal, atol=1e-4))
+
+            # Truncated headers, other containers and unknown encodings go to ffmpeg instead
+            complete = self.create_wav_bytes(pcm16.tobytes())
+            alaw = self.create_wav_bytes(bytes(1600), bits=8, format_tag=6)
+            fallbacks = [decode_wav_bytes(data) for data in (complete[:30], complete[:12], b'ID3' + bytes(100), alaw)]
+            truncated_upload = await read_audio_upload(self._chunked(complete[:30]))
+            routed_to_ffmpeg = truncated_upload.decoded is None and truncated_upload.spool.source() == complete[:30]
+            truncated_upload.close()
+
+            success = (pcm_ok and float_ok and extensible_ok
+                       and all(result is None for result in fallbacks) and routed_to_ffmpeg)
+            self.log_test(
+                "WAV Decoding",
+                success,
+                f"pcm16 {pcm_ok}, float {float_ok}, extensible {extensible_ok}, "
+                f"fallbacks {[result is None for result in fallbacks]}, truncated upload to ffmpeg {routed_to_ffmpeg}"
+            )
+
+        except Exception as e:
+            self.log_test("WAV Decoding", False, str(e))
+
+    async def _chunked(self, data: bytes, size: int = 7):
+        for offset in range(0, len(data), size):
+            yield data[offset:offset + size]
+
+    async def test_audio_upload(self):
+        """Test streamed uploads: chunked WAV decoding, spooling of other formats and the size limit"""
+        try:
+            consumed = [0]
+
+            async def chunks(data: bytes, size: int):
+                for offset in range(0, len(data), size):
+                    consumed[0] = offset + size
+                    yield data[offset:offset + size]
+
+            t = np.arange(44100) / 44100
+            tone = (0.2 * np.sin(2 * np.pi * 440 * t) * 32767).astype('<i2')
+            wav = self.create_wav_bytes(np.stack([tone, tone], axis=1).tobytes(), sample_rate=44100, channels=2)
+
+            # Odd chunk sizes split the header and frames at arbitrary points
+            upload = await read_audio_upload(chunks(wav, 333))
+            whole = decode_wav_bytes(wav)
+            decoded = (
+                upload.decoded is not None and upload.spool is None
+                and len(upload.decoded.samples) == 16000 and upload.decoded.source_channels == 2
+                and np.allclose(upload.decoded.samples, whole.samples, atol=1e-5)
+                and upload.size == len(wav) and upload.sha256 == hashlib.sha256(wav).hexdigest()
+            )
+            upload.close()
+
+            compressed = b'ID3' + os.urandom(3 * 1024 * 1024)
+            spooled = await read_audio_upload(chunks(compressed, 64 * 1024), spool_memory_bytes=1024 * 1024)
+            spool_path = spooled.spool.path()
+            with open(spool_path, 'rb') as f:
+                spooled_intact = spooled.spool.on_disk and f.read() == compressed
+            spooled.close()
+            small = await read_audio_upload(chunks(b'OggS' + bytes(1000), 100))
+            in_memory = not small.spool.on_disk and small.spool.source() == b'OggS' + bytes(1000)
+            small.close()
+            spool_ok = spooled_intact and not os.path.exists(spool_path) and in_memory
+
+            try:
+                await read_audio_upload(chunks(compressed, 64 * 1024), max_bytes=256 * 1024)
+                limited = False
+            except AudioUploadTooLargeError:
+                # Stops at the chunk that crosses the limit instead of reading the rest
+                limited = consumed[0] <= 256 * 1024 + 64 * 1024
+
+            success = decoded and spool_ok and limited
+            self.log_test(
+                "Audio Upload",
+                success,
+                f"chunked WAV decoded {decoded}, spool {spool_ok}, limit stopped after {consumed[0]} bytes"
+            )
+
+        except Exception as e:
+            self.log_test("Audio Upload", False, str(e))
+
+    async def test_request_size_limit(self):
+        """Test that the size middleware rejects declared and streamed oversized bodies"""
+        try:
+            from backend.middleware import RequestSizeLimitMiddleware
+
+            async def echo_length(scope, receive, send):
+                body = b''
+                while True:
+                    message = await receive()
+                    body += message.get('body', b'')
+                    if not message.get('more_body'):
+                        break
+                await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+                await send({'type': 'http.response.body', 'body': str(len(body)).encode()})
+
+            middleware = RequestSizeLimitMiddleware(echo_length, max_bytes=1000)
+
+            async def request(parts, headers=()):
+                pending = [{'type': 'http.request', 'body': part, 'more_body': index < len(parts) - 1}
+                           for index, part in enumerate(parts)]
+                sent = []
+
+                async def receive():
+                    return pending.pop(0) if pending else {'type': 'http.disconnect'}
+
+                async def send(message):
+                    sent.append(message)
+
+                await middleware({'type': 'http', 'method': 'POST', 'path': '/', 'headers': list(headers)},
+                                 receive, send)
+                return sent[0]['status'], len(pending)
+
+            declared = await request([b'x' * 10], [(b'content-length', b'5000')])
+            streamed = await request([b'x' * 400] * 10)
+            small = await request([b'x' * 400, b'x' * 400])
+
+            # Declared: rejected unread; streamed: cut off once past the limit
+            success = declared == (413, 1) and streamed[0] == 413 and streamed[1] == 7 and small == (200, 0)
+            self.log_test(
+                "Request Size Limit",
+                success,
+                f"declared {declared[0]}, streamed {streamed[0]} with {streamed[1]} chunks unread, small {small[0]}"
+            )
+
+        except Exception as e:
+            self.log_test("Request Size Limit", False, str(e))
+
+    async def test_quality_tiers(self):
+        """Test that the tier policy starts at the baseline tier, steps down under pressure and up only with headroom"""
+        try:
+            now, depth = [0.0], [0]
+            policy = QualityTierPolicy(latency_target=2.0, queue_depth=lambda: depth[0], clock=lambda: now[0])
+            route = LanguageRoute('en-US', 'en', 'base.en')
+            initial = policy.select()
+
+            # Idle without latency samples is not headroom
+            now[0] = 100.0
+            held = policy.select().name
+
+            now[0], depth[0] = 103.0, 3
+            fastest = policy.apply(route)
+
+            depth[0] = 0
+            for _ in range(12):
+                policy.observe(fastest.tier, 0.3)
+            now[0] = 140.0
+            stepped_up = policy.select().name
+            for _ in range(12):
+                policy.observe(stepped_up, 0.3)
+            now[0] = 180.0
+            most_accurate = policy.apply(route)
+
+            configured = QualityTierPolicy(initial_tier='accurate', queue_depth=lambda: 0).current.name
+            no_baseline = QualityTierPolicy([QualityTier('hq', beam_size=5), QualityTier('lo', model_size='tiny')],
+                                            queue_depth=lambda: 0).current.name
+
+            # Tiers decode differently, so they must not share cached transcripts
+            samples = np.zeros(1600, dtype=np.float32)
+            keys = {
+                transcription_cache_key(samples, 'base.en', 'en', tier_route.decode_options())
+                for tier_route in (fastest, most_accurate, policy.tiers[1].apply(route))
+            }
+            raw_keys = {
+                raw_audio_cache_key('0' * 64, 'base.en', 'en', tier_route.decode_options())
+                for tier_route in (most_accurate, policy.tiers[1].apply(route))
+            }
+
+            success = (initial.name == 'balanced' and initial.beam_size is None and held == 'balanced'
+                       and fastest.tier == 'fast' and fastest.model_size == 'tiny.en'
+                       and fastest.decode_options().get('temperature') == 0.0
+                       and stepped_up == 'balanced' and most_accurate.tier == 'accurate'
+                       and most_accurate.decode_options().get('beam_size') == 5
+                       and configured == 'accurate' and no_baseline == 'hq'
+                       and len(keys) == 3 and len(raw_keys) == 2)
+            self.log_test(
+                "Quality Tiers",
+                success,
+                f"{initial.name} -> {fastest.tier} -> {stepped_up} -> {most_accurate.tier}, {len(keys)} cache keys"
+            )
+
+        except Exception as e:
+            self.log_test("Quality Tiers", False, str(e))
+
+    async def test_decoder_pool(self):
+        """Test that pooled decoder workers decode audio, reject garbage and pass health checks"""
+        try:
+            if not decoder_pool.enabled:
+                self.log_test("Decoder Pool", True, "Skipped: neither PyAV nor ffmpeg is installed")
+                return
+
+            decoded = await decoder_pool.decode(self.create_test_audio())
+            try:
+                await decoder_pool.decode(b'not audio at all')
+                rejected = False
+            except DecoderError:
+                rejected = True
+            restarted = await decoder_pool.health_check()
+
+            success = abs(decoded.duration - 2.0) < 0.1 and rejected and restarted == 0
+            self.log_test(
+                "Decoder Pool",
+                success,
+                f"Decoded {decoded.duration:.2f}s via {decoded.source_format}, stats: {decoder_pool.get_stats()}"
+            )
+
+        except Exception as e:
+            self.log_test("Decoder Pool", False, str(e))
+
+    async def test_long_form_chunking(self):
+        """Test that long recordings are cut at pauses, with overlap only where no pause exists"""
+        try:
+            rate = 16000
+            rng = np.random.default_rng(7)
+            # 25s of speech, a 0.5s pause, then 50s of speech with no pause
+            speech = lambda seconds: (0.3 * rng.standard_normal(int(seconds * rate))).astype(np.float32)
+            pause = (0.001 * rng.standard_normal(rate // 2)).astype(np.float32)
+            samples = np.concatenate([speech(25.0), pause, speech(50.0)])
+
+            chunks = plan_chunks(samples, rate)
+            first_cut = chunks[0].end / rate
+            covered = chunks[0].start == 0 and chunks[-1].end == len(samples) and \
+                all(b.start == a.end - b.overlap for a, b in zip(chunks, chunks[1:]))
+            cut_at_pause = 25.0 <= first_cut <= 25.5 and chunks[1].overlap == 0
+            overlapped = any(chunk.overlap for chunk in chunks[2:])
+            bounded = all(chunk.end - chunk.start <= 30 * rate for chunk in chunks)
+
+            deduplicated = drop_repeated_words(
+                ['turn', 'on', 'the', 'lights'], [TranscriptSegment(29.0, 31.0, "the lights, please")]
+            )
+            dedup_ok = [segment.text for segment in deduplicated] == ['please']
+
+            success = covered and cut_at_pause and overlapped and bounded and dedup_ok
+            self.log_test(
+                "Long-form Chunking",
+                success,
+                f"{len(chunks)} chunks, first cut at {first_cut:.2f}s, dedup: {[s.text for s in deduplicated]}"
+            )
+
+        except Exception as e:
+            self.log_test("Long-form Chunking", False, str(e))
+
+    async def test_speech_gate(self):
+        """Test that noise-like Whisper statistics stop the pipeline before intent and response"""
+        try:
+            noise = confidence_from_result({'segments': [
+                {'start': 0.0, 'end': 1.0, 'no_speech_prob': 0.92, 'avg_logprob': -1.4},
+                {'start': 1.0, 'end': 3.0, 'no_speech_prob': 0.80, 'avg_logprob': -1.1},
+            ]})
+            speech = confidence_from_result({'no_speech_prob': 0.02, 'avg_logprob': -0.2})
+            mumble = confidence_from_result({'no_speech_prob': 0.3, 'avg_logprob': -2.5})
+
+            gate = SpeechGate(enabled=True)
+            reasons = [gate.reason(noise), gate.reason(speech), gate.reason(mumble), gate.reason(None)]
+
+            command = await voice_processor.process_transcription(
+                TranscriptionResult(text='Thank you for watching.', decode_path='in_memory', acoustic=noise)
+            )
+            response = await voice_processor.generate_response(command)
+
+            success = reasons == ['no_speech', None, 'low_confidence', None] and \
+                command.intent == 'no_speech' and command.confidence == 0.0 and \
+                response.text == '' and response.audio_data is None and \
+                abs(noise.no_speech_prob - (0.92 + 2 * 0.80) / 3) < 1e-9 and speech.confidence > 0.75
+            self.log_test(
+                "Speech Gate",
+                success,
+                f"Reasons: {reasons}, noise confidence {noise.confidence:.3f}, "
+                f"speech confidence {speech.confidence:.3f}, gated intent: {command.no_speech_reason}"
+            )
+
+        except Exception as e:
+            self.log_test("Speech Gate", False, str(e))
+
+    def create_wav_bytes(self, payload: bytes, sample_rate: int = 16000, channels: int = 1, bits: int = 16,
+                         format_tag: int = 1, extensible: bool = False) -> bytes:
+        """Build a WAV container by hand (any rate, float and WAVE_FORMAT_EXTENSIBLE headers)"""
+        def le(value: int, size: int) -> bytes:
+            return value.to_bytes(size, 'little')
+
+        block_align = channels * bits // 8
+        fmt = (le(0xFFFE if extensible else format_tag, 2) + le(channels, 2) + le(sample_rate, 4) +
+               le(sample_rate * block_align & 0xFFFFFFFF, 4) + le(block_align, 2) + le(bits, 2))
+        if extensible:
+            # cbSize, valid bits, channel mask, then the SubFormat GUID led by the real format tag
+            fmt += le(22, 2) + le(bits, 2) + le(0, 4) + le(format_tag, 2) + bytes.fromhex('000000001000800000aa00389b71')
+        body = b'WAVE' + b'fmt ' + le(len(fmt), 4) + fmt + b'data' + le(len(payload), 4) + payload
+        return b'RIFF' + le(len(body), 4) + body
+
+    def create_test_word(self, formants, syllable_seconds: float = 0.2, pitch: float = 140.0) -> np.ndarray:
+        """A voiced 'word': one harmonic syllable per formant triple, at 16 kHz"""
+        sample_rate = 16000
+        syllables = []
+        for syllable_formants in formants:
+            t = np.arange(int(syllable_seconds * sample_rate)) / sample_rate
+            syllable = sum(
+                sum(np.exp(-((h * pitch - f) / 120.0) ** 2) for f in syllable_formants) *
+                np.sin(2 * np.pi * h * pitch * t)
+                for h in range(1, int(7500 / pitch))
+            )
+            syllables.append(syllable * np.sin(np.pi * t / syllable_seconds) ** 0.6)
+        word = np.concatenate(syllables)
+        return (0.3 * word / np.abs(word).max()).astype(np.float32)
+
+    async def test_wake_word(self):
+        """Test that the wake word detector fires once, on the wake word only, and idles in silence"""
+        try:
+            rng = np.random.default_rng(5)
+            silence = lambda seconds: (0.002 * rng.standard_normal(int(seconds * 16000))).astype(np.float32)
+            samantha = [(700, 1200, 2600), (650, 1700, 2500), (400, 2000, 2800)]
+            other = [(300, 2300, 3000), (750, 1100, 2500)]
+
+            model = WakeWordModel(directory=None)
+            for pitch in (130.0, 150.0):
+                model.enroll(np.concatenate([silence(0.3), self.create_test_word(samantha, pitch=pitch), silence(0.3)]),
+                             save=False)
+
+            stream = np.concatenate([
+                silence(2.0), self.create_test_word(other), silence(0.5),
+                self.create_test_word(samantha, syllable_seconds=0.22, pitch=140.0), silence(0.05),
+                self.create_test_word(other), silence(1.5)
+            ])
+            detector = WakeWordDetector(model)
+            detections, checks_in_silence = [], None
+            for start in range(0, len(stream), 320):
+                detection = detector.process(stream[start:start + 320])
+                if detection is not None:
+                    detections.append(detection)
+                if start + 320 == 32000:
+                    checks_in_silence = detector.get_stats()['checks']
+
+            # A chunk longer than the ring, arriving at an unaligned position, must keep time order
+            ring = WakeWordDetector(model)
+            size = len(ring._ring)
+            ramp = np.arange(2 * size + 1234, dtype=np.float32)
+            ring._append(ramp[:777])
+            ring._append(ramp[777:777 + size + 500])
+            long_chunk_ordered = np.array_equal(ring._recent(), ramp[777 + 500:777 + size + 500])
+            ring._append(ramp[777 + size + 500:])
+            ring_ordered = long_chunk_ordered and np.array_equal(ring._recent(), ramp[-size:])
+
+            word_end = 2.0 + 0.4 + 0.5 + 0.66
+            success = len(detections) == 1 and abs(detections[0].at_seconds - word_end) < 0.1 and \
+                len(detections[0].trailing) > 0 and checks_in_silence == 0 and ring_ordered
+            self.log_test(
+                "Wake Word",
+                success,
+                f"Detections: {[(round(d.at_seconds, 2), round(d.score, 2)) for d in detections]}, "
+                f"stats: {detector.get_stats()}, ring in order: {ring_ordered}"
+            )
+
+        except Exception as e:
+            self.log_test("Wake Word", False, str(e))
+
+    async def test_transcription_batching(self):
+        """Test that concurrent clips share batches per decoding options, each gets its own result, and failures reach every clip"""
+        try:
+            class RecordingExecutor:
+                model_size = 'base'
+
+                def __init__(self):
+                    self.batches = []
+
+                async def decode_batch(self, arrays, options, model_size=None):
+                    self.batches.append((len(arrays), options.get('language'), options.get('beam_size'), model_size))
+                    await asyncio.sleep(0.01)
+                    if options.get('language') == 'xx':
+                        raise RuntimeError('decoder failed')
+                    return [{'text': str(len(audio))} for audio in arrays]
+
+            executor = RecordingExecutor()
+            batcher = TranscriptionBatcher(executor, max_batch_size=4, max_wait_ms=20)
+            clips = [np.zeros(1000 + index, dtype=np.float32) for index in range(6)]
+            results = await asyncio.gather(
+                *(batcher.transcribe(clip, {'language': 'en'}) for clip in clips[:5]),
+                batcher.transcribe(clips[5], {'language': 'fr'}),
+                batcher.transcribe(clips[0], {'language': 'xx'}),
+                batcher.transcribe(clips[1], {'language': 'en', 'beam_size': 5}, model_size='base.en'),
+                return_exceptions=True
+            )
+            own_results = [result['text'] for result in results[:6]] == [str(len(clip)) for clip in clips]
+            failed = isinstance(results[6], RuntimeError)
+            # A full batch leaves at once; the rest wait for the timer, one batch per model and options
+            batched = sorted(executor.batches, key=str) == sorted([
+                (4, 'en', None, 'base'), (1, 'en', None, 'base'), (1, 'fr', None, 'base'),
+                (1, 'xx', None, 'base'), (1, 'en', 5, 'base.en')
+            ], key=str) and results[7]['text'] == str(len(clips[1]))
+            stats = batcher.get_stats()
+            window = batcher.accepts(np.zeros(30 * 16000)) and not batcher.accepts(np.zeros(31 * 16000))
+
+            success = own_results and failed and batched and stats['running'] == 0 and stats['clips'] == 8 and window
+            self.log_test(
+                "Transcription Batching",
+                success,
+                f"batches {executor.batches}, avg size {stats['avg_batch_size']:.2f}, failure reached caller {failed}"
+            )
+
+        except Exception as e:
+            self.log_test("Transcription Batching", False, str(e))
+
+    async def test_tiered_cache(self):
+        """Test the tiered cache: coalesced misses, leader cancellation, disk promotion and memory eviction"""
+        try:
+            calls = []
+
+            async def compute():
+                calls.append(1)
+                await asyncio.sleep(0.05)
+                return b'value'
+
+            cache = TieredCache('test', max_memory_bytes=1024)
+            results = await asyncio.gather(*(cache.get_or_compute('key', compute) for _ in range(5)))
+            sources = sorted(source for _, source in results)
+            coalesced = (
+                len(calls) == 1 and all(value == b'value' for value, _ in results)
+                and sources == ['coalesced'] * 4 + ['computed']
+            )
+            memory_hit = (await cache.get_or_compute('key', compute))[1] == 'memory'
+
+            # Cancelling the computing caller must not fail the callers waiting on it
+            calls.clear()
+            leader = asyncio.create_task(cache.get_or_compute('other', compute))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(cache.get_or_compute('other', compute))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            value, _ = await follower
+            follower_survived = leader.cancelled() and value == b'value' and len(calls) == 2
+
+            with tempfile.TemporaryDirectory() as tmp:
+                await TieredCache('test', 1024, tmp, max_disk_bytes=4096).put('stored', b'on disk')
+                fresh = TieredCache('test', 1024, tmp, max_disk_bytes=4096)
+                from_disk = await fresh.get_or_compute('stored', compute)
+                promoted = await fresh.get_or_compute('stored', compute)
+            promotion = from_disk == (b'on disk', 'disk') and promoted == (b'on disk', 'memory')
+
+            small = TieredCache('test', max_memory_bytes=10)
+            for key in ('a', 'b', 'c'):
+                await small.put(key, b'12345')
+            evicted = await small.get('a') is None and await small.get('c') == b'12345'
+
+            success = coalesced and memory_hit and follower_survived and promotion and evicted
+
+            self.log_test(
+                "Tiered Cache",
+                success,
+                f"sources {sources}, follower survived {follower_survived}, "
+                f"promotion {promotion}, stats {small.get_stats()}"
+            )
+
+        except Exception as e:
+            self.log_test("Tiered Cache", False, str(e))
+
+    async def test_inference_worker_recovery(self):
+        """Test that a crashed inference worker is replaced instead of failing every later job"""
+        executor = InferenceExecutor(max_workers=1, max_queue=2, timeout=60)
+        try:
+            try:
+                await executor.submit(os._exit, 1)
+                crashed = False
+            except BrokenProcessPool:
+                crashed = True
+            pid = await executor.submit(os.getpid)
+
+            success = crashed and pid != os.getpid() and executor.get_stats()['restarts'] == 1
+            self.log_test(
+                "Inference Worker Recovery",
+                success,
+                f"crash surfaced: {crashed}, restarts: {executor.get_stats()['restarts']}"
+            )
+
+        except Exception as e:
+            self.log_test("Inference Worker Recovery", False, str(e))
+        finally:
+            executor.shutdown()
+
+    async def test_streaming_session_close(self):
+        """Test that closing a stream cancels every background finalisation, not just the last"""
+        try:
+            async def send(message):
+                pass
+
+            session = StreamingSession(send)
+            finalizing = []
+
+            async def slow_finalize():
+                finalizing.append(asyncio.current_task())
+                await asyncio.sleep(10)
+
+            session.finalize = slow_finalize
+            t = np.arange(int(0.25 * 16000)) / 16000
+            speech = (0.5 * 32767 * np.sin(2 * np.pi * 220 * t)).astype('<i2').tobytes()
+            silence = np.zeros(int(0.7 * 16000), dtype='<i2').tobytes()
+            await session.feed(speech)
+            # finalize is stubbed and never resets, so each silent frame ends the
+            # utterance again while the previous finalisation is still pending
+            await session.feed(silence)
+            await session.feed(silence)
+            await asyncio.sleep(0)
+
+            start = time.perf_counter()
+            await asyncio.wait_for(session.close(), timeout=2)
+            elapsed = time.perf_counter() - start
+
+            success = len(finalizing) == 2 and all(task.cancelled() for task in finalizing)
+            self.log_test(
+                "Streaming Session Close",
+                success,
+                f"{len(finalizing)} finalisations, all cancelled: "
+                f"{all(task.cancelled() for task in finalizing)}, closed in {elapsed * 1000:.1f}ms"
+            )
+
+        except Exception as e:
+            self.log_test("Streaming Session Close", False, str(e))
+
+    async def test_inference_worker_broadcast(self):
+        """Test that a broadcast job reaches every worker process, not just the fastest one"""
+        executor = InferenceExecutor(max_workers=3, max_queue=3, timeout=60)
+        try:
+            answers = await executor.run_on_each_worker(os.getpid)
+
+            success = len(answers) == 3 and all(pid == result for pid, result in answers.items())
+            self.log_test("Inference Worker Broadcast", success, f"{len(answers)} of 3 workers answered")
+
+        except Exception as e:
+            self.log_test("Inference Worker Broadcast", False, str(e))
+        finally:
+            executor.shutdown()
+
+    async def test_inference_thread_timeout(self):
+        """Test that a timed-out thread-mode job keeps its slot until the thread finishes"""
+        executor = InferenceExecutor(max_workers=0, max_queue=0, timeout=60)
+        try:
+            try:
+                await executor.submit(time.sleep, 0.3, timeout=0.05)
+                timed_out = False
+            except InferenceTimeoutError:
+                timed_out = True
+            held = executor.get_stats()['active_jobs']
+            try:
+                await executor.submit(time.sleep, 0)
+                rejected = False
+            except InferenceQueueFullError:
+                rejected = True
+            await asyncio.sleep(0.5)
+            released = executor.get_stats()['active_jobs']
+
+            success = timed_out and held == 1 and rejected and released == 0
+            self.log_test(
+                "Inference Thread Timeout",
+                success,
+                f"timed out: {timed_out}, slot held: {held}, second job rejected: {rejected}, released: {released == 0}"
+            )
+
+        except Exception as e:
+            self.log_test("Inference Thread Timeout", False, str(e))
+        finally:
+            executor.shutdown()
+
+    async def test_intent_matcher(self):
+        """Test that the compiled matcher finds overlapping phrases with positions"""
+        try:
+            matcher = IntentMatcher({'navigate': ['open', 'go to'], 'files': ['open file', 'file']})
+            matches = matcher.find_all("open file then go to it")
+            found = {(m.label, m.pattern, m.start, m.end) for m in matches}
+            expected = {('navigate', 'open', 0, 4), ('files', 'open file', 0, 9),
+                        ('files', 'file', 5, 9), ('navigate', 'go to', 15, 20)}
+
+            matcher.reload({'media': ['play']})
+            reloaded = matcher.hits_by_label("play the open file")
+
+            success = found == expected and reloaded == {'media': {'play'}}
+            self.log_test("Intent Matcher", success, f"Found {len(matches)} matches, reloaded {reloaded}")
+
+        except Exception as e:
+            self.log_test("Intent Matcher", False, str(e))
+
+    async def test_entity_extraction(self):
+        """Test gazetteer entities: spans, word boundaries and spoken forms"""
+        try:
+            text = "Open Google Chrome, check email, go to github dot com and save notes.txt"
+            entities = [(e.type, e.value, e.start) for e in voice_processor.extract_entities(text)]
+            expected = [('app', 'chrome', 5), ('url', 'https://www.github.com', 39), ('file_type', '.txt', 68)]
+
+            success = entities == expected
+            self.log_test("Entity Extraction", success, f"Entities: {entities}")
+
+        except Exception as e:
+            self.log_test("Entity Extraction", False, str(e))
+
+    async def test_classify_batch(self):
+        """Test batch intent classification agrees with single-text extraction"""
+        try:
+            texts = ["Launch Spotify", "scroll down the page", "tell me about jupiter", "go to github dot com"]
+            results = voice_processor.classify_batch(texts)
+            singles = [(await voice_processor._extract_intent(text))[0] for text in texts]
+
+            success = [result['intent'] for result in results] == singles and 'unknown' not in singles
+            self.log_test("Classify Batch", success, f"Intents: {singles}")
+
+        except Exception as e:
+            self.log_test("Classify Batch", False, str(e))
+
+    async def test_speech_synthesis(self):
+        """Test synthesis to WAV, the synthesis timeout, and tts_start/tts_end framing of streamed replies"""
+        try:
+            synthesizer = SpeechSynthesizer('test-tone', timeout=0.2)
+            speech = await synthesizer.synthesize('hello')
+            with wave.open(io.BytesIO(speech.audio_data)) as wav_file:
+                wav_ok = (wav_file.getframerate() == 16000 and wav_file.getnchannels() == 1
+                          and wav_file.getnframes() == 8000 and abs(speech.duration - 0.5) < 1e-6)
+
+            try:
+                await synthesizer.synthesize('stall')
+                timed_out = False
+            except SpeechSynthesisError:
+                timed_out = synthesizer.get_stats()['failures'] == 1
+
+            cache = ResponseAudioCache(synthesizer, max_memory_bytes=1024 * 1024, disk_dir=None)
+
+            async def converse(text, speaker=cache):
+                messages = []
+
+                async def send_json(message):
+                    messages.append(message)
+
+                async def send_bytes(chunk):
+                    messages.append(chunk)
+
+                await speaker.send_speech(send_json, send_bytes, text)
+                return messages
+
+            streamed = await converse('hello')
+            replayed = await converse('hello')
+            pcm = b''.join(message for message in streamed if isinstance(message, bytes))
+            framed = (
+                streamed[0] == {"type": "tts_start", "format": "s16le", "channels": 1, "sample_rate": 16000}
+                and streamed[-1] == {"type": "tts_end", "duration": 0.5}
+                and pcm == speech.audio_data[44:]
+                and b''.join(message for message in replayed if isinstance(message, bytes)) == pcm
+                and replayed[-1] == streamed[-1] and cache.get_stats()['memory_hits'] == 1
+            )
+
+            # No audio still gets a start/end pair; no backend gets an error only
+            silent = await converse('.')
+            unavailable = await converse('hello', ResponseAudioCache(SpeechSynthesizer('no-such-backend'), disk_dir=None))
+            edge_cases = (
+                [message['type'] for message in silent] == ['tts_start', 'tts_end'] and silent[-1]['duration'] == 0
+                and [message['type'] for message in unavailable] == ['error']
+            )
+
+            success = wav_ok and timed_out and framed and edge_cases
+            self.log_test(
+                "Speech Synthesis",
+                success,
+                f"{speech.duration:.2f}s WAV, timeout {timed_out}, streamed {len(pcm)} bytes, "
+                f"silent reply {[message['type'] for message in silent]}"
+            )
+
+        except Exception as e:
+            self.log_test("Speech Synthesis", False, str(e))
+
+    async def test_response_audio_cache(self):
+        """Test reply pre-rendering: warm-up fills the cache, repeats are hits, and disk entries survive a restart"""
+        try:
+            synthesizer = SpeechSynthesizer('test-tone')
+            with tempfile.TemporaryDirectory() as tmp:
+                cache = ResponseAudioCache(synthesizer, max_memory_bytes=1024 * 1024, disk_dir=tmp)
+                first = await cache.warm_up(['Opening Safari', 'Done', 'Done'])
+                second = await cache.warm_up(['Opening Safari', 'Done', 'Volume up'])
+                speech, source = await cache.get_or_synthesize('Done')
+                requests_after_warm_up = synthesizer.get_stats()['requests']
+
+                # Another voice is another entry; a new process finds the rendered replies on disk
+                _, other_voice = await cache.get_or_synthesize('Done', voice='fr')
+                restarted = ResponseAudioCache(synthesizer, max_memory_bytes=1024 * 1024, disk_dir=tmp)
+                _, after_restart = await restarted.get_or_synthesize('Opening Safari')
+
+            success = (
+                first['rendered'] == 2 and first['failed'] == 0
+                and second['rendered'] == 3 and second['cached'] == 2
+                and source == 'memory' and abs(speech.duration - 0.4) < 1e-6
+                and requests_after_warm_up == 3
+                and other_voice == 'computed' and after_restart == 'disk'
+            )
+            self.log_test(
+                "Response Audio Cache",
+                success,
+                f"warm-up {first} then {second}, repeat from {source}, after restart from {after_restart}"
+            )
+
+        except Exception as e:
+            self.log_test("Response Audio Cache", False, str(e))
+
     async def test_system_automation_health(self):
         """Test system automation health check"""
         try:
@@ -181,6 +1070,146 @@ class MCPServerTester:
         except Exception as e:
             self.log_test("System Automation Operations", False, str(e))
 
+    async def test_operation_registry(self):
+        """Test registry dispatch: listing matches dispatch names, parameter validation and error reporting"""
+        try:
+            automation = system_automation
+            listed = [name for names in automation.get_supported_operations().values() for name in names]
+            dispatchable = all(automation.operations.get(name) is not None for name in listed)
+
+            unknown = await automation.execute_command('does_not_exist')
+            missing = await automation.execute_command('file_create', {})
+            coerced = automation.operations.get('system_volume_up').bind({'amount': '5'})
+
+            with tempfile.TemporaryDirectory() as tmp:
+                listing = await automation.execute_command('file_list', {'path': tmp})
+
+            specs = {spec['name']: spec for spec in automation.describe_operations()}
+            read_only = specs['file_list']['mutating'] is False and specs['file_delete']['mutating'] is True
+
+            success = (
+                len(listed) == len(specs)
+                and dispatchable
+                and not unknown.success and 'Unknown command' in unknown.message
+                and not missing.success and 'path' in (missing.error or '')
+                and coerced == {'amount': 5}
+                and listing.success
+                and read_only
+            )
+
+            self.log_test(
+                "Operation Registry",
+                success,
+                f"{len(listed)} operations; unknown={unknown.error}, missing={missing.error}"
+            )
+
+        except Exception as e:
+            self.log_test("Operation Registry", False, str(e))
+
+    async def test_automation_batch(self):
+        """Test batched automation: dependency order, concurrency cap and both failure modes"""
+        try:
+            executor = BatchExecutor(system_automation, max_concurrent=2)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                source = os.path.join(tmp, 'a.txt')
+                copy = os.path.join(tmp, 'b.txt')
+                steps = [
+                    BatchStep('create', 'file_create', {'path': source, 'content': 'batch'}),
+                    BatchStep('copy', 'file_copy', {'source': source, 'destination': copy}, ['create']),
+                    BatchStep('list', 'file_list', {'path': tmp}, ['copy']),
+                    BatchStep('missing', 'file_delete', {'path': os.path.join(tmp, 'missing.txt')}),
+                    BatchStep('after_missing', 'file_list', {'path': tmp}, ['missing'])
+                ]
+                continued = await executor.run(steps, 'continue')
+                stopped = await executor.run([
+                    BatchStep('missing', 'file_delete', {'path': os.path.join(tmp, 'missing.txt')}),
+                    BatchStep('later', 'file_list', {'path': tmp}, ['missing'])
+                ], 'stop')
+
+            status = {step.id: step.status for step in continued.steps}
+            listed = continued.steps[2].result['data']['files'] if status['list'] == 'succeeded' else []
+            dependency_order = status['create'] == status['copy'] == 'succeeded' and 'b.txt' in str(listed)
+            failure_isolated = status['missing'] == 'failed' and status['after_missing'] == 'skipped'
+
+            # Four independent 0.2 s steps under a cap of two take two rounds
+            class SlowAutomation:
+                async def execute_command(self, command, params=None):
+                    await asyncio.sleep(0.2)
+                    return AutomationResult(success=True, message=command)
+
+            start = time.perf_counter()
+            parallel = await BatchExecutor(SlowAutomation(), max_concurrent=2).run(
+                [BatchStep(f"s{index}", 'sleep') for index in range(4)]
+            )
+            elapsed = time.perf_counter() - start
+
+            try:
+                await executor.run([BatchStep('x', 'app_list', depends_on=['y']),
+                                    BatchStep('y', 'app_list', depends_on=['x'])])
+                cycle_rejected = False
+            except ValueError:
+                cycle_rejected = True
+
+            success = (
+                dependency_order
+                and failure_isolated
+                and not continued.success
+                and [step.status for step in stopped.steps] == ['failed', 'skipped']
+                and parallel.success and 0.35 < elapsed < 0.6
+                and cycle_rejected
+            )
+
+            self.log_test(
+                "Automation Batch",
+                success,
+                f"continue={status}, parallel={elapsed:.2f}s, cycle_rejected={cycle_rejected}"
+            )
+
+        except Exception as e:
+            self.log_test("Automation Batch", False, str(e))
+
+    async def test_command_runner(self):
+        """Test that automation commands run without blocking the event loop, with timeouts and a concurrency cap"""
+        try:
+            runner = CommandRunner(max_concurrent=2, timeout=5.0)
+            python = sys.executable
+            chunks = []
+
+            echo = await runner.run(
+                [python, '-c', 'import sys; print("out"); print("err", file=sys.stderr); sys.exit(3)'],
+                on_output=lambda stream, chunk: chunks.append(stream)
+            )
+            slow = await runner.run([python, '-c', 'import time; time.sleep(10)'], timeout=0.3)
+
+            # Four 0.3s commands with a cap of 2 take two rounds, while the loop keeps ticking
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            tick_task = asyncio.create_task(ticker())
+            start = asyncio.get_running_loop().time()
+            await asyncio.gather(*(runner.run([python, '-c', 'import time; time.sleep(0.3)']) for _ in range(4)))
+            elapsed = asyncio.get_running_loop().time() - start
+            tick_task.cancel()
+
+            success = echo.exit_code == 3 and echo.stdout.strip() == 'out' and echo.stderr.strip() == 'err' and \
+                {'stdout', 'stderr'} <= set(chunks) and slow.timed_out and slow.exit_code is None and \
+                slow.duration < 2.0 and 0.55 <= elapsed < 2.0 and ticks > elapsed * 50
+            self.log_test(
+                "Command Runner",
+                success,
+                f"exit {echo.exit_code}, timeout after {slow.duration:.2f}s, 4 commands in {elapsed:.2f}s "
+                f"with {ticks} loop ticks, stats: {runner.get_stats()}"
+            )
+
+        except Exception as e:
+            self.log_test("Command Runner", False, str(e))
+
     async def test_file_operations(self):
         """Test file system operations"""
         try:
@@ -230,6 +1259,153 @@ class MCPServerTester:
         except Exception as e:
             self.log_test("File Operations", False, str(e))
 
+    async def test_file_transfer(self):
+        """Test offloaded copies and moves: zero-copy data path, background jobs and cancellation"""
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                source = os.path.join(tmp, 'source.bin')
+                payload = os.urandom(3 * 1024 * 1024 + 17)
+                with open(source, 'wb') as f:
+                    f.write(payload)
+
+                copied = await system_automation.execute_command(
+                    'file_copy', {'source': source, 'destination': os.path.join(tmp, 'nested', 'copy.bin')}
+                )
+                with open(os.path.join(tmp, 'nested', 'copy.bin'), 'rb') as f:
+                    identical = f.read() == payload
+
+                started = await system_automation.execute_command(
+                    'file_copy', {'source': source, 'destination': os.path.join(tmp, 'bg.bin'), 'background': True}
+                )
+                job = file_transfers.get_job(started.data['job_id'])
+                await file_transfers.wait(job)
+                status = await system_automation.execute_command('file_job_status', {'job_id': job.id})
+
+                moved = await system_automation.execute_command(
+                    'file_move', {'source': os.path.join(tmp, 'bg.bin'), 'destination': os.path.join(tmp, 'moved.bin')}
+                )
+
+                # One-byte chunks give the cancel time to land mid-copy
+                slow = FileTransferManager(max_workers=1, chunk_size=1)
+                cancelled = slow.start_copy(Path(source), Path(os.path.join(tmp, 'cancelled.bin')))
+                await asyncio.sleep(0.05)
+                slow.cancel(cancelled.id)
+                await slow.wait(cancelled)
+
+                # Cancelling the job's task (e.g. on shutdown) also ends it as cancelled
+                aborted = slow.start_copy(Path(source), Path(os.path.join(tmp, 'aborted.bin')))
+                await asyncio.sleep(0.05)
+                aborted._future.cancel()
+                await asyncio.gather(aborted._future, return_exceptions=True)
+                await asyncio.sleep(0.1)  # the worker thread stops after its current chunk
+                aborted_counted = (aborted.status == 'cancelled' and aborted.finished_at is not None
+                                   and slow.get_stats()['cancelled'] == 2)
+                partial_removed = not any(name.startswith(('cancelled.bin', '.cancelled.bin', 'aborted.bin', '.aborted.bin'))
+                                          for name in os.listdir(tmp))
+
+                # Neither a copy onto itself nor a directory source may destroy a file
+                onto_itself = await system_automation.execute_command(
+                    'file_copy', {'source': source, 'destination': source}
+                )
+                keep = os.path.join(tmp, 'keep.txt')
+                with open(keep, 'w') as f:
+                    f.write('keep')
+                directory_source = await system_automation.execute_command(
+                    'file_copy', {'source': os.path.join(tmp, 'nested'), 'destination': keep}
+                )
+                with open(source, 'rb') as f:
+                    source_intact = f.read() == payload
+                with open(keep) as f:
+                    destination_intact = f.read() == 'keep'
+
+            success = (
+                copied.success and identical and copied.data['method'] is not None
+                and started.success and status.data['status'] == 'completed' and status.data['progress'] == 1.0
+                and moved.success and moved.data['method'] == 'rename'
+                and cancelled.status == 'cancelled' and aborted_counted and partial_removed
+                and not onto_itself.success and source_intact
+                and not directory_source.success and destination_intact
+            )
+
+            self.log_test(
+                "File Transfer",
+                success,
+                f"copy via {copied.data['method'] if copied.data else None}, "
+                f"background {status.data['status'] if status.data else status.error}, cancel {cancelled.status}, "
+                f"task cancel {aborted.status}"
+            )
+
+        except Exception as e:
+            self.log_test("File Transfer", False, str(e))
+
+    async def test_directory_listing(self):
+        """Test scandir listing: cursor pages cover every entry once, sorting, filtering and streaming"""
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                for index in range(25):
+                    with open(os.path.join(tmp, f"note{index:02d}.txt"), 'w') as f:
+                        f.write('x' * index)
+                os.mkdir(os.path.join(tmp, 'folder'))
+
+                pages, cursor, names = 0, None, []
+                while True:
+                    result = await system_automation.execute_command(
+                        'file_list', {'path': tmp, 'limit': 10, 'cursor': cursor}
+                    )
+                    names += [entry['name'] for entry in result.data['files']]
+                    pages += 1
+                    cursor = result.data['next_cursor']
+                    if not cursor:
+                        break
+
+                largest = list_directory(tmp, ListingOptions(sort='size', reverse=True, kind='file'), limit=3)
+                filtered = list_directory(tmp, ListingOptions(pattern='note1*'))
+                try:
+                    list_directory(tmp, ListingOptions(sort='size'), cursor=list_directory(tmp, limit=5).next_cursor)
+                    cursor_checked = False
+                except InvalidCursorError:
+                    cursor_checked = True
+                streamed = [entry['name'] async for entry in stream_directory(tmp, batch_size=4)]
+                events = [json.loads(line) async for line in stream_directory_ndjson(tmp, ListingOptions(sort='name'))]
+
+                # Directory-order pages resume after the last name, so deleting a listed
+                # entry (even that last one) between pages neither skips nor repeats any
+                unsorted = ListingOptions(sort='none', kind='file')
+                first = list_directory(tmp, unsorted, limit=8)
+                unsorted_names = [entry['name'] for entry in first.entries]
+                os.unlink(os.path.join(tmp, unsorted_names[0]))
+                second = list_directory(tmp, unsorted, cursor=first.next_cursor, limit=8)
+                unsorted_names += [entry['name'] for entry in second.entries]
+                os.unlink(os.path.join(tmp, unsorted_names[-1]))
+                cursor = second.next_cursor
+                while cursor:
+                    page = list_directory(tmp, unsorted, cursor=cursor, limit=8)
+                    unsorted_names += [entry['name'] for entry in page.entries]
+                    cursor = page.next_cursor
+
+            success = (
+                pages == 3 and names == sorted(names, key=str.casefold) and len(set(names)) == 26
+                and [entry['name'] for entry in largest.entries] == ['note24.txt', 'note23.txt', 'note22.txt']
+                and largest.total == 25
+                and filtered.total == 10
+                and cursor_checked
+                and sorted(streamed) == sorted(names)
+                and sorted(unsorted_names) == sorted(name for name in names if name != 'folder')
+                and [event['type'] for event in events] == ['entry'] * 26 + ['done']
+                and [event['entry']['name'] for event in events[:-1]] == names
+                and events[-1]['count'] == 26
+                and {event['entry']['type'] for event in events[:-1]} == {'file', 'directory'}
+            )
+
+            self.log_test(
+                "Directory Listing",
+                success,
+                f"{len(names)} entries in {pages} pages, {len(streamed)} streamed"
+            )
+
+        except Exception as e:
+            self.log_test("Directory Listing", False, str(e))
+
     async def test_api_endpoints(self):
         """Test API endpoints"""
         try:
@@ -340,10 +1516,38 @@ class MCPServerTester:
 
         # Core functionality tests
         await self.test_voice_processor_health()
+        await self.test_model_registry_sharing()
+        await self.test_inference_worker_recovery()
+        await self.test_inference_worker_broadcast()
+        await self.test_streaming_session_close()
+        await self.test_inference_thread_timeout()
+        await self.test_language_routing()
+        await self.test_tiered_cache()
+        await self.test_transcription_batching()
         await self.test_system_automation_health()
+        await self.test_speech_synthesis()
+        await self.test_response_audio_cache()
+        await self.test_intent_matcher()
+        await self.test_entity_extraction()
         await self.test_voice_processor_intent_extraction()
+        await self.test_classify_batch()
+        await self.test_voice_activity_detection()
+        await self.test_audio_normalization()
+        await self.test_wav_decoding()
+        await self.test_audio_upload()
+        await self.test_request_size_limit()
+        await self.test_quality_tiers()
+        await self.test_decoder_pool()
+        await self.test_long_form_chunking()
+        await self.test_speech_gate()
+        await self.test_wake_word()
         await self.test_system_automation_operations()
+        await self.test_operation_registry()
+        await self.test_automation_batch()
+        await self.test_command_runner()
         await self.test_file_operations()
+        await self.test_file_transfer()
+        await self.test_directory_listing()
 
         # API tests (only if server is running)
         try:
@@ -0,0 +1,234 @@
+"""
+Tiered Cache for Samantha AI MCP Server
+Content-addressed byte cache with an LRU memory tier, an optional disk tier,
+and coalescing of concurrent computations of the same key
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .metrics import cache_events, cache_memory_bytes
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _LeaderCancelledError(Exception):
+    """Tells coalesced callers that the computing caller went away"""
+    pass
+
+
+class TieredCache:
+    """Memory LRU (byte budget) in front of an optional on-disk store"""
+
+    def __init__(self, name: str, max_memory_bytes: int,
+                 disk_dir: Optional[str] = None, max_disk_bytes: Optional[int] = None):
+        self.name = name
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        # Disk writes run on worker threads; the byte count and eviction are shared
+        self._disk_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0
+        }
+
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Look a key up in memory, then on disk (promoting disk hits to memory)"""
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self._count('memory_hits', 'hit_memory')
+            return value
+
+        if self.disk_dir:
+            value = await asyncio.to_thread(self._read_disk, key)
+            if value is not None:
+                self._count('disk_hits', 'hit_disk')
+                self._put_memory(key, value)
+                return value
+
+        self._count('misses', 'miss')
+        return None
+
+    async def put(self, key: str, value: bytes):
+        """Store a value in both tiers"""
+        self._put_memory(key, value)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, value)
+
+    async def get_or_compute(self, key: str,
+                             compute: Callable[[], Awaitable[bytes]]) -> Tuple[bytes, str]:
+        """
+        Return the cached value, or compute and store it
+
+        Concurrent callers for the same missing key share one computation.
+        If the computing caller is cancelled, a waiting caller takes over.
+
+        Args:
+            key: Content-addressed cache key
+            compute: Coroutine factory producing the value on a miss
+
+        Returns:
+            Tuple of (value, source) where source is 'memory', 'disk',
+            'coalesced' or 'computed'
+        """
+        counted = False
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            if not counted:
+                self._count('coalesced', 'coalesced')
+                counted = True
+            try:
+                return await asyncio.shield(inflight), 'coalesced'
+            except _LeaderCancelledError:
+                # Compute it ourselves, or join whichever waiter got there first
+                continue
+
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self._count('memory_hits', 'hit_memory')
+            return value, 'memory'
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting when compute fails; mark the exception retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await self.get(key)
+            source = 'disk' if value is not None else 'computed'
+            if value is None:
+                value = await compute()
+                await self.put(key, value)
+            future.set_result(value)
+            return value, source
+        except asyncio.CancelledError:
+            # Only this caller is cancelled; the waiters are still live
+            future.set_exception(_LeaderCancelledError())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _put_memory(self, key: str, value: bytes):
+        if len(value) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._count('memory_evictions', 'evict_memory')
+        cache_memory_bytes.labels(cache=self.name).set(self._memory_bytes)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.bin"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            return self._disk_path(key).read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, value: bytes):
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            previous_size = path.stat().st_size if path.exists() else 0
+            # Write-then-rename so a crash never leaves a torn entry
+            temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_bytes(value)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Cache '{self.name}' disk write failed: {e}")
+            return
+
+        if self.max_disk_bytes is not None:
+            with self._disk_lock:
+                if self._disk_bytes is None:
+                    self._disk_bytes = sum(entry.stat().st_size for entry in self.disk_dir.glob('*/*.bin'))
+                else:
+                    self._disk_bytes += len(value) - previous_size
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+
+    def _evict_disk(self):
+        """Remove least recently modified entries until 90% of the disk budget (call with _disk_lock held)"""
+        entries = sorted(
+            ((entry.stat().st_mtime, entry.stat().st_size, entry) for entry in self.disk_dir.glob('*/*.bin')),
+            key=lambda item: item[0]
+        )
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.9
+        for _, size, entry in entries:
+            if total <= target:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+            self._count('disk_evictions', 'evict_disk')
+        self._disk_bytes = total
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def _count(self, stat: str, event: str):
+        self._stats[stat] += 1
+        cache_events.labels(cache=self.name, event=event).inc()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and tier sizes"""
+        lookups = self._stats['memory_hits'] + self._stats['disk_hits'] + self._stats['misses']
+        hits = self._stats['memory_hits'] + self._stats['disk_hits']
+        return {
+            'name': self.name,
+            'entries': len(self._memory),
+            'memory_bytes': self._memory_bytes,
+            'max_memory_bytes': self.max_memory_bytes,
+            'disk_enabled': self.disk_dir is not None,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            **self._stats
+        }
@@ -0,0 +1,137 @@
+"""
+Transcription Micro-Batching for Samantha AI MCP Server
+Collects short clips that arrive together and decodes them in one forward pass
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+from .inference_executor import inference_executor, InferenceExecutor
+from .metrics import (
+    transcription_batch_size, transcription_batch_wait
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Batching configuration (overridable via environment); off by default
+BATCHING_ENABLED = os.getenv("SAMANTHA_TRANSCRIPTION_BATCHING", "false").lower() in ("1", "true", "yes")
+MAX_BATCH_SIZE = int(os.getenv("SAMANTHA_BATCH_MAX_SIZE", "8"))
+MAX_BATCH_WAIT_MS = float(os.getenv("SAMANTHA_BATCH_MAX_WAIT_MS", "10"))
+
+# Whisper's fixed input window; longer clips cannot share a batch
+MAX_BATCH_CLIP_SECONDS = 30.0
+
+
+@dataclass
+class _PendingClip:
+    samples: np.ndarray
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class TranscriptionBatcher:
+    """Groups concurrent transcription requests into batched decodes"""
+
+    def __init__(self, executor: InferenceExecutor = inference_executor,
+                 max_batch_size: int = MAX_BATCH_SIZE,
+                 max_wait_ms: float = MAX_BATCH_WAIT_MS):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        # One open batch per (model, decoding options) since options apply to a whole batch
+        self._pending: Dict[tuple, List[_PendingClip]] = {}
+        self._timers: Dict[tuple, asyncio.TimerHandle] = {}
+        # The loop only holds weak references to tasks; keep dispatched batches alive
+        self._running: Set[asyncio.Task] = set()
+        self._stats = {'batches': 0, 'clips': 0}
+
+    def accepts(self, samples: np.ndarray, sample_rate: int = 16000) -> bool:
+        """Only clips that fit in one Whisper window can be batched"""
+        return len(samples) / sample_rate <= MAX_BATCH_CLIP_SECONDS
+
+    async def transcribe(self, samples: np.ndarray, options: Optional[Dict[str, Any]] = None,
+                         model_size: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue a clip for the next batch and wait for its own result
+
+        Args:
+            samples: 16 kHz float32 clip of at most 30 seconds
+            options: whisper.DecodingOptions fields (LanguageRoute.batch_decode_options()),
+                e.g. language and beam_size; clips only share a batch with equal options
+            model_size: Whisper model name; defaults to the executor's model
+
+        Returns:
+            Result dict with 'text', 'language', 'avg_logprob' and 'no_speech_prob'
+        """
+        loop = asyncio.get_running_loop()
+        key = (model_size or self.executor.model_size, tuple(sorted((options or {}).items())))
+        clip = _PendingClip(samples=samples, future=loop.create_future())
+
+        batch = self._pending.setdefault(key, [])
+        batch.append(clip)
+        if len(batch) >= self.max_batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.max_wait_ms / 1000.0, self._flush, key)
+
+        return await clip.future
+
+    def _flush(self, key: tuple):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(key, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, key: tuple, batch: List[_PendingClip]):
+        model_size, options = key
+        dispatched_at = time.perf_counter()
+        transcription_batch_size.observe(len(batch))
+        for clip in batch:
+            transcription_batch_wait.observe(dispatched_at - clip.enqueued_at)
+        self._stats['batches'] += 1
+        self._stats['clips'] += len(batch)
+
+        try:
+            results = await self.executor.decode_batch(
+                [clip.samples for clip in batch], dict(options), model_size=model_size
+            )
+        except Exception as e:
+            logger.error(f"Batched transcription failed for {len(batch)} clip(s): {e}")
+            for clip in batch:
+                if not clip.future.done():
+                    clip.future.set_exception(e)
+            return
+
+        for clip, result in zip(batch, results):
+            if not clip.future.done():
+                clip.future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching configuration and average batch size"""
+        batches = self._stats['batches']
+        return {
+            'enabled': BATCHING_ENABLED,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'batches': batches,
+            'running': len(self._running),
+            'clips': self._stats['clips'],
+            'avg_batch_size': self._stats['clips'] / batches if batches else 0.0
+        }
+
+
+# Global transcription batcher instance
+transcription_batcher = TranscriptionBatcher()
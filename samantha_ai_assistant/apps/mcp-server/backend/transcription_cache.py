@@ -0,0 +1,65 @@
+"""
+Transcription Cache for Samantha AI MCP Server
+Caches transcripts by a hash of the decoded audio, model, language and decoding settings
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from .tiered_cache import TieredCache
+
+# Cache configuration (overridable via environment); the disk tier is off
+# unless a directory is configured
+TRANSCRIPTION_CACHE_BYTES = int(os.getenv("SAMANTHA_TRANSCRIPTION_CACHE_BYTES", str(16 * 1024 * 1024)))
+TRANSCRIPTION_CACHE_DIR = os.getenv("SAMANTHA_TRANSCRIPTION_CACHE_DIR") or None
+TRANSCRIPTION_CACHE_DISK_BYTES = int(os.getenv("SAMANTHA_TRANSCRIPTION_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+
+
+def _settings(model_size: str, language: Optional[str], decode_options: Optional[Dict[str, Any]]) -> str:
+    # Beam size and temperature change the transcript, so each quality tier caches separately
+    options = json.dumps(decode_options or {}, sort_keys=True, separators=(',', ':'))
+    return f"{model_size}|{language or 'auto'}|{options}|"
+
+
+def transcription_cache_key(audio: Union[np.ndarray, bytes], model_size: str,
+                            language: Optional[str], decode_options: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Content-addressed key for a transcription
+
+    Args:
+        audio: Decoded float32 samples, or raw upload bytes when the audio
+            could not be decoded in memory
+        model_size: Whisper model name
+        language: Language hint, or None for auto-detection
+        decode_options: Decoding settings of the route (LanguageRoute.decode_options())
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    if not isinstance(audio, np.ndarray):
+        return raw_audio_cache_key(hashlib.sha256(audio).hexdigest(), model_size, language, decode_options)
+    digest = hashlib.sha256()
+    digest.update(_settings(model_size, language, decode_options).encode())
+    digest.update(b"pcm_f32:")
+    # Hash the buffer in place rather than copying it with tobytes()
+    digest.update(memoryview(np.ascontiguousarray(audio, dtype=np.float32)).cast('B'))
+    return digest.hexdigest()
+
+
+def raw_audio_cache_key(raw_sha256: str, model_size: str, language: Optional[str],
+                        decode_options: Optional[Dict[str, Any]] = None) -> str:
+    """Key for undecoded audio from the SHA-256 of its bytes (computed while streaming)"""
+    return hashlib.sha256(f"{_settings(model_size, language, decode_options)}raw:{raw_sha256}".encode()).hexdigest()
+
+
+# Global transcription cache instance
+transcription_cache = TieredCache(
+    'transcription',
+    max_memory_bytes=TRANSCRIPTION_CACHE_BYTES,
+    disk_dir=TRANSCRIPTION_CACHE_DIR,
+    max_disk_bytes=TRANSCRIPTION_CACHE_DISK_BYTES
+)
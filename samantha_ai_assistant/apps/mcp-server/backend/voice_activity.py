@@ -0,0 +1,135 @@
+"""
+Voice Activity Detection for Samantha AI MCP Server
+Vectorised energy-based speech detection and silence trimming before ASR
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FRAME_MS = 20
+
+
+@dataclass(frozen=True)
+class VadThresholds:
+    """Speech detection thresholds"""
+    min_energy_db: float = -50.0      # frames quieter than this are never speech
+    noise_margin_db: float = 12.0     # speech must exceed the noise floor by this much
+    min_speech_ms: float = 150.0      # less voiced audio than this means no speech
+    padding_ms: float = 200.0         # audio kept around the detected speech
+
+
+DEFAULT_VAD_THRESHOLDS = VadThresholds()
+
+# Per-language overrides, keyed by supported language code or bare language
+LANGUAGE_VAD_THRESHOLDS: Dict[str, VadThresholds] = {
+    # Tonal languages carry meaning in quiet syllable tails; trim less aggressively
+    'zh-CN': VadThresholds(noise_margin_db=10.0, padding_ms=300.0),
+    'ja-JP': VadThresholds(noise_margin_db=10.0, padding_ms=250.0),
+    'ko-KR': VadThresholds(noise_margin_db=10.0, padding_ms=250.0),
+}
+
+
+def _load_threshold_overrides():
+    """Merge SAMANTHA_VAD_THRESHOLDS, e.g. '{"en-US": {"min_energy_db": -45}}'"""
+    raw = os.getenv("SAMANTHA_VAD_THRESHOLDS")
+    if not raw:
+        return
+    try:
+        for language, overrides in json.loads(raw).items():
+            base = LANGUAGE_VAD_THRESHOLDS.get(language, DEFAULT_VAD_THRESHOLDS)
+            LANGUAGE_VAD_THRESHOLDS[language] = replace(base, **overrides)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error(f"Ignoring invalid SAMANTHA_VAD_THRESHOLDS: {e}")
+
+
+_load_threshold_overrides()
+
+
+def get_vad_thresholds(language: Optional[str]) -> VadThresholds:
+    """Thresholds for a language code ('en-US'), its bare language ('en'), or the default"""
+    if not language:
+        return DEFAULT_VAD_THRESHOLDS
+    return LANGUAGE_VAD_THRESHOLDS.get(
+        language, LANGUAGE_VAD_THRESHOLDS.get(language.split('-')[0], DEFAULT_VAD_THRESHOLDS)
+    )
+
+
+@dataclass
+class VadResult:
+    """Outcome of speech detection on one clip"""
+    samples: np.ndarray
+    has_speech: bool
+    original_duration: float
+    leading_trimmed: float
+    trailing_trimmed: float
+
+    @property
+    def trimmed_duration(self) -> float:
+        return self.leading_trimmed + self.trailing_trimmed
+
+
+def frame_energies_db(samples: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """Mean-square energy in dBFS of each non-overlapping frame (partial tail dropped)"""
+    frame = sample_rate * frame_ms // 1000
+    frame_count = len(samples) // frame
+    if frame_count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:frame_count * frame].reshape(frame_count, frame)
+    return 10.0 * np.log10(np.einsum('ij,ij->i', frames, frames) / frame + 1e-10)
+
+
+def detect_speech(samples: np.ndarray, sample_rate: int = 16000,
+                  thresholds: VadThresholds = DEFAULT_VAD_THRESHOLDS) -> VadResult:
+    """
+    Find the speech region of a clip and trim the silence around it
+
+    Args:
+        samples: Mono float32 audio in [-1, 1]
+        sample_rate: Sample rate of samples
+        thresholds: Detection thresholds (see get_vad_thresholds)
+
+    Returns:
+        VadResult whose samples are a view of the speech region (no copy)
+    """
+    duration = len(samples) / sample_rate
+    frame = sample_rate * FRAME_MS // 1000
+    energies = frame_energies_db(samples, sample_rate)
+    if len(energies) == 0:
+        return VadResult(samples, False, duration, 0.0, 0.0)
+
+    # Adaptive threshold: the quietest decile approximates the noise floor.
+    # Capping at peak - margin keeps clips that are speech throughout.
+    noise_floor = float(np.percentile(energies, 10))
+    peak = float(energies.max())
+    threshold = max(
+        thresholds.min_energy_db,
+        min(noise_floor + thresholds.noise_margin_db, peak - thresholds.noise_margin_db)
+    )
+    voiced = energies > threshold
+
+    if voiced.sum() * FRAME_MS < thresholds.min_speech_ms:
+        return VadResult(samples[:0], False, duration, 0.0, 0.0)
+
+    padding = int(thresholds.padding_ms / FRAME_MS)
+    first = max(int(np.argmax(voiced)) - padding, 0)
+    last = min(len(voiced) - 1 - int(np.argmax(voiced[::-1])) + padding, len(voiced) - 1)
+    start = first * frame
+    # Keep the undivided tail when speech runs to the last frame
+    end = len(samples) if last == len(voiced) - 1 else (last + 1) * frame
+
+    return VadResult(
+        samples=samples[start:end],
+        has_speech=True,
+        original_duration=duration,
+        leading_trimmed=start / sample_rate,
+        trailing_trimmed=(len(samples) - end) / sample_rate
+    )
@@ -6,7 +6,7 @@ Handles speech recognition, command processing, and response synthesis
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import aiohttp
@@ -16,7 +16,26 @@ import tempfile
 import wave
 import struct
 import os
-import whisper
+import time
+
+from .model_registry import model_registry, DEFAULT_MODEL_SIZE
+from .audio_decoder import decode_wav_bytes, DecodedAudio
+from .audio_normalization import normalize_level
+from .inference_executor import inference_executor
+from .transcription_batcher import transcription_batcher, BATCHING_ENABLED
+from .voice_activity import detect_speech, get_vad_thresholds
+from .transcription_cache import transcription_cache, transcription_cache_key, raw_audio_cache_key
+from .audio_upload import AudioUpload
+from .decoder_pool import decoder_pool
+from .long_form import long_form_transcriber, CHUNK_SECONDS
+from .language_router import LanguageRouter, LanguageRoute
+from .quality_tiers import quality_tier_policy
+from .speech_confidence import AcousticConfidence, aggregate_confidence, confidence_from_result, speech_gate
+from .intent_matcher import IntentMatcher
+from .entity_gazetteer import entity_gazetteer, Entity
+from .intent_classifier import IntentClassifier, IntentPrediction, build_training_examples
+from .speech_synthesis import speech_synthesizer, SpeechSynthesisError, SynthesizedSpeech
+from .response_audio_cache import response_audio_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +51,22 @@ class VoiceCommand:
     entities: Dict[str, str]
     timestamp: datetime
     user_id: Optional[str] = None
+    decode_path: Optional[str] = None
+    trimmed_duration: float = 0.0
+    rejected_duration: float = 0.0
+    quality_tier: Optional[str] = None
+    asr_confidence: Optional[float] = None
+    no_speech_reason: Optional[str] = None   # 'vad', 'no_speech' or 'low_confidence' when gated
+
+@dataclass
+class TranscriptionResult:
+    """Text produced by the ASR stage and how the audio was decoded"""
+    text: str
+    decode_path: str
+    trimmed_duration: float = 0.0
+    rejected_duration: float = 0.0
+    quality_tier: Optional[str] = None
+    acoustic: Optional[AcousticConfidence] = None
 
 @dataclass
 class VoiceResponse:
@@ -44,7 +79,7 @@ class VoiceResponse:
 class VoiceProcessor:
     """Main voice processing engine for the MCP server"""
 
-    def __init__(self):
+    def __init__(self, model_size: str = DEFAULT_MODEL_SIZE, device: Optional[str] = None):
         self.supported_languages = {
             'en-US': 'English (US)',
             'en-GB': 'English (UK)',
@@ -58,10 +93,19 @@ class VoiceProcessor:
             'zh-CN': 'Chinese (Simplified)'
         }
 
+        # Language code -> Whisper language and model variant (English-only
+        # models for English, multilingual for the rest)
+        self.language_router = LanguageRouter(self.supported_languages, model_size)
+        # Model size and decoding settings stepped down under load, up when idle
+        self.quality_policy = quality_tier_policy
+
         # AI processing configuration
         # self.ai_endpoint = "https://api.openai.com/v1/audio/transcriptions"
         # self.ai_api_key = os.getenv("OPENAI_API_KEY")  # Set via environment variable
-        self.whisper_model = whisper.load_model("base") # Load a base Whisper model
+
+        # Whisper model is shared through the registry and loaded on first use
+        self.model_size = model_size
+        self.device = device
 
         # Command patterns for intent recognition
         self.command_patterns = {
@@ -86,6 +130,12 @@ class VoiceProcessor:
                 'find information', 'look up'
             ]
         }
+        # Compiled once; every pattern hit is found in a single pass over the text
+        self.intent_matcher = IntentMatcher(self.command_patterns)
+        self.entity_gazetteer = entity_gazetteer
+        # Local classifier trained on labelled examples plus the command patterns
+        self.intent_classifier = IntentClassifier()
+        self.intent_classifier.fit(build_training_examples(self.command_patterns))
 
         # Response templates
         self.response_templates = {
@@ -93,11 +143,23 @@ class VoiceProcessor:
             'error': "I encountered an error while processing your request.",
             'not_understood': "I didn't understand that command. Could you please repeat?",
             'processing': "I'm processing your request now.",
-            'confirmation': "Would you like me to proceed with this action?"
+            'confirmation': "Would you like me to proceed with this action?",
+            'navigate_url': "I'll navigate to {url} for you.",
+            'navigate': "I'll help you navigate to that website.",
+            'open_app': "I'll open {app} for you.",
+            'system_control': "I'll help you with that system control.",
+            'file_operations': "I'll help you with that file operation.",
+            'web_automation': "I'll perform that web automation for you.",
+            'information_query': "I'll search for that information for you."
         }
 
         logger.info("VoiceProcessor initialized")
 
+    @property
+    def whisper_model(self):
+        """Shared Whisper model for this processor's size and device"""
+        return model_registry.get(self.model_size, self.device)
+
     async def process_audio(self, audio_data: bytes, language: str = 'en-US') -> VoiceCommand:
         logger.info(f"Received audio data for processing. Size: {len(audio_data)} bytes")
         """
@@ -112,62 +174,318 @@ class VoiceProcessor:
         """
         try:
             # Step 1: Transcribe audio
-            transcription = await self._transcribe_audio(audio_data, language)
-
-            if not transcription or not transcription.strip():
-                raise ValueError("No transcription generated")
-
-            # Step 2: Extract intent and entities
-            intent, confidence, entities = await self._extract_intent(transcription)
-
-            # Step 3: Create command object
-            command = VoiceCommand(
-                id=f"cmd_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}",
-                original_text=transcription,
-                intent=intent,
-                confidence=confidence,
-                entities=entities,
-                timestamp=datetime.now()
-            )
+            result = await self._transcribe_audio(audio_data, language)
+
+            # Steps 2-3: Extract intent and build the command
+            return await self.process_transcription(result)
+
+        except Exception as e:
+            logger.error(f"Error processing audio: {e}")
+            raise
+
+    async def process_upload(self, upload: AudioUpload, language: str = 'en-US') -> VoiceCommand:
+        """
+        Process an upload read incrementally by read_audio_upload
 
-            logger.info(f"Processed command: {command.intent} (confidence: {confidence:.2f})")
-            return command
+        Args:
+            upload: Decoded or spooled upload
+            language: Language code for recognition
 
+        Returns:
+            VoiceCommand object with processed information
+        """
+        logger.info(f"Received audio upload for processing. Size: {upload.size} bytes")
+        try:
+            result = await self._transcribe_upload(upload, language)
+            return await self.process_transcription(result)
         except Exception as e:
             logger.error(f"Error processing audio: {e}")
             raise
 
-    async def _transcribe_audio(self, audio_data: bytes, language: str) -> str:
+    async def process_transcription(self, result: TranscriptionResult) -> VoiceCommand:
+        """
+        Turn a transcription into a structured command
+
+        Args:
+            result: Output of the ASR stage (upload or streaming)
+
+        Returns:
+            VoiceCommand object with processed information
+        """
+        transcription = result.text
+
+        if result.rejected_duration:
+            # VAD found no speech; the clip never reached the model
+            logger.info(f"Rejected {result.rejected_duration:.2f}s clip with no speech")
+            return self._no_speech_command(result, 'vad')
+
+        reason = speech_gate.check(result.acoustic)
+        if reason:
+            # Whisper hallucinates text from noise; stop before intent, response and automation
+            logger.info(f"Dropped transcript {transcription!r} ({reason}, "
+                        f"acoustic confidence {result.acoustic.confidence:.2f})")
+            return self._no_speech_command(result, reason)
+
+        if not transcription or not transcription.strip():
+            raise ValueError("No transcription generated")
+
+        # Extract intent and entities
+        intent, confidence, entities = await self._extract_intent(transcription)
+
+        # Create command object
+        command = VoiceCommand(
+            id=f"cmd_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}",
+            original_text=transcription,
+            intent=intent,
+            confidence=confidence,
+            entities=entities,
+            timestamp=datetime.now(),
+            decode_path=result.decode_path,
+            trimmed_duration=result.trimmed_duration,
+            quality_tier=result.quality_tier,
+            asr_confidence=result.acoustic.confidence if result.acoustic is not None else None
+        )
+
+        logger.info(f"Processed command: {command.intent} (confidence: {confidence:.2f})")
+        return command
+
+    def _no_speech_command(self, result: TranscriptionResult, reason: str) -> VoiceCommand:
+        """Command returned for clips without speech; confidence 0 so nothing executes"""
+        return VoiceCommand(
+            id=f"cmd_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}",
+            original_text='',
+            intent='no_speech',
+            confidence=0.0,
+            entities={},
+            timestamp=datetime.now(),
+            decode_path=result.decode_path,
+            trimmed_duration=result.trimmed_duration,
+            rejected_duration=result.rejected_duration,
+            quality_tier=result.quality_tier,
+            asr_confidence=result.acoustic.confidence if result.acoustic is not None else None,
+            no_speech_reason=reason
+        )
+
+    async def _transcribe_audio(self, audio_data: bytes, language: str) -> TranscriptionResult:
         """
-        Transcribe audio using OpenAI Whisper API
+        Transcribe audio using the local Whisper model
+
+        PCM/float WAV is decoded in memory and handed to the model as a
+        16 kHz float32 array; other containers (WebM/Opus, AAC, ...) are
+        decoded by the long-lived decoder pool, or go through a temp file and
+        Whisper's ffmpeg loader when the pool is disabled. Decoded audio is
+        trimmed by the VAD and rejected without inference when it holds no
+        speech. Inference runs
+        on the inference executor so the event loop stays free; with batching
+        enabled, short in-memory clips are decoded together with concurrent
+        requests. Transcripts are cached by audio hash, model and language.
+        The language code selects the Whisper language (skipping detection)
+        and model variant through the language router.
 
         Args:
             audio_data: Raw audio bytes
             language: Language code
 
         Returns:
-            Transcribed text
+            TranscriptionResult with the text and the decode path taken
+        """
+        route = self._route(language)
+
+        decoded = decode_wav_bytes(audio_data)
+        if decoded is not None:
+            return await self._transcribe_decoded(decoded, route, language)
+        if decoder_pool.enabled:
+            decoded = await decoder_pool.decode(audio_data)
+            return await self._transcribe_decoded(decoded, route, language, decode_path="decoder_pool")
+
+        key = transcription_cache_key(audio_data, route.model_size, route.whisper_language, route.decode_options())
+        payload = await self._cached_transcription(key, lambda: self._infer_file(audio_data, route))
+        return TranscriptionResult(
+            text=payload["text"], decode_path="ffmpeg", quality_tier=route.tier,
+            acoustic=AcousticConfidence.from_dict(payload.get("confidence"))
+        )
+
+    async def _transcribe_upload(self, upload: AudioUpload, language: str) -> TranscriptionResult:
+        """Transcribe a streamed upload: decoded WAV in memory, anything else from its spool"""
+        route = self._route(language)
+        decoded = await self._decode_upload(upload)
+        if decoded is not None:
+            decode_path = "in_memory" if upload.decoded is not None else "decoder_pool"
+            return await self._transcribe_decoded(decoded, route, language, decode_path=decode_path)
+
+        key = raw_audio_cache_key(upload.sha256, route.model_size, route.whisper_language, route.decode_options())
+        payload = await self._cached_transcription(key, lambda: self._infer_path(upload.spool.path(), route))
+        return TranscriptionResult(
+            text=payload["text"], decode_path="ffmpeg", quality_tier=route.tier,
+            acoustic=AcousticConfidence.from_dict(payload.get("confidence"))
+        )
+
+    def _route(self, language: Optional[str]) -> LanguageRoute:
+        """Language route with the quality tier chosen for the current load"""
+        return self.quality_policy.apply(self.language_router.route(language))
+
+    async def _transcribe_decoded(self, decoded: DecodedAudio, route: LanguageRoute, language: str,
+                                  decode_path: str = "in_memory") -> TranscriptionResult:
+        """VAD-trim decoded audio, level-normalise the speech, then transcribe it through the cache"""
+        # VAD thresholds are absolute dBFS, so gain is applied only after trimming
+        vad = detect_speech(decoded.samples, decoded.sample_rate, get_vad_thresholds(language))
+        if not vad.has_speech:
+            return TranscriptionResult(
+                text='', decode_path=decode_path, rejected_duration=vad.original_duration
+            )
+
+        samples = normalize_level(vad.samples)
+        key = transcription_cache_key(samples, route.model_size, route.whisper_language, route.decode_options())
+        if len(samples) > CHUNK_SECONDS * decoded.sample_rate:
+            # Long recordings are split at pauses and decoded in parallel
+            infer = lambda: self._infer_long_form(samples, route)
+        else:
+            infer = lambda: self._infer_samples(samples, route)
+        payload = await self._cached_transcription(key, infer)
+        return TranscriptionResult(
+            text=payload["text"], decode_path=decode_path, trimmed_duration=vad.trimmed_duration,
+            quality_tier=route.tier, acoustic=AcousticConfidence.from_dict(payload.get("confidence"))
+        )
+
+    async def _cached_transcription(self, key: str, infer) -> Dict[str, Any]:
+        """
+        Serve a transcript from the cache, coalescing identical in-flight requests
+
+        Returns:
+            The cached payload: "text" and the acoustic "confidence" statistics
+            (absent for entries cached before they were recorded)
         """
+        try:
+            payload, source = await transcription_cache.get_or_compute(key, infer)
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            raise
+        if source != 'computed':
+            logger.info(f"Transcription served from cache ({source})")
+        return json.loads(payload)
+
+    async def _infer_samples(self, samples: np.ndarray, route: LanguageRoute) -> bytes:
+        """Run the model on in-memory samples and serialise the result for the cache"""
+        start_time = time.perf_counter()
+        if BATCHING_ENABLED and transcription_batcher.accepts(samples):
+            result = await transcription_batcher.transcribe(
+                samples, route.batch_decode_options(), model_size=route.model_size
+            )
+        else:
+            result = await inference_executor.transcribe(
+                samples, route.decode_options(), model_size=route.model_size
+            )
+        self._observe(route, time.perf_counter() - start_time)
+        logger.info(f"Whisper transcription result: {result}")
+        return self._cache_payload(result)
+
+    @staticmethod
+    def _cache_payload(result: Dict[str, Any]) -> bytes:
+        """Serialise a Whisper result for the cache: its text and acoustic confidence statistics"""
+        acoustic = confidence_from_result(result)
+        return json.dumps({
+            "text": result["text"].strip(),
+            "confidence": acoustic.to_dict() if acoustic is not None else None
+        }).encode()
+
+    def _observe(self, route: LanguageRoute, seconds: float):
+        """Feed transcription latency to the route metrics and the tier policy"""
+        self.language_router.observe(route, seconds)
+        self.quality_policy.observe(route.tier, seconds)
+
+    async def _infer_long_form(self, samples: np.ndarray, route: LanguageRoute) -> bytes:
+        """Run chunked parallel transcription and serialise the stitched result for the cache"""
+        start_time = time.perf_counter()
+        result = await long_form_transcriber.transcribe(samples, route)
+        self._observe(route, time.perf_counter() - start_time)
+        logger.info(f"Long-form transcription: {result['chunks']} chunks, {len(result['segments'])} segments")
+        return json.dumps({
+            "text": result["text"],
+            "segments": result["segments"],
+            "confidence": result["confidence"]
+        }).encode()
+
+    async def stream_transcription(self, upload: AudioUpload, language: str = 'en-US') -> AsyncIterator[Dict[str, Any]]:
+        """
+        Transcribe an upload and yield segments as the chunks covering them finish
+
+        Recordings are VAD-trimmed, split at pauses into windows of about
+        CHUNK_SECONDS and decoded in parallel; segment times are seconds from
+        the start of the upload.
+
+        Args:
+            upload: Decoded or spooled upload
+            language: Language code for recognition
+
+        Yields:
+            {"type": "segment", "chunk", "start", "end", "text"} events, then
+            {"type": "done", "text", "duration", "chunks", "quality_tier",
+            "confidence"}; segment and overall confidence are acoustic
+            confidence in [0, 1], or absent/None without statistics
+        """
+        route = self._route(language)
+        decoded = await self._decode_upload(upload)
+        if decoded is None:
+            raise ValueError("Streaming transcription needs WAV audio or the decoder pool")
+
+        vad = detect_speech(decoded.samples, decoded.sample_rate, get_vad_thresholds(language))
+        texts: List[str] = []
+        weighted: List[Tuple[float, float, float]] = []
+        chunk_count = 0
+        if vad.has_speech:
+            async for chunk, segments in long_form_transcriber.stream(normalize_level(vad.samples), route):
+                chunk_count += 1
+                for segment in segments:
+                    texts.append(segment.text)
+                    if segment.acoustic is not None:
+                        weighted.append((segment.end - segment.start, segment.acoustic.no_speech_prob,
+                                         segment.acoustic.avg_logprob))
+                    yield {"type": "segment", "chunk": chunk.index, **segment.to_dict(vad.leading_trimmed)}
+        acoustic = aggregate_confidence(weighted)
+        yield {
+            "type": "done",
+            "text": ' '.join(texts),
+            "duration": round(decoded.duration, 2),
+            "chunks": chunk_count,
+            "quality_tier": route.tier,
+            "confidence": round(acoustic.confidence, 4) if acoustic is not None else None
+        }
+
+    async def _decode_upload(self, upload: AudioUpload) -> Optional[DecodedAudio]:
+        """Upload audio as samples: WAV decoded while reading, else through the decoder pool"""
+        if upload.decoded is not None:
+            return upload.decoded
+        if decoder_pool.enabled:
+            return await decoder_pool.decode(upload.spool.source())
+        return None
+
+    async def _infer_file(self, audio_data: bytes, route: LanguageRoute) -> bytes:
+        """Run the model on a container only ffmpeg can decode"""
+        temp_file_path = None
         try:
             # Create temporary file for audio
             with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
                 temp_file.write(audio_data)
                 temp_file_path = temp_file.name
 
-            # Transcribe audio using the local Whisper model
-            result = self.whisper_model.transcribe(temp_file_path)
-            logger.info(f"Whisper transcription result: {result}")
-            return result["text"].strip()
-
-        except Exception as e:
-            logger.error(f"Transcription error: {e}")
-            raise
+            return await self._infer_path(temp_file_path, route)
         finally:
             # Clean up temporary file
-            try:
-                Path(temp_file_path).unlink()
-            except:
-                pass
+            if temp_file_path:
+                try:
+                    Path(temp_file_path).unlink()
+                except OSError:
+                    pass
+
+    async def _infer_path(self, path: str, route: LanguageRoute) -> bytes:
+        """Run the model on an audio file through Whisper's ffmpeg loader"""
+        start_time = time.perf_counter()
+        result = await inference_executor.transcribe(
+            path, route.decode_options(), model_size=route.model_size
+        )
+        self._observe(route, time.perf_counter() - start_time)
+        logger.info(f"Whisper transcription result: {result}")
+        return self._cache_payload(result)
 
     async def _extract_intent(self, text: str) -> Tuple[str, float, Dict[str, str]]:
         """
@@ -179,34 +497,63 @@ class VoiceProcessor:
         Returns:
             Tuple of (intent, confidence, entities)
         """
-        text_lower = text.lower()
+        best_intent, confidence = self._resolve_intent(text, self.intent_classifier.classify(text))
 
-        # Simple pattern matching for intent classification
-        intent_scores = {}
-        entities = {}
+        # Extract basic entities (URLs, app names, etc.)
+        entities = self._extract_entities(text)
 
-        # Check each intent pattern
-        for intent, patterns in self.command_patterns.items():
-            score = 0
-            for pattern in patterns:
-                if pattern in text_lower:
-                    score += 1
+        return best_intent, confidence, entities
 
-            if score > 0:
-                intent_scores[intent] = score / len(patterns)
+    def _resolve_intent(self, text: str, prediction: IntentPrediction) -> Tuple[str, float]:
+        """Use the classifier's prediction, falling back to keyword hit ratios when it abstains"""
+        if prediction.intent != 'unknown':
+            return prediction.intent, prediction.confidence
+
+        # Score each intent by the share of its distinct patterns found
+        # (iterating command_patterns keeps the original tie-breaking order)
+        hits = self.intent_matcher.hits_by_label(text.lower())
+        intent_scores = {
+            intent: len(hits[intent]) / len(patterns)
+            for intent, patterns in self.command_patterns.items() if intent in hits
+        }
+        if not intent_scores:
+            return 'unknown', 0.0
+        best_intent = max(intent_scores, key=intent_scores.get)
+        return best_intent, intent_scores[best_intent]
 
-        # Find best intent
-        if intent_scores:
-            best_intent = max(intent_scores, key=intent_scores.get)
-            confidence = intent_scores[best_intent]
-        else:
-            best_intent = 'unknown'
-            confidence = 0.0
+    def classify_batch(self, texts: List[str]) -> List[Dict[str, object]]:
+        """
+        Classify many texts with one vectorised classifier pass
 
-        # Extract basic entities (URLs, app names, etc.)
-        entities = self._extract_entities(text)
+        Args:
+            texts: Texts to classify
 
-        return best_intent, confidence, entities
+        Returns:
+            Per text: intent, confidence, per-intent scores and entities
+        """
+        results = []
+        for text, prediction in zip(texts, self.intent_classifier.classify_batch(texts)):
+            intent, confidence = self._resolve_intent(text, prediction)
+            results.append({
+                'text': text,
+                'intent': intent,
+                'confidence': confidence,
+                'scores': prediction.scores,
+                'entities': self._extract_entities(text)
+            })
+        return results
+
+    def extract_entities(self, text: str) -> List[Entity]:
+        """
+        Extract every entity with its span
+
+        Args:
+            text: Input text
+
+        Returns:
+            Entities (app, url, file_type) in order of position
+        """
+        return self.entity_gazetteer.extract(text)
 
     def _extract_entities(self, text: str) -> Dict[str, str]:
         """
@@ -216,51 +563,11 @@ class VoiceProcessor:
             text: Input text
 
         Returns:
-            Dictionary of entity types and values
+            Dictionary of entity types and values (first occurrence of each type)
         """
         entities = {}
-
-        # Extract URLs
-        import re
-        url_pattern = r'https?://[^\s]+'
-        urls = re.findall(url_pattern, text)
-        if urls:
-            entities['url'] = urls[0]
-
-        # Convert common website names to URLs
-        # This is a simple heuristic and can be expanded
-        text_lower = text.lower()
-        if 'google dot com' in text_lower:
-            entities['url'] = 'https://www.google.com'
-        elif 'youtube dot com' in text_lower:
-            entities['url'] = 'https://www.youtube.com'
-        elif 'instagram dot com' in text_lower:
-            entities['url'] = 'https://www.instagram.com'
-        elif 'facebook dot com' in text_lower:
-            entities['url'] = 'https://www.facebook.com'
-        elif 'twitter dot com' in text_lower or 'x dot com' in text_lower:
-            entities['url'] = 'https://www.twitter.com'
-        elif 'github dot com' in text_lower:
-            entities['url'] = 'https://www.github.com'
-
-        # Extract app names (common applications)
-        app_names = [
-            'safari', 'chrome', 'firefox', 'spotify', 'mail', 'messages',
-            'facetime', 'photos', 'finder', 'terminal', 'xcode', 'vscode'
-        ]
-
-        for app in app_names:
-            if app in text.lower():
-                entities['app'] = app
-                break
-
-        # Extract file extensions
-        file_extensions = ['.txt', '.pdf', '.doc', '.jpg', '.png', '.mp3', '.mp4']
-        for ext in file_extensions:
-            if ext in text.lower():
-                entities['file_type'] = ext
-                break
-
+        for entity in self.entity_gazetteer.extract(text):
+            entities.setdefault(entity.type, entity.value)
         return entities
 
     async def generate_response(self, command: VoiceCommand) -> VoiceResponse:
@@ -273,20 +580,16 @@ class VoiceProcessor:
         Returns:
             VoiceResponse object
         """
+        if command.intent == 'no_speech':
+            # Nothing was said: no reply text, no synthesis
+            return VoiceResponse(text='', audio_data=None)
+
         try:
             # Generate response text based on intent
             response_text = self._generate_response_text(command)
 
-            # Synthesize speech (placeholder for now)
-            audio_data = await self._synthesize_speech(response_text)
-
-            response = VoiceResponse(
-                text=response_text,
-                audio_data=audio_data,
-                duration=len(audio_data) / 16000 if audio_data else 0.0  # Assuming 16kHz
-            )
-
-            return response
+            # Synthesize speech with the local TTS backend
+            return await self.synthesize_speech(response_text)
 
         except Exception as e:
             logger.error(f"Error generating response: {e}")
@@ -314,57 +617,144 @@ class VoiceProcessor:
 
         if intent == 'browser_navigation':
             if 'url' in entities:
-                return f"I'll navigate to {entities['url']} for you."
+                return self.response_templates['navigate_url'].format(url=entities['url'])
             else:
-                return "I'll help you navigate to that website."
+                return self.response_templates['navigate']
 
         elif intent == 'system_control':
             if 'app' in entities:
-                return f"I'll open {entities['app']} for you."
+                return self.response_templates['open_app'].format(app=entities['app'])
             else:
-                return "I'll help you with that system control."
+                return self.response_templates['system_control']
 
-        elif intent == 'file_operations':
-            return "I'll help you with that file operation."
-
-        elif intent == 'web_automation':
-            return "I'll perform that web automation for you."
-
-        elif intent == 'information_query':
-            return "I'll search for that information for you."
+        elif intent in ('file_operations', 'web_automation', 'information_query'):
+            return self.response_templates[intent]
 
         else:
             return self.response_templates['not_understood']
 
-    async def _synthesize_speech(self, text: str) -> Optional[bytes]:
+    def response_text_variants(self) -> List[str]:
+        """
+        Every reply _generate_response_text can produce for known entities
+
+        Templates with placeholders are expanded over the gazetteer's apps
+        and sites; used to pre-render reply audio.
+        """
+        apps = sorted(set(self.entity_gazetteer.apps.values()))
+        urls = sorted(set(self.entity_gazetteer.sites.values()))
+        variants = []
+        for name, template in self.response_templates.items():
+            if '{app}' in template:
+                variants.extend(template.format(app=app) for app in apps)
+            elif '{url}' in template:
+                variants.extend(template.format(url=url) for url in urls)
+            else:
+                variants.append(template)
+        return variants
+
+    async def synthesize_speech(self, text: str, voice: Optional[str] = None) -> VoiceResponse:
         """
-        Synthesize speech from text (placeholder implementation)
+        Speak arbitrary text
 
         Args:
             text: Text to synthesize
+            voice: TTS voice name; unknown voices use the configured default
 
         Returns:
-            Audio data bytes or None
+            VoiceResponse with WAV audio when a TTS backend is available
         """
-        # TODO: Integrate with ElevenLabs or other TTS service
-        # For now, return None (no audio synthesis)
-        return None
+        speech = await self._synthesize_speech(text, voice)
+        return VoiceResponse(
+            text=text,
+            audio_data=speech.audio_data if speech else None,
+            duration=speech.duration if speech else 0.0
+        )
+
+    async def _synthesize_speech(self, text: str, voice: Optional[str] = None) -> Optional[SynthesizedSpeech]:
+        """
+        Synthesize speech from text with the configured TTS backend
+
+        Replies are served from the pre-rendered response audio cache when
+        possible and stored there otherwise.
+
+        Args:
+            text: Text to synthesize
+            voice: TTS voice name
+
+        Returns:
+            SynthesizedSpeech, or None when no backend is available or synthesis fails
+        """
+        if not speech_synthesizer.is_available():
+            return None
+        try:
+            speech, _ = await response_audio_cache.get_or_synthesize(text, voice)
+            return speech
+        except SpeechSynthesisError as e:
+            logger.error(f"Speech synthesis failed: {e}")
+            return None
 
     def get_supported_languages(self) -> Dict[str, str]:
         """Get list of supported languages"""
         return self.supported_languages
 
+    def model_sizes(self) -> List[str]:
+        """
+        Every model a transcription can run on: each language route's model and
+        the variants the quality tiers switch it to. Warm-up loads all of them
+        so stepping down under load never cold-loads a model.
+        """
+        routes = [self.language_router.fallback, *self.language_router.routes.values()]
+        sizes = self.language_router.model_sizes()
+        for model_size in self.quality_policy.model_sizes(routes):
+            if model_size not in sizes:
+                sizes.append(model_size)
+        return sizes
+
+    def get_language_routes(self) -> Dict[str, Dict[str, str]]:
+        """Get the language -> Whisper language/model routing table"""
+        return self.language_router.get_routes()
+
     def get_command_patterns(self) -> Dict[str, List[str]]:
         """Get command patterns for each intent"""
         return self.command_patterns
 
+    def update_command_patterns(self, patterns: Dict[str, List[str]]):
+        """
+        Replace the command patterns, recompile the intent matcher and retrain the classifier
+
+        Args:
+            patterns: Mapping of intent to trigger phrases
+        """
+        patterns = {
+            intent: [phrase.lower() for phrase in phrases if phrase]
+            for intent, phrases in patterns.items() if phrases
+        }
+        self.intent_matcher.reload(patterns)
+        self.intent_classifier.fit(build_training_examples(patterns))
+        self.command_patterns = patterns
+        logger.info(f"Reloaded {self.intent_matcher.pattern_count} command patterns "
+                    f"across {len(patterns)} intents")
+
     async def health_check(self) -> Dict[str, any]:
         """Check voice processor health"""
         return {
             'status': 'healthy',
             'supported_languages': len(self.supported_languages),
             'command_patterns': len(self.command_patterns),
-            'ai_api_configured': self.ai_api_key is not None
+            'entity_aliases': self.entity_gazetteer.alias_count,
+            'intent_classifier': self.intent_classifier.get_stats(),
+            'ai_api_configured': os.getenv("OPENAI_API_KEY") is not None,
+            'model_size': self.model_size,
+            'model_loaded': model_registry.is_loaded(self.model_size, self.device),
+            'model_ready': model_registry.is_ready(self.model_sizes()),
+            'inference': inference_executor.get_stats(),
+            'batching': transcription_batcher.get_stats(),
+            'cache': transcription_cache.get_stats(),
+            'decoder_pool': decoder_pool.get_stats(),
+            'quality_tier': self.quality_policy.get_stats(),
+            'speech_gate': speech_gate.get_stats(),
+            'speech_synthesis': speech_synthesizer.get_stats(),
+            'response_audio_cache': response_audio_cache.get_stats()
         }
 
 # Global voice processor instance
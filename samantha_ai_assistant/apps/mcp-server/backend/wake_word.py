@@ -0,0 +1,356 @@
+"""
+Wake Word Detection for Samantha AI MCP Server
+Cheap always-on keyword spotting in front of streaming recognition
+"""
+
+import logging
+import os
+import time
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_decoder import decode_wav_bytes
+from .audio_normalization import TARGET_SAMPLE_RATE
+from .voice_activity import DEFAULT_VAD_THRESHOLDS, detect_speech, frame_energies_db
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Wake word configuration (overridable via environment)
+WAKE_WORD = os.getenv("SAMANTHA_WAKE_WORD", "samantha")
+WAKE_WORD_DIR = Path(os.getenv("SAMANTHA_WAKE_WORD_DIR", str(Path.home() / ".samantha" / "wake_word")))
+WAKE_WORD_THRESHOLD = float(os.getenv("SAMANTHA_WAKE_WORD_THRESHOLD", "1.6"))
+WAKE_LISTEN_SECONDS = float(os.getenv("SAMANTHA_WAKE_LISTEN_SECONDS", "6"))   # recognition window
+
+# Features: log-mel energies over 25 ms windows every 10 ms
+MEL_BANDS = 24
+WINDOW_SAMPLES = 400
+HOP_SAMPLES = 160
+N_FFT = 512
+
+MIN_TEMPLATE_SECONDS = 0.3
+MAX_TEMPLATE_SECONDS = 1.5
+MAX_TEMPLATES = 10
+DETECT_INTERVAL_MS = 100        # matching runs at most this often, and only while there is speech
+END_GUARD_FRAMES = 10           # a match must end this long before "now", so the word is over
+ENERGY_MARGIN_DB = 10.0         # speech is this far above the tracked noise floor
+FLOOR_RISE_DB_PER_SECOND = 3.0  # how fast the noise floor follows louder background noise
+
+
+@lru_cache(maxsize=4)
+def _mel_filterbank(sample_rate: int = TARGET_SAMPLE_RATE, n_fft: int = N_FFT,
+                    bands: int = MEL_BANDS) -> np.ndarray:
+    """Triangular mel filters, shape (bands, n_fft // 2 + 1)"""
+    to_mel = lambda hz: 2595.0 * np.log10(1.0 + hz / 700.0)
+    to_hz = lambda mel: 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+    edges = to_hz(np.linspace(to_mel(60.0), to_mel(sample_rate / 2 - 400.0), bands + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+
+    lower, centre, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (centre - lower)
+    falling = (upper - bins) / (upper - centre)
+    bank = np.maximum(np.minimum(rising, falling), 0.0)
+    bank.setflags(write=False)
+    return bank.astype(np.float32)
+
+
+@lru_cache(maxsize=1)
+def _window() -> np.ndarray:
+    return np.hanning(WINDOW_SAMPLES).astype(np.float32)
+
+
+def log_mel(samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    Level-independent log-mel features
+
+    Args:
+        samples: Mono float32 audio
+        sample_rate: Sample rate of samples
+
+    Returns:
+        Array of shape (frames, MEL_BANDS); each frame has its mean removed,
+        so a louder or quieter take of the same word gives the same features
+    """
+    if len(samples) < WINDOW_SAMPLES:
+        return np.zeros((0, MEL_BANDS), dtype=np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, WINDOW_SAMPLES)[::HOP_SAMPLES]
+    power = np.abs(np.fft.rfft(frames * _window(), n=N_FFT, axis=1)) ** 2
+    features = np.log10(power.astype(np.float32) @ _mel_filterbank(sample_rate).T + 1e-8)
+    return features - features.mean(axis=1, keepdims=True)
+
+
+def subsequence_dtw(template: np.ndarray, features: np.ndarray) -> Tuple[float, int, int]:
+    """
+    Best match of a template anywhere in a feature sequence
+
+    Template frames advance by one per step while the input advances by 0,
+    1 or 2 frames (input between half and double the template's speed on
+    average). Each row is a single vectorised update, so matching costs
+    O(template frames) NumPy calls.
+
+    Returns:
+        (score, start frame, end frame): mean per-frame distance of the best
+        alignment and where it lies in features; score is inf if features
+        is shorter than half the template
+    """
+    m, n = len(template), len(features)
+    if n < max(m // 2, 1):
+        return float('inf'), 0, 0
+    # Pairwise Euclidean frame distances
+    squared = (template ** 2).sum(axis=1)[:, None] + (features ** 2).sum(axis=1)[None, :] \
+        - 2.0 * template @ features.T
+    cost = np.sqrt(np.maximum(squared, 0.0))
+
+    total = cost[0].astype(np.float64)          # a match may start at any input frame
+    start = np.arange(n)
+    candidates = np.full((3, n), np.inf)
+    starts = np.zeros((3, n), dtype=np.int64)
+    for row in range(1, m):
+        candidates[0] = total
+        candidates[1, 1:], candidates[1, 0] = total[:-1], np.inf
+        candidates[2, 2:], candidates[2, :2] = total[:-2], np.inf
+        starts[0] = start
+        starts[1, 1:] = start[:-1]
+        starts[2, 2:] = start[:-2]
+        step = candidates.argmin(axis=0)
+        columns = np.arange(n)
+        total = candidates[step, columns] + cost[row]
+        start = starts[step, columns]
+
+    # Reject alignments that squeeze or stretch the word by more than 2x overall
+    span = np.arange(n) - start + 1
+    total = np.where((span >= m / 2) & (span <= 2 * m), total, np.inf) / m
+    end = int(total.argmin())
+    return float(total[end]), int(start[end]), end
+
+
+@dataclass
+class WakeWordDetection:
+    """A wake word match in the stream"""
+    score: float
+    template: int
+    at_seconds: float           # stream time at which the word ended
+    trailing: np.ndarray        # audio already received after the word (start of the command)
+
+
+class WakeWordModel:
+    """
+    Enrolled recordings of the wake word
+
+    Templates are short WAV recordings of the user saying the wake word, kept
+    in WAKE_WORD_DIR so enrollment survives restarts. They are loaded on
+    first use.
+    """
+
+    def __init__(self, directory: Optional[Path] = WAKE_WORD_DIR, threshold: float = WAKE_WORD_THRESHOLD):
+        self.directory = directory
+        self.threshold = threshold
+        self._templates: Optional[List[np.ndarray]] = None
+
+    @property
+    def templates(self) -> List[np.ndarray]:
+        if self._templates is None:
+            self._templates = []
+            if self.directory is not None and self.directory.is_dir():
+                for path in sorted(self.directory.glob('*.wav'))[:MAX_TEMPLATES]:
+                    decoded = decode_wav_bytes(path.read_bytes())
+                    features = self._features(decoded.samples) if decoded is not None else None
+                    if features is None:
+                        logger.warning(f"Ignoring unusable wake word template {path}")
+                        continue
+                    self._templates.append(features)
+                logger.info(f"Loaded {len(self._templates)} wake word template(s) from {self.directory}")
+        return self._templates
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.templates)
+
+    def enroll(self, samples: np.ndarray, save: bool = True) -> int:
+        """
+        Add a recording of the wake word
+
+        Args:
+            samples: 16 kHz mono float32 recording holding just the wake word
+                (surrounding silence is trimmed)
+            save: Also store it in the template directory
+
+        Returns:
+            Number of templates after enrolling
+
+        Raises:
+            ValueError: when the recording holds no speech, the speech is
+                shorter than MIN_TEMPLATE_SECONDS or longer than
+                MAX_TEMPLATE_SECONDS, or MAX_TEMPLATES are already enrolled
+        """
+        if len(self.templates) >= MAX_TEMPLATES:
+            raise ValueError(f"At most {MAX_TEMPLATES} wake word templates can be enrolled")
+        vad = detect_speech(samples, TARGET_SAMPLE_RATE)
+        features = self._features(samples)
+        if features is None:
+            raise ValueError(
+                f"Wake word recording must hold {MIN_TEMPLATE_SECONDS}-{MAX_TEMPLATE_SECONDS}s of speech "
+                f"(found {vad.trimmed_duration if vad.has_speech else 0.0:.2f}s)"
+            )
+        self.templates.append(features)
+        if save and self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{WAKE_WORD}_{time.strftime('%Y%m%d_%H%M%S')}_{len(self.templates)}.wav"
+            with wave.open(str(path), 'wb') as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(TARGET_SAMPLE_RATE)
+                wav_file.writeframes((np.clip(vad.samples, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+        logger.info(f"Enrolled wake word template {len(self.templates)}")
+        return len(self.templates)
+
+    def clear(self):
+        """Forget every template (and delete the stored recordings)"""
+        if self.directory is not None and self.directory.is_dir():
+            for path in self.directory.glob('*.wav'):
+                path.unlink()
+        self._templates = []
+
+    @staticmethod
+    def _features(samples: np.ndarray) -> Optional[np.ndarray]:
+        vad = detect_speech(samples, TARGET_SAMPLE_RATE)
+        if not vad.has_speech or not MIN_TEMPLATE_SECONDS <= len(vad.samples) / TARGET_SAMPLE_RATE \
+                <= MAX_TEMPLATE_SECONDS + 2 * DEFAULT_VAD_THRESHOLDS.padding_ms / 1000.0:
+            return None
+        return log_mel(vad.samples)
+
+    def match(self, features: np.ndarray) -> Tuple[float, int, int, int]:
+        """Best (score, template, start frame, end frame) over all templates"""
+        best = (float('inf'), -1, 0, 0)
+        for index, template in enumerate(self.templates):
+            score, start, end = subsequence_dtw(template, features)
+            if score < best[0]:
+                best = (score, index, start, end)
+        return best
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the wake word, its threshold and how many templates are enrolled"""
+        return {
+            'wake_word': WAKE_WORD,
+            'templates': len(self.templates),
+            'threshold': self.threshold,
+            'directory': str(self.directory) if self.directory is not None else None
+        }
+
+
+class WakeWordDetector:
+    """
+    Per-stream wake word spotting over a ring buffer of recent audio
+
+    Every frame only updates an RMS energy gate against a slowly tracked
+    noise floor. While the gate has seen speech in the last ring-buffer
+    span, the buffer is turned into log-mel features and matched against
+    the enrolled templates at most every DETECT_INTERVAL_MS. Silence and
+    steady background noise therefore cost a few vector operations per
+    frame, and matching is paid only while someone is talking.
+    """
+
+    def __init__(self, model: 'WakeWordModel', sample_rate: int = TARGET_SAMPLE_RATE):
+        self.model = model
+        self.sample_rate = sample_rate
+        # Room for a template spoken at half speed, plus the end guard
+        self._ring = np.zeros(int(2 * MAX_TEMPLATE_SECONDS * sample_rate) + END_GUARD_FRAMES * HOP_SAMPLES,
+                              dtype=np.float32)
+        self._stats = {'audio_seconds': 0.0, 'checks': 0, 'detections': 0, 'best_score': None}
+        self._written = 0           # samples fed so far (stream time)
+        self._noise_floor_db: Optional[float] = None
+        self._last_check = 0
+        self.reset()
+
+    def reset(self):
+        """Ignore buffered audio (after a recognition window, the next wake word starts afresh)"""
+        self._matched_until = self._written     # audio before this is never matched
+        self._last_voiced = self._written - len(self._ring) - 1
+
+    def _append(self, samples: np.ndarray):
+        size = len(self._ring)
+        self._written += len(samples)
+        # Only the last ring's worth survives; it ends at stream time _written,
+        # so it starts at that slot minus its length, wherever that lands
+        samples = samples[-size:]
+        position = (self._written - len(samples)) % size
+        head = min(size - position, len(samples))
+        self._ring[position:position + head] = samples[:head]
+        self._ring[:len(samples) - head] = samples[head:]
+
+    def _recent(self) -> np.ndarray:
+        """Buffered audio in time order"""
+        size = len(self._ring)
+        if self._written < size:
+            return self._ring[:self._written]
+        position = self._written % size
+        return np.concatenate([self._ring[position:], self._ring[:position]])
+
+    def _voiced(self, samples: np.ndarray) -> bool:
+        energy_db = frame_energies_db(samples, self.sample_rate)
+        if len(energy_db) == 0:
+            return False
+        quietest = float(energy_db.min())
+        if self._noise_floor_db is None:
+            self._noise_floor_db = quietest
+        else:
+            seconds = len(samples) / self.sample_rate
+            self._noise_floor_db = min(self._noise_floor_db + FLOOR_RISE_DB_PER_SECOND * seconds, quietest)
+        threshold = max(self._noise_floor_db + ENERGY_MARGIN_DB, DEFAULT_VAD_THRESHOLDS.min_energy_db)
+        return bool((energy_db > threshold).any())
+
+    def process(self, samples: np.ndarray) -> Optional[WakeWordDetection]:
+        """
+        Feed 16 kHz mono float32 audio
+
+        Returns:
+            WakeWordDetection when the wake word has just been said, else None
+        """
+        self._append(samples)
+        self._stats['audio_seconds'] += len(samples) / self.sample_rate
+        if self._voiced(samples):
+            self._last_voiced = self._written
+
+        # Gate: nothing to match unless speech is still inside the ring buffer
+        if self._written - self._last_voiced > len(self._ring):
+            return None
+        if self._written - self._last_check < DETECT_INTERVAL_MS * self.sample_rate // 1000:
+            return None
+        self._last_check = self._written
+
+        audio = self._recent()
+        skip = self._matched_until - (self._written - len(audio))
+        if skip > 0:
+            audio = audio[skip:]
+        features = log_mel(audio, self.sample_rate)
+        if len(features) <= END_GUARD_FRAMES:
+            return None
+        self._stats['checks'] += 1
+        # Leave out the newest frames so a match means the word has finished
+        score, template, _, end = self.model.match(features[:-END_GUARD_FRAMES])
+        if self._stats['best_score'] is None or score < self._stats['best_score']:
+            self._stats['best_score'] = score
+        if score > self.model.threshold:
+            return None
+
+        self._stats['detections'] += 1
+        end_sample = end * HOP_SAMPLES + WINDOW_SAMPLES
+        trailing = audio[end_sample:].copy()
+        self._matched_until = self._written - len(trailing)
+        at_seconds = self._matched_until / self.sample_rate
+        logger.info(f"Wake word detected at {at_seconds:.2f}s (score {score:.2f}, template {template})")
+        return WakeWordDetection(score=score, template=template, at_seconds=at_seconds, trailing=trailing)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get audio seen, how often matching ran and detections"""
+        return dict(self._stats)
+
+
+# Global wake word model instance
+wake_word_model = WakeWordModel()
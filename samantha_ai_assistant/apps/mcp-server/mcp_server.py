@@ -5,7 +5,7 @@ Voice-controlled AI assistant with system automation
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import base64
 
@@ -17,6 +17,8 @@ from mcp.stdio_server import StdioServerParameters, StdioServerTransport
 # Import existing services
 from backend.voice_processor import VoiceProcessor, VoiceCommand
 from backend.system_automation import SystemAutomation
+from backend.automation_batch import BatchExecutor, BatchStep
+from backend.audio_upload import read_audio_upload, iter_base64_chunks
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +36,7 @@ class SamanthaAIMCPServer(Server):
         # Initialize existing services
         self.voice_processor = VoiceProcessor()
         self.system_automation = SystemAutomation()
+        self.batch_executor = BatchExecutor(self.system_automation)
 
         logger.info("Samantha AI MCP Server initialized")
 
@@ -45,6 +48,7 @@ class SamanthaAIMCPServer(Server):
         await session.register_tool("speech_to_text", self.speech_to_text)
         await session.register_tool("text_to_speech", self.text_to_speech)
         await session.register_tool("intent_classification", self.intent_classification)
+        await session.register_tool("classify_batch", self.classify_batch)
         await session.register_tool("process_voice_command", self.process_voice_command)
 
         # Register system automation tools
@@ -53,6 +57,7 @@ class SamanthaAIMCPServer(Server):
         await session.register_tool("system_control", self.system_control)
         await session.register_tool("browser_automation", self.browser_automation)
         await session.register_tool("execute_automation", self.execute_automation)
+        await session.register_tool("execute_automation_batch", self.execute_automation_batch)
 
         # Register voice resources
         await session.register_resource("supported_languages", self.get_supported_languages)
@@ -75,11 +80,12 @@ class SamanthaAIMCPServer(Server):
         try:
             logger.info(f"Processing speech to text with language: {language}")
 
-            # Decode base64 audio data
-            audio_bytes = base64.b64decode(audio_data)
-
-            # Process through voice processor
-            command = await self.voice_processor.process_audio(audio_bytes, language)
+            # Decode the base64 audio slice by slice into the streaming upload reader
+            upload = await read_audio_upload(iter_base64_chunks(audio_data))
+            try:
+                command = await self.voice_processor.process_upload(upload, language)
+            finally:
+                upload.close()
 
             return {
                 "success": True,
@@ -87,7 +93,13 @@ class SamanthaAIMCPServer(Server):
                 "intent": command.intent,
                 "confidence": command.confidence,
                 "entities": command.entities,
-                "timestamp": command.timestamp.isoformat()
+                "timestamp": command.timestamp.isoformat(),
+                "decode_path": command.decode_path,
+                "trimmed_duration": command.trimmed_duration,
+                "rejected_duration": command.rejected_duration,
+                "quality_tier": command.quality_tier,
+                "asr_confidence": command.asr_confidence,
+                "no_speech_reason": command.no_speech_reason
             }
         except Exception as e:
             logger.error(f"Speech to text error: {str(e)}")
@@ -97,22 +109,12 @@ class SamanthaAIMCPServer(Server):
             }
 
     async def text_to_speech(self, text: str, voice: str = 'alloy') -> Dict[str, Any]:
-        """Convert text to speech using ElevenLabs"""
+        """Convert text to speech with the local TTS backend"""
         try:
             logger.info(f"Converting text to speech: {text[:50]}...")
 
-            # Create voice command for TTS
-            command = VoiceCommand(
-                id="tts_request",
-                original_text=text,
-                intent="text_to_speech",
-                confidence=1.0,
-                entities={"voice": voice},
-                timestamp=datetime.now()
-            )
-
-            # Generate response
-            response = await self.voice_processor.generate_response(command)
+            # Speak the text itself with the local TTS backend
+            response = await self.voice_processor.synthesize_speech(text, voice)
 
             return {
                 "success": True,
@@ -139,6 +141,7 @@ class SamanthaAIMCPServer(Server):
                 "intent": intent,
                 "confidence": confidence,
                 "entities": entities,
+                "entity_spans": [entity.to_dict() for entity in self.voice_processor.extract_entities(text)],
                 "text": text
             }
         except Exception as e:
@@ -148,6 +151,25 @@ class SamanthaAIMCPServer(Server):
                 "error": str(e)
             }
 
+    async def classify_batch(self, texts: List[str]) -> Dict[str, Any]:
+        """Classify the intent of many texts in one vectorised pass"""
+        try:
+            logger.info(f"Classifying intent for {len(texts)} texts")
+
+            results = await asyncio.to_thread(self.voice_processor.classify_batch, texts)
+
+            return {
+                "success": True,
+                "count": len(results),
+                "results": results
+            }
+        except Exception as e:
+            logger.error(f"Batch intent classification error: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
     async def process_voice_command(self, audio_data: str, language: str = 'en-US') -> Dict[str, Any]:
         """Process voice command and return structured result"""
         try:
@@ -159,6 +181,10 @@ class SamanthaAIMCPServer(Server):
             if not stt_result["success"]:
                 return stt_result
 
+            # Nothing was said: skip intent classification of (hallucinated) text
+            if stt_result["intent"] == "no_speech":
+                return stt_result
+
             # Classify intent
             intent_result = await self.intent_classification(stt_result["text"])
 
@@ -196,7 +222,9 @@ class SamanthaAIMCPServer(Server):
                 "message": result.message,
                 "data": result.data,
                 "error": result.error,
-                "execution_time": result.execution_time
+                "execution_time": result.execution_time,
+                "exit_code": result.exit_code,
+                "command_duration": result.command_duration
             }
         except Exception as e:
             logger.error(f"File operation error: {str(e)}")
@@ -217,7 +245,9 @@ class SamanthaAIMCPServer(Server):
                 "message": result.message,
                 "data": result.data,
                 "error": result.error,
-                "execution_time": result.execution_time
+                "execution_time": result.execution_time,
+                "exit_code": result.exit_code,
+                "command_duration": result.command_duration
             }
         except Exception as e:
             logger.error(f"App control error: {str(e)}")
@@ -238,7 +268,9 @@ class SamanthaAIMCPServer(Server):
                 "message": result.message,
                 "data": result.data,
                 "error": result.error,
-                "execution_time": result.execution_time
+                "execution_time": result.execution_time,
+                "exit_code": result.exit_code,
+                "command_duration": result.command_duration
             }
         except Exception as e:
             logger.error(f"System control error: {str(e)}")
@@ -260,7 +292,9 @@ class SamanthaAIMCPServer(Server):
                 "message": result.message,
                 "data": result.data,
                 "error": result.error,
-                "execution_time": result.execution_time
+                "execution_time": result.execution_time,
+                "exit_code": result.exit_code,
+                "command_duration": result.command_duration
             }
         except Exception as e:
             logger.error(f"Browser automation error: {str(e)}")
@@ -281,7 +315,9 @@ class SamanthaAIMCPServer(Server):
                 "message": result.message,
                 "data": result.data,
                 "error": result.error,
-                "execution_time": result.execution_time
+                "execution_time": result.execution_time,
+                "exit_code": result.exit_code,
+                "command_duration": result.command_duration
             }
         except Exception as e:
             logger.error(f"Automation execution error: {str(e)}")
@@ -290,6 +326,22 @@ class SamanthaAIMCPServer(Server):
                 "error": str(e)
             }
 
+    async def execute_automation_batch(self, steps: List[Dict[str, Any]], mode: str = 'stop') -> Dict[str, Any]:
+        """Execute several automation commands, running independent steps concurrently"""
+        try:
+            logger.info(f"Executing automation batch of {len(steps)} steps ({mode})")
+
+            batch = await self.batch_executor.run(
+                [BatchStep.from_dict(step, index) for index, step in enumerate(steps)], mode
+            )
+            return batch.to_dict()
+        except Exception as e:
+            logger.error(f"Automation batch error: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
     # ============================================================================
     # VOICE RESOURCES
     # ============================================================================
@@ -348,6 +400,7 @@ class SamanthaAIMCPServer(Server):
             operations = self.system_automation.get_supported_operations()
             return {
                 "operations": operations,
+                "specs": self.system_automation.describe_operations(),
                 "os_type": self.system_automation.os_type
             }
         except Exception as e:
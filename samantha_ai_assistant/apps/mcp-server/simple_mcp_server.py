@@ -5,7 +5,7 @@ Voice-controlled AI assistant with system automation
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import base64
 
@@ -16,6 +16,8 @@ from mcp.stdio_server import StdioServerTransport
 # Import existing services
 from backend.voice_processor import VoiceProcessor, VoiceCommand
 from backend.system_automation import SystemAutomation
+from backend.automation_batch import BatchExecutor, BatchStep
+from backend.audio_upload import read_audio_upload, iter_base64_chunks
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +35,7 @@ class SamanthaAIMCPServer(Server):
         # Initialize existing services
         self.voice_processor = VoiceProcessor()
         self.system_automation = SystemAutomation()
+        self.batch_executor = BatchExecutor(self.system_automation)
 
         logger.info("Samantha AI MCP Server initialized")
 
@@ -49,11 +52,12 @@ class SamanthaAIMCPServer(Server):
             try:
                 logger.info(f"Processing speech to text with language: {language}")
 
-                # Decode base64 audio data
-                audio_bytes = base64.b64decode(audio_data)
-
-                # Process through voice processor
-                command = await self.voice_processor.process_audio(audio_bytes, language)
+                # Decode the base64 audio slice by slice into the streaming upload reader
+                upload = await read_audio_upload(iter_base64_chunks(audio_data))
+                try:
+                    command = await self.voice_processor.process_upload(upload, language)
+                finally:
+                    upload.close()
 
                 return {
                     "success": True,
@@ -61,7 +65,13 @@ class SamanthaAIMCPServer(Server):
                     "intent": command.intent,
                     "confidence": command.confidence,
                     "entities": command.entities,
-                    "timestamp": command.timestamp.isoformat()
+                    "timestamp": command.timestamp.isoformat(),
+                    "decode_path": command.decode_path,
+                    "trimmed_duration": command.trimmed_duration,
+                    "rejected_duration": command.rejected_duration,
+                    "quality_tier": command.quality_tier,
+                    "asr_confidence": command.asr_confidence,
+                    "no_speech_reason": command.no_speech_reason
                 }
             except Exception as e:
                 logger.error(f"Speech to text error: {str(e)}")
@@ -72,22 +82,12 @@ class SamanthaAIMCPServer(Server):
 
         @self.call_tool()
         async def text_to_speech(text: str, voice: str = 'alloy') -> Dict[str, Any]:
-            """Convert text to speech using ElevenLabs"""
+            """Convert text to speech with the local TTS backend"""
             try:
                 logger.info(f"Converting text to speech: {text[:50]}...")
 
-                # Create voice command for TTS
-                command = VoiceCommand(
-                    id="tts_request",
-                    original_text=text,
-                    intent="text_to_speech",
-                    confidence=1.0,
-                    entities={"voice": voice},
-                    timestamp=datetime.now()
-                )
-
-                # Generate response
-                response = await self.voice_processor.generate_response(command)
+                # Speak the text itself with the local TTS backend
+                response = await self.voice_processor.synthesize_speech(text, voice)
 
                 return {
                     "success": True,
@@ -115,6 +115,7 @@ class SamanthaAIMCPServer(Server):
                     "intent": intent,
                     "confidence": confidence,
                     "entities": entities,
+                    "entity_spans": [entity.to_dict() for entity in self.voice_processor.extract_entities(text)],
                     "text": text
                 }
             except Exception as e:
@@ -124,6 +125,26 @@ class SamanthaAIMCPServer(Server):
                     "error": str(e)
                 }
 
+        @self.call_tool()
+        async def classify_batch(texts: List[str]) -> Dict[str, Any]:
+            """Classify the intent of many texts in one vectorised pass"""
+            try:
+                logger.info(f"Classifying intent for {len(texts)} texts")
+
+                results = await asyncio.to_thread(self.voice_processor.classify_batch, texts)
+
+                return {
+                    "success": True,
+                    "count": len(results),
+                    "results": results
+                }
+            except Exception as e:
+                logger.error(f"Batch intent classification error: {str(e)}")
+                return {
+                    "success": False,
+                    "error": str(e)
+                }
+
         # System automation tools
         @self.call_tool()
         async def file_operation(operation: str, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -138,7 +159,9 @@ class SamanthaAIMCPServer(Server):
                     "message": result.message,
                     "data": result.data,
                     "error": result.error,
-                    "execution_time": result.execution_time
+                    "execution_time": result.execution_time,
+                    "exit_code": result.exit_code,
+                    "command_duration": result.command_duration
                 }
             except Exception as e:
                 logger.error(f"File operation error: {str(e)}")
@@ -160,7 +183,9 @@ class SamanthaAIMCPServer(Server):
                     "message": result.message,
                     "data": result.data,
                     "error": result.error,
-                    "execution_time": result.execution_time
+                    "execution_time": result.execution_time,
+                    "exit_code": result.exit_code,
+                    "command_duration": result.command_duration
                 }
             except Exception as e:
                 logger.error(f"App control error: {str(e)}")
@@ -182,7 +207,9 @@ class SamanthaAIMCPServer(Server):
                     "message": result.message,
                     "data": result.data,
                     "error": result.error,
-                    "execution_time": result.execution_time
+                    "execution_time": result.execution_time,
+                    "exit_code": result.exit_code,
+                    "command_duration": result.command_duration
                 }
             except Exception as e:
                 logger.error(f"System control error: {str(e)}")
@@ -205,7 +232,9 @@ class SamanthaAIMCPServer(Server):
                     "message": result.message,
                     "data": result.data,
                     "error": result.error,
-                    "execution_time": result.execution_time
+                    "execution_time": result.execution_time,
+                    "exit_code": result.exit_code,
+                    "command_duration": result.command_duration
                 }
             except Exception as e:
                 logger.error(f"Browser automation error: {str(e)}")
@@ -227,7 +256,9 @@ class SamanthaAIMCPServer(Server):
                     "message": result.message,
                     "data": result.data,
                     "error": result.error,
-                    "execution_time": result.execution_time
+                    "execution_time": result.execution_time,
+                    "exit_code": result.exit_code,
+                    "command_duration": result.command_duration
                 }
             except Exception as e:
                 logger.error(f"Automation execution error: {str(e)}")
@@ -236,6 +267,23 @@ class SamanthaAIMCPServer(Server):
                     "error": str(e)
                 }
 
+        @self.call_tool()
+        async def execute_automation_batch(steps: List[Dict[str, Any]], mode: str = 'stop') -> Dict[str, Any]:
+            """Execute several automation commands, running independent steps concurrently"""
+            try:
+                logger.info(f"Executing automation batch of {len(steps)} steps ({mode})")
+
+                batch = await self.batch_executor.run(
+                    [BatchStep.from_dict(step, index) for index, step in enumerate(steps)], mode
+                )
+                return batch.to_dict()
+            except Exception as e:
+                logger.error(f"Automation batch error: {str(e)}")
+                return {
+                    "success": False,
+                    "error": str(e)
+                }
+
         # Health check tool
         @self.call_tool()
         async def get_system_health() -> Dict[str, Any]:
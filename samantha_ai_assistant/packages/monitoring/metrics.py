@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Gauge, start_http_server
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 import threading
 
 # Metrics
@@ -18,3 +18,70 @@ def update_system_metrics(cpu, memory, disk):
     cpu_gauge.set(cpu)
     memory_gauge.set(memory)
     disk_gauge.set(disk)
+
+# Voice inference executor metrics
+inference_queue_depth = Gauge(
+    'samantha_inference_queue_depth', 'Transcription jobs waiting for a worker'
+)
+inference_active_jobs = Gauge(
+    'samantha_inference_active_jobs', 'Transcription jobs running on a worker'
+)
+inference_worker_utilisation = Gauge(
+    'samantha_inference_worker_utilisation', 'Fraction of inference workers busy'
+)
+inference_jobs = Counter(
+    'samantha_inference_jobs_total', 'Transcription jobs by outcome', ['outcome']
+)
+
+# Transcription micro-batching metrics
+transcription_batch_size = Histogram(
+    'samantha_transcription_batch_size', 'Requests decoded per batched forward pass',
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+)
+transcription_batch_wait = Histogram(
+    'samantha_transcription_batch_wait_seconds', 'Latency added by waiting for a batch to fill',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25)
+)
+
+# Tiered cache metrics (transcription and audio caches)
+cache_events = Counter(
+    'samantha_cache_events_total', 'Cache lookups and evictions by cache, tier and event',
+    ['cache', 'event']
+)
+cache_memory_bytes = Gauge(
+    'samantha_cache_memory_bytes', 'Bytes held in the memory tier of a cache', ['cache']
+)
+
+# Language routing metrics
+asr_route_latency = Histogram(
+    'samantha_asr_route_latency_seconds', 'Transcription latency per language route and model',
+    ['route', 'model'],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+)
+
+# Adaptive ASR quality tier metrics
+asr_quality_tier = Gauge(
+    'samantha_asr_quality_tier', 'Index of the active ASR quality tier (0 = most accurate)'
+)
+asr_quality_tier_switches = Counter(
+    'samantha_asr_quality_tier_switches_total', 'ASR quality tier changes by direction', ['direction']
+)
+
+# Speech gate metrics
+asr_confidence = Histogram(
+    'samantha_asr_confidence', 'Acoustic confidence of transcriptions (0-1)',
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+)
+asr_gated_transcriptions = Counter(
+    'samantha_asr_gated_transcriptions_total', 'Transcriptions stopped before intent extraction', ['reason']
+)
+
+# System automation metrics
+automation_operation_latency = Histogram(
+    'samantha_automation_operation_latency_seconds', 'Automation operation latency by operation', ['operation'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+automation_operation_errors = Counter(
+    'samantha_automation_operation_errors_total', 'Failed automation operations by operation and reason',
+    ['operation', 'reason']
+)